@@ -0,0 +1,40 @@
+"""
+Agenda report benchmark: writes the month-end agendas of a generated organization to an
+archive, in this process and with a pool of worker processes. Run from the project root:
+
+    python benchmarks/bench_agenda_report.py [employees] [workers]
+"""
+
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, ".")
+
+from logic.Meeting import Meeting
+from logic.Organization import Organization
+from logic.Person import Person
+
+
+def main(employees: int = 20_000, workers: int = 0) -> None:
+    rng = random.Random(0)
+    org = Organization()
+    for index in range(employees):
+        org.add_employee(Person(f"Employee {index}"))
+    people = org.get_employees()
+    for index in range(employees * 4):
+        start = rng.randint(0, 20)
+        org.book_meeting(Meeting(3, rng.randint(1, 28), start, start + 1, rng.sample(people, 4),
+                                 None, f"Meeting {index}"))
+
+    with tempfile.TemporaryDirectory() as directory:
+        for count in (1, workers or os.cpu_count()):
+            summary = org.write_agendas(3, os.path.join(directory, f"agendas-{count}.zip"), archive=True,
+                                        workers=count)
+            print(f"{count} worker(s): {summary['entities']} agendas, {summary['bytes'] / 2 ** 20:.1f} MiB "
+                  f"in {summary['elapsed']:.2f}s")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
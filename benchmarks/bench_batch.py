@@ -0,0 +1,44 @@
+"""
+Batch planner benchmark: commands per second for a generated stream of bookings and
+availability checks. Run from the project root:
+
+    python benchmarks/bench_batch.py [commands]
+"""
+
+import io
+import random
+import sys
+import time
+
+sys.path.insert(0, ".")
+
+from logic.BatchPlanner import BatchPlanner
+from logic.Organization import Organization
+
+
+def main(commands: int = 50_000) -> None:
+    org = Organization()
+    names = [person.get_name() for person in org.get_employees()]
+    rooms = [room.get_id() for room in org.get_rooms()]
+    rng = random.Random(0)
+    lines = []
+    for _ in range(commands):
+        month, day, start = rng.randint(1, 11), rng.randint(1, 30), rng.randint(0, 20)
+        kind = rng.random()
+        if kind < 0.4:
+            attendees = ";".join(rng.sample(names, 3))
+            lines.append(f"meeting {month},{day},{start},{start + 1},{rng.choice(rooms)},{attendees},Sync")
+        elif kind < 0.8:
+            lines.append(f"busy {rng.choice(names)},{month},{day},{start},{start + 2}")
+        else:
+            lines.append(f'{{"cmd": "free_rooms", "month": {month}, "day": {day}, "start": {start}, "end": {start + 1}}}')
+
+    output = io.StringIO()
+    began = time.perf_counter()
+    counts = BatchPlanner(org, output).run(lines)
+    spent = time.perf_counter() - began
+    print(f"{commands} commands in {spent:.3f} s ({commands / spent:,.0f}/s): {counts}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,33 @@
+"""
+Differential benchmark: replays random operation sequences against every calendar engine,
+checks that each one behaves exactly like the original Calendar (logic/ReferenceCalendar.py)
+and reports its speed.
+Run from the project root:
+
+    python benchmarks/bench_engines.py [sequences] [length]
+"""
+
+import sys
+
+sys.path.insert(0, ".")
+
+from logic.Calendar import Calendar
+from logic.Differential import DifferentialHarness
+from logic.Person import Person
+from logic.Room import Room
+from logic.SqliteCalendar import SqliteCalendar, SqliteStore
+
+
+def main(sequences: int = 200, length: int = 80) -> None:
+    harness = DifferentialHarness({
+        "Calendar": Calendar,
+        "Person": Person,
+        "Room": lambda: Room("JO1.101"),
+        "SqliteCalendar": lambda: SqliteCalendar(SqliteStore(), "bench"),
+    })
+    harness.run(sequences, length)
+    print(harness.report(), end="")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,35 @@
+"""
+Memory benchmark: measures an organization with a few meetings per employee and projects
+the footprint of a larger one. Run from the project root:
+
+    python benchmarks/bench_memory.py [employees] [target employees]
+"""
+
+import random
+import sys
+
+sys.path.insert(0, ".")
+
+from logic.Meeting import Meeting
+from logic.Organization import Organization
+from logic.Person import Person
+
+
+def main(employees: int = 2_000, target: int = 100_000) -> None:
+    rng = random.Random(0)
+    org = Organization()
+    for index in range(employees):
+        org.add_employee(Person(f"Employee {index}"))
+    people = org.get_employees()
+    for index in range(employees * 3):
+        start = rng.randint(0, 20)
+        org.book_meeting(Meeting(rng.randint(1, 11), rng.randint(1, 28), start, start + 1,
+                                 rng.sample(people, 4), rng.choice(org.get_rooms()), f"Meeting {index}"))
+
+    report = org.memory_report()
+    print(report, end="")
+    print(f"Projected for {target} employees: {report.project(employees=target) / 2 ** 20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,42 @@
+"""
+Batch scheduler benchmark: meeting requests placed per second for a generated batch
+of requests over a month. Run from the project root:
+
+    python benchmarks/bench_scheduler.py [requests]
+"""
+
+import random
+import sys
+
+sys.path.insert(0, ".")
+
+from logic.Organization import Organization
+from logic.Person import Person
+from logic.Room import Room
+from logic.Scheduler import MeetingRequest
+
+
+def main(requests: int = 5_000) -> None:
+    rng = random.Random(0)
+    people = [Person(f"Employee {index}") for index in range(max(requests // 10, 10))]
+    rooms = [Room(f"JO{floor}.{number}", capacity=rng.choice((4, 8, 12, 20)))
+             for floor in range(1, 11) for number in range(100, 105)]
+    org = Organization(employees=people, rooms=rooms)
+
+    batch = []
+    for index in range(requests):
+        month, day = rng.randint(1, 11), rng.randint(1, 24)
+        earliest = rng.randint(8, 12)
+        batch.append(MeetingRequest(rng.sample(people, rng.randint(2, 6)), rng.randint(1, 2), (month, day),
+                                    (month, day + rng.randint(0, 4)), earliest, earliest + 6,
+                                    needs_room=rng.random() < 0.7, capacity=rng.choice((0, 4, 8)),
+                                    description=f"Request {index}"))
+
+    result = org.schedule_batch(batch, time_budget=60.0)
+    print(f"{requests} requests in {result.elapsed:.3f} s ({requests / result.elapsed:,.0f}/s): "
+          f"{len(result.get_placements())} placed, {len(result.get_unplaced())} unplaced, "
+          f"{result.backtracks} backtracks")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
@@ -0,0 +1,45 @@
+"""
+Startup benchmark: time to load a large employee directory into an Organization.
+
+Calendars are created lazily, so loading should only pay for the Person objects
+themselves. Run from the project root:
+
+    python benchmarks/bench_startup.py [people]
+"""
+
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, ".")
+
+from logic.Meeting import Meeting
+from logic.Organization import Organization
+from logic.Person import Person
+
+
+def main(people: int = 100_000) -> None:
+    tracemalloc.start()
+    began = time.perf_counter()
+    org = Organization()
+    for index in range(people):
+        org.add_employee(Person(f"Employee {index}"))
+    loaded = time.perf_counter()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"Loaded {people} people in {loaded - began:.3f} s, {current / 2 ** 20:.1f} MiB")
+
+    # First use of a handful of calendars
+    began = time.perf_counter()
+    for person in org.get_employees()[:100]:
+        person.add_meeting(Meeting(3, 14, 9, 10, description="Stand-up"))
+    print(f"First booking for 100 people in {time.perf_counter() - began:.3f} s")
+
+    began = time.perf_counter()
+    busy = sum(person.is_busy(3, 14, 9, 10) for person in org.get_employees())
+    print(f"is_busy over {people} people in {time.perf_counter() - began:.3f} s ({busy} busy)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,64 @@
+from collections import OrderedDict
+
+
+class AgendaCache:
+    """
+    A bounded least-recently-used cache of rendered agenda strings.
+
+    Keys include the version of the calendar day or month they were rendered from,
+    so a booking change simply makes old entries unreachable until they are evicted.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        """
+        Constructor for the AgendaCache class.
+
+        :param max_size: The maximum number of rendered agendas to keep.
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> str:
+        """
+        Looks up a rendered agenda and marks it as recently used.
+
+        :param key: The cache key.
+        :return: The rendered agenda, or None if it is not cached.
+        """
+        agenda = self.entries.get(key)
+        if agenda is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return agenda
+
+    def put(self, key: tuple, agenda: str) -> None:
+        """
+        Stores a rendered agenda, evicting the least recently used one if the cache is full.
+
+        :param key: The cache key.
+        :param agenda: The rendered agenda.
+        """
+        self.entries[key] = agenda
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Drops every cached agenda and resets the statistics.
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        """
+        Retrieves the cache statistics.
+
+        :return: A dictionary with the hits, misses, current size and maximum size.
+        """
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries), "max_size": self.max_size}
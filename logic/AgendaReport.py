@@ -0,0 +1,221 @@
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+# The (entity, entry name) pairs of the report being written. Set before the worker processes
+# are forked, so they inherit the organization instead of receiving it pickled.
+_jobs = None
+
+
+def entry_names(employees: list, rooms: list) -> list:
+    """
+    Names the agenda file of every employee and room, e.g. "employees/Helen_West.txt" and
+    "rooms/JO18.330.txt". Characters unsafe in file names are replaced, and duplicate
+    names get a numbered suffix.
+
+    :param employees: The Person objects.
+    :param rooms: The Room objects.
+    :return: A list of (entity, name) pairs, employees first.
+    """
+    jobs = []
+    used = set()
+    for folder, entities, key in (("employees", employees, "get_name"), ("rooms", rooms, "get_id")):
+        for entity in entities:
+            safe = re.sub(r"[^\w.-]+", "_", getattr(entity, key)()).strip(".") or "_"
+            stem = f"{folder}/{safe}"
+            name, suffix = f"{stem}.txt", 1
+            while name in used:
+                suffix += 1
+                name = f"{stem}-{suffix}.txt"
+            used.add(name)
+            jobs.append((entity, name))
+    return jobs
+
+
+def _write_agenda(entity, month: int, stream) -> int:
+    """
+    Streams the agenda of an employee or room for a month, one meeting at a time.
+
+    :param entity: The Person or Room.
+    :param month: The month (1-12).
+    :param stream: A binary file object.
+    :return: The number of bytes written.
+    """
+    written = 0
+    for line in entity.view_calendar().iter_agenda(month):
+        data = line.encode("utf-8")
+        stream.write(data)
+        written += len(data)
+    return written
+
+
+def _render_files(first: int, last: int, month: int, directory: str) -> int:
+    """
+    Writes the agendas of a slice of the report's entities to one file each.
+
+    :param first: The index of the first entity, inclusive.
+    :param last: The index of the last entity, exclusive.
+    :param month: The month (1-12).
+    :param directory: The output directory, which has an employees and a rooms folder.
+    :return: The number of bytes written.
+    """
+    written = 0
+    for entity, name in _jobs[first:last]:
+        with open(os.path.join(directory, name), "wb") as stream:
+            written += _write_agenda(entity, month, stream)
+    return written
+
+
+def _render_part(first: int, last: int, month: int, path: str) -> int:
+    """
+    Writes the agendas of a slice of the report's entities to an uncompressed zip part,
+    which the parent process then copies into the archive.
+
+    :param first: The index of the first entity, inclusive.
+    :param last: The index of the last entity, exclusive.
+    :param month: The month (1-12).
+    :param path: The file name of the part.
+    :return: The number of bytes written, before compression.
+    """
+    written = 0
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as part:
+        for entity, name in _jobs[first:last]:
+            with part.open(name, "w") as stream:
+                written += _write_agenda(entity, month, stream)
+    return written
+
+
+class AgendaReport:
+    """
+    Writes the agenda of every employee and room of an organization for a month, e.g. the
+    month-end report.
+
+    The employees and rooms are split into chunks, which a pool of worker processes renders
+    in parallel. Agendas are streamed to disk a meeting at a time, and only a few chunks per
+    worker are in flight at once, so memory stays bounded however large the organization is.
+    The output is either one file per employee and room, or a single zip archive.
+
+    Worker processes are forked so they share the organization's memory. Where fork is not
+    available, and for calendars from a calendar factory (a SQLite connection must not be
+    shared with a child process), the chunks are rendered in this process instead.
+    """
+
+    def __init__(self, organization: 'Organization', workers: int = None, chunk_size: int = 256,
+                 max_pending: int = 2, progress=None):
+        """
+        Constructor for the AgendaReport class.
+
+        :param organization: The Organization whose employees and rooms are reported.
+        :param workers: The number of worker processes. Defaults to the number of CPUs; 1
+                        renders in this process.
+        :param chunk_size: The number of employees and rooms rendered per task.
+        :param max_pending: The number of tasks in flight per worker.
+        :param progress: A function called with (done, total) entity counts after each chunk,
+                         or None.
+        :raises ValueError: If workers, chunk_size or max_pending is less than 1.
+        """
+        if (workers is not None and workers < 1) or chunk_size < 1 or max_pending < 1:
+            raise ValueError("workers, chunk_size and max_pending must be at least 1")
+        self.organization = organization
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending
+        self.progress = progress
+
+    def write_files(self, month: int, directory: str) -> dict:
+        """
+        Writes every agenda to its own file under directory/employees and directory/rooms.
+        Existing files of the same name are overwritten.
+
+        :param month: The month (1-12).
+        :param directory: The output directory, created if needed.
+        :return: A dictionary with the number of "entities", the "bytes" written and the
+                 "elapsed" seconds.
+        """
+        for folder in ("employees", "rooms"):
+            os.makedirs(os.path.join(directory, folder), exist_ok=True)
+        return self._run(_render_files, month, lambda index: directory, None)
+
+    def write_archive(self, month: int, path: str) -> dict:
+        """
+        Writes every agenda into one zip archive, with the same names as write_files(),
+        in directory order.
+
+        :param month: The month (1-12).
+        :param path: The file name of the archive, replaced if it exists.
+        :return: A dictionary with the number of "entities", the uncompressed "bytes" and the
+                 "elapsed" seconds.
+        """
+        with tempfile.TemporaryDirectory() as parts, \
+                zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+            def merge(part_path):
+                with zipfile.ZipFile(part_path) as part:
+                    for info in part.infolist():
+                        with part.open(info) as source, archive.open(info.filename, "w") as target:
+                            shutil.copyfileobj(source, target)
+                os.remove(part_path)
+
+            return self._run(_render_part, month, lambda index: os.path.join(parts, f"{index}.zip"), merge)
+
+    def _run(self, render, month: int, target, collect) -> dict:
+        """
+        Renders every chunk, in parallel if possible, and hands the finished ones to collect
+        in order.
+
+        :param render: _render_files or _render_part.
+        :param month: The month (1-12).
+        :param target: A function giving the output of the chunk with the given index.
+        :param collect: A function called with the output of every finished chunk, or None.
+        :return: The summary dictionary of write_files() and write_archive().
+        """
+        global _jobs
+        started = perf_counter()
+        organization = self.organization
+        jobs = entry_names([organization._current(employee) for employee in organization.employees],
+                           [organization._current(room) for room in organization.rooms])
+        chunks = [(index, first, min(first + self.chunk_size, len(jobs)))
+                  for index, first in enumerate(range(0, len(jobs), self.chunk_size))]
+
+        def finished(result, index, first, last):
+            if collect is not None:
+                collect(target(index))
+            if self.progress is not None:
+                self.progress(last, len(jobs))
+            return result
+
+        written = 0
+        _jobs = jobs
+        try:
+            if self.workers == 1 or len(chunks) <= 1 or not self._can_fork():
+                for index, first, last in chunks:
+                    written += finished(render(first, last, month, target(index)), index, first, last)
+            else:
+                context = multiprocessing.get_context("fork")
+                with ProcessPoolExecutor(self.workers, mp_context=context) as pool:
+                    pending = deque()
+                    for index, first, last in chunks:
+                        if len(pending) >= self.workers * self.max_pending:
+                            future, *chunk = pending.popleft()
+                            written += finished(future.result(), *chunk)
+                        pending.append((pool.submit(render, first, last, month, target(index)), index, first, last))
+                    while pending:
+                        future, *chunk = pending.popleft()
+                        written += finished(future.result(), *chunk)
+        finally:
+            _jobs = None
+        return {"entities": len(jobs), "bytes": written, "elapsed": perf_counter() - started}
+
+    def _can_fork(self) -> bool:
+        """
+        Checks whether worker processes may be forked for this organization.
+
+        :return: True if fork is available and no calendar comes from a calendar factory.
+        """
+        return ("fork" in multiprocessing.get_all_start_methods()
+                and self.organization.calendar_factory is None)
@@ -0,0 +1,222 @@
+from datetime import date
+
+from logic.Calendar import Calendar
+from logic.FreeBusy import hours_mask
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+HOURS = 24
+WEEKDAYS = 7
+
+
+def percentile_summary(values, percentiles=(50, 90, 99)) -> dict:
+    """
+    Summarizes a distribution with linearly interpolated percentiles, as numpy.percentile does.
+
+    :param values: A sequence of numbers.
+    :param percentiles: The percentiles to report (0-100).
+    :return: A dictionary with "count", "mean", "min", "max" and one "p<N>" entry per percentile.
+             Every statistic is 0 for an empty sequence.
+    """
+    ordered = sorted(values)
+    summary = {"count": len(ordered)}
+    if not ordered:
+        summary.update(mean=0, min=0, max=0)
+        summary.update((f"p{p}", 0) for p in percentiles)
+        return summary
+    summary.update(mean=sum(ordered) / len(ordered), min=ordered[0], max=ordered[-1])
+    for p in percentiles:
+        rank = (len(ordered) - 1) * p / 100
+        low = int(rank)
+        high = min(low + 1, len(ordered) - 1)
+        summary[f"p{p}"] = ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+    return summary
+
+
+class UtilizationReport:
+    """
+    Room occupancy rates and per-employee meeting load of an organization over a date range.
+
+    The busy hours of every calendar are collected in one pass and aggregated with NumPy
+    when it is installed, otherwise with plain Python. Both give the same results.
+    """
+
+    def __init__(self, organization: 'Organization', year: int = None, first_day: tuple = (1, 1),
+                 last_day: tuple = (12, 31), use_numpy: bool = None):
+        """
+        Constructor for the UtilizationReport class. Builds every aggregate.
+
+        :param organization: The Organization to analyze.
+        :param year: The year used to find the weekday of each date. Defaults to the current year.
+        :param first_day: The first (month, day) of the period, inclusive.
+        :param last_day: The last (month, day) of the period, inclusive.
+        :param use_numpy: Force NumPy on (True) or off (False). Defaults to using it if installed.
+        :raises ImportError: If use_numpy is True but NumPy is not installed.
+        """
+        if use_numpy and numpy is None:
+            raise ImportError("NumPy is not installed")
+        self.use_numpy = numpy is not None if use_numpy is None else use_numpy
+        self.year = date.today().year if year is None else year
+
+        # Every real date of the period, with its weekday
+        self.weekdays = {}
+        for month in range(first_day[0], last_day[0] + 1):
+            for day in range(1, 32):
+                if first_day <= (month, day) <= last_day:
+                    try:
+                        self.weekdays[(month, day)] = date(self.year, month, day).weekday()
+                    except ValueError:
+                        continue
+        self.days_per_weekday = [0] * WEEKDAYS
+        for weekday in self.weekdays.values():
+            self.days_per_weekday[weekday] += 1
+
+        rooms = organization.get_rooms()
+        self.buildings = sorted({room.get_building() for room in rooms})
+        building_index = {building: index for index, building in enumerate(self.buildings)}
+        self.rooms_per_building = [0] * len(self.buildings)
+        for room in rooms:
+            self.rooms_per_building[building_index[room.get_building()]] += 1
+        self.room_count = len(rooms)
+
+        # One pass over the room calendars: a row per busy room-day
+        masks, weekdays, buildings = [], [], []
+        for room in rooms:
+            building = building_index[room.get_building()]
+            for key, mask, meetings in self._busy_days(room.view_calendar()):
+                masks.append(mask)
+                weekdays.append(self.weekdays[key])
+                buildings.append(building)
+
+        # And over the employee calendars: meetings and busy hours per person
+        self.meetings_per_employee = []
+        self.hours_per_employee = []
+        for person in organization.get_employees():
+            meeting_count = hour_count = 0
+            for key, mask, meetings in self._busy_days(person.view_calendar()):
+                meeting_count += meetings
+                hour_count += bin(mask).count("1")
+            self.meetings_per_employee.append(meeting_count)
+            self.hours_per_employee.append(hour_count)
+
+        if self.use_numpy:
+            self._aggregate_numpy(masks, weekdays, buildings)
+        else:
+            self._aggregate_python(masks, weekdays, buildings)
+
+    def _busy_days(self, calendar: 'Calendar'):
+        """
+        Generates the busy hours of each day of the period that has meetings.
+
+        :param calendar: The Calendar to read.
+        :return: A generator of ((month, day), busy mask, number of meetings) tuples.
+        """
+        if calendar is Calendar.empty():
+            return
+        weekdays = self.weekdays
+        for month, days in calendar.occupied.items():
+            for day, meetings in days.items():
+                if meetings and (month, day) in weekdays:
+                    mask = count = 0
+                    for meeting in meetings:
+                        if meeting.get_description() != "Day does not exist":
+                            mask |= hours_mask(meeting.get_start_time(), meeting.get_end_time())
+                            count += 1
+                    if count:
+                        yield (month, day), mask, count
+
+    def _aggregate_numpy(self, masks: list, weekdays: list, buildings: list) -> None:
+        """
+        Sums the busy room-hours per weekday and hour and per building with NumPy.
+        """
+        bits = (numpy.array(masks, dtype=numpy.uint32)[:, None] >> numpy.arange(HOURS, dtype=numpy.uint32)) & 1
+        grid = numpy.zeros((WEEKDAYS, HOURS), dtype=numpy.int64)
+        numpy.add.at(grid, numpy.array(weekdays, dtype=numpy.intp), bits)
+        per_building = numpy.zeros(len(self.buildings), dtype=numpy.int64)
+        numpy.add.at(per_building, numpy.array(buildings, dtype=numpy.intp), bits.sum(axis=1))
+        self.busy_grid = grid.tolist()
+        self.busy_per_building = per_building.tolist()
+
+    def _aggregate_python(self, masks: list, weekdays: list, buildings: list) -> None:
+        """
+        Sums the busy room-hours per weekday and hour and per building without NumPy.
+        """
+        self.busy_grid = [[0] * HOURS for _ in range(WEEKDAYS)]
+        self.busy_per_building = [0] * len(self.buildings)
+        for mask, weekday, building in zip(masks, weekdays, buildings):
+            row = self.busy_grid[weekday]
+            self.busy_per_building[building] += bin(mask).count("1")
+            hour = 0
+            while mask:
+                if mask & 1:
+                    row[hour] += 1
+                mask >>= 1
+                hour += 1
+
+    def room_occupancy_by_hour(self) -> list:
+        """
+        Retrieves the share of room-days in which each hour is booked.
+
+        :return: A list of 24 rates between 0 and 1, indexed by hour.
+        """
+        available = self.room_count * len(self.weekdays)
+        return [sum(row[hour] for row in self.busy_grid) / available if available else 0.0
+                for hour in range(HOURS)]
+
+    def room_occupancy_by_weekday(self) -> list:
+        """
+        Retrieves the share of room-hours booked on each day of the week.
+
+        :return: A list of 7 rates between 0 and 1, Monday first.
+        """
+        return [sum(row) / (self.room_count * days * HOURS) if self.room_count and days else 0.0
+                for row, days in zip(self.busy_grid, self.days_per_weekday)]
+
+    def room_occupancy_by_building(self) -> dict:
+        """
+        Retrieves the share of room-hours booked in each building.
+
+        :return: A dictionary mapping each building prefix to a rate between 0 and 1.
+        """
+        hours = len(self.weekdays) * HOURS
+        return {building: busy / (rooms * hours) if hours else 0.0
+                for building, busy, rooms in zip(self.buildings, self.busy_per_building, self.rooms_per_building)}
+
+    def heat_map(self) -> list:
+        """
+        Retrieves the room occupancy rate for every weekday and hour.
+
+        :return: A 7 x 24 grid (a list of lists), Monday first, of rates between 0 and 1.
+        """
+        return [[busy / (self.room_count * days) if self.room_count and days else 0.0 for busy in row]
+                for row, days in zip(self.busy_grid, self.days_per_weekday)]
+
+    def meeting_load(self, percentiles=(50, 90, 99)) -> dict:
+        """
+        Summarizes how many meetings each employee has in the period.
+
+        :param percentiles: The percentiles to report (0-100).
+        :return: A summary as returned by percentile_summary.
+        """
+        return self._summarize(self.meetings_per_employee, percentiles)
+
+    def busy_hours_load(self, percentiles=(50, 90, 99)) -> dict:
+        """
+        Summarizes how many hours each employee spends in meetings in the period.
+
+        :param percentiles: The percentiles to report (0-100).
+        :return: A summary as returned by percentile_summary.
+        """
+        return self._summarize(self.hours_per_employee, percentiles)
+
+    def _summarize(self, values: list, percentiles) -> dict:
+        if not self.use_numpy or not values:
+            return percentile_summary(values, percentiles)
+        array = numpy.array(values)
+        summary = {"count": len(values), "mean": float(array.mean()), "min": int(array.min()), "max": int(array.max())}
+        for p, value in zip(percentiles, numpy.percentile(array, percentiles)):
+            summary[f"p{p}"] = float(value)
+        return summary
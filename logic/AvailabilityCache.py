@@ -0,0 +1,151 @@
+from collections import OrderedDict
+
+from logic.Calendar import Calendar
+from logic.FreeBusy import slot_is_clear, slot_is_free
+
+
+def _is_free(calendar: 'Calendar', month: int, day: int, start: int, end: int) -> bool:
+    """
+    Checks a calendar's time frame with the same rule as its is_busy: single-booking calendars
+    test the start and end hours, while shared ones reject any full hour of the time frame.
+
+    :return: True if the calendar is free from start to end.
+    """
+    busy = calendar.busy_mask(month, day)
+    if calendar.max_concurrent is not None:
+        return slot_is_clear(busy, start, end)
+    return slot_is_free(busy, start, end)
+
+
+class AvailabilityCache:
+    """
+    A bounded least-recently-used cache of "who is free" answers over a set of calendars.
+
+    Each entry remembers, per calendar, the calendar's ID, capacity mode and the version of the
+    queried day it was computed from. A repeated query compares those stamps and re-probes only the
+    calendars whose day changed, so the answer stays exact without any explicit invalidation.
+
+    When attached to an organization, the cache also keeps a generation counter per day,
+    bumped by the organization's change observers, and one for the directory, bumped when
+    employees or rooms are added, removed or updated, as well as the number of calendar
+    capacity mode changes, e.g. a room's max_bookings. A query over observed entities whose
+    day and directory have not changed since the entry was computed is answered without
+    looking at any calendar. Queries involving anyone else, e.g. people outside the
+    organization, always validate every calendar. Like the agenda cache, it only sees changes
+    made through the Calendar methods.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        """
+        Constructor for the AvailabilityCache class.
+
+        :param max_size: The maximum number of queries to keep.
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.reprobed = 0
+        self.generations = None
+        self.observed = None
+        self.directory_generation = 0
+
+    def attach(self, organization: 'Organization') -> None:
+        """
+        Starts counting changes per day in every calendar of an organization. The organization
+        reports changes to its directory through directory_changed().
+
+        :param organization: The Organization to watch.
+        """
+        self.generations = {}
+        self.observed = set(organization.employees).union(organization.rooms)
+        organization.subscribe(self._on_change)
+
+    def directory_changed(self, added=(), removed=()) -> None:
+        """
+        Records a change to the directory of the attached organization, so that no entry
+        computed before it is answered from the generation counters alone.
+
+        :param added: The Person or Room objects that are now observed.
+        :param removed: The Person or Room objects that are no longer observed.
+        """
+        self.directory_generation += 1
+        if self.observed is not None:
+            self.observed.update(added)
+            self.observed.difference_update(removed)
+
+    def _on_change(self, entity, op: str, month: int, day: int, detail=None) -> None:
+        """
+        Bumps the generation of a changed day. Matches the Organization.subscribe callback signature.
+        """
+        self.generations[(month, day)] = self.generations.get((month, day), 0) + 1
+
+    def free(self, entities: list, month: int, day: int, start: int, end: int) -> list:
+        """
+        Finds the employees or rooms that are free in a time frame. The values are not
+        validated; call Calendar.check_times first.
+
+        :param entities: The Person or Room objects to check.
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        :param start: The start time (0-23).
+        :param end: The end time (0-23).
+        :return: The free entities, in the given order.
+        """
+        key = (month, day, start, end, tuple(entities))
+        generation = None
+        if self.generations is not None and all(entity in self.observed for entity in entities):
+            generation = (self.directory_generation, Calendar.capacity_changes,
+                          self.generations.get((month, day), 0))
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            stamps, flags = [], []
+            for entity in entities:
+                calendar = entity.view_calendar()
+                stamps.append((calendar.uid, calendar.max_concurrent, calendar.get_version(month, day)))
+                flags.append(_is_free(calendar, month, day, start, end))
+            free = [entity for entity, is_free in zip(entities, flags) if is_free]
+            self.entries[key] = [generation, stamps, flags, free]
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+            return list(free)
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        if generation is not None and entry[0] == generation:
+            return list(entry[3])
+
+        stamps, flags = entry[1], entry[2]
+        changed = False
+        for index, entity in enumerate(entities):
+            calendar = entity.view_calendar()
+            stamp = (calendar.uid, calendar.max_concurrent, calendar.get_version(month, day))
+            if stamp != stamps[index]:
+                stamps[index] = stamp
+                flags[index] = _is_free(calendar, month, day, start, end)
+                self.reprobed += 1
+                changed = True
+        if changed:
+            entry[3] = [entity for entity, is_free in zip(entities, flags) if is_free]
+        entry[0] = generation
+        return list(entry[3])
+
+    def clear(self) -> None:
+        """
+        Drops every cached query and resets the statistics.
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.reprobed = 0
+
+    def stats(self) -> dict:
+        """
+        Retrieves the cache statistics.
+
+        :return: A dictionary with the hits, misses, calendars re-probed on hits, current size
+                 and maximum size.
+        """
+        return {"hits": self.hits, "misses": self.misses, "reprobed": self.reprobed,
+                "size": len(self.entries), "max_size": self.max_size}
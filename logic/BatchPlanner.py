@@ -0,0 +1,249 @@
+import argparse
+import json
+import sys
+
+from logic.Calendar import Calendar
+from logic.ConflictException import ConflictsException
+from logic.Meeting import Meeting
+from logic.Organization import Organization
+from logic.Person import Person
+
+
+def _names(value) -> list:
+    """
+    Parses a list of names: a JSON list, or a string separated by semicolons.
+    """
+    if isinstance(value, str):
+        return [name.strip() for name in value.split(";") if name.strip()]
+    return list(value)
+
+
+def _optional(value):
+    """
+    Parses an optional string field, where "" and "-" mean None.
+    """
+    return None if value in (None, "", "-") else str(value)
+
+
+# The fields of each command, in DSL order, with their parser and default value. A field
+# without a default is required. In the DSL the last field absorbs any remaining commas.
+_REQUIRED = object()
+COMMANDS = {
+    "meeting": (("month", int, _REQUIRED), ("day", int, _REQUIRED), ("start", int, _REQUIRED),
+                ("end", int, _REQUIRED), ("room", _optional, None), ("attendees", _names, ()),
+                ("description", str, "")),
+    "vacation": (("person", str, _REQUIRED), ("month", int, _REQUIRED), ("first_day", int, _REQUIRED),
+                 ("last_day", int, _REQUIRED)),
+    "free_rooms": (("month", int, _REQUIRED), ("day", int, _REQUIRED), ("start", int, _REQUIRED),
+                   ("end", int, _REQUIRED), ("capacity", int, 0), ("building", _optional, None)),
+    "busy": (("person", str, _REQUIRED), ("month", int, _REQUIRED), ("day", int, _REQUIRED),
+             ("start", int, _REQUIRED), ("end", int, _REQUIRED)),
+    "agenda": (("person", _optional, None), ("room", _optional, None), ("month", int, _REQUIRED),
+               ("day", int, None)),
+}
+
+
+def parse_command(line: str) -> tuple:
+    """
+    Parses one command line, in JSON or in the simple DSL.
+
+    A JSON command is an object with a "cmd" field naming the command and one field per
+    argument, e.g. {"cmd": "busy", "person": "Helen West", "month": 3, "day": 14, "start": 9, "end": 10}.
+    A DSL command is the command name, a space and its arguments separated by commas, e.g.
+    "meeting 3,14,9,10,JO7.221,Helen West;Mike Smith,Quarterly planning". Empty trailing
+    arguments take their default; "-" stands for no room or person.
+
+    :param line: The command line, without its line break.
+    :return: A (command name, dictionary of arguments) tuple.
+    :raises ValueError: If the line is not a valid command.
+    """
+    if line.startswith("{"):
+        values = json.loads(line)
+        name = values.pop("cmd", None)
+        spec = COMMANDS.get(name)
+        if spec is None:
+            raise ValueError(f"Unknown command: {name}")
+        unknown = values.keys() - {field for field, parser, default in spec}
+        if unknown:
+            raise ValueError(f"Unknown arguments: {', '.join(sorted(unknown))}")
+    else:
+        name, _, rest = line.partition(" ")
+        spec = COMMANDS.get(name)
+        if spec is None:
+            raise ValueError(f"Unknown command: {name}")
+        fields = rest.split(",", len(spec) - 1) if rest.strip() else []
+        values = {field: value.strip() for (field, parser, default), value in zip(spec, fields) if value.strip()}
+
+    arguments = {}
+    for field, parser, default in spec:
+        value = values.get(field)
+        if value is None:
+            if default is _REQUIRED:
+                raise ValueError(f"Missing argument: {field}")
+            arguments[field] = default
+        else:
+            arguments[field] = parser(value)
+    return name, arguments
+
+
+class BatchPlanner:
+    """
+    Runs planner commands non-interactively against an organization.
+
+    Each command gets one JSON status line in the output: {"line": n, "status": s, ...} where
+    s is "ok", "conflict" (the request clashed with booked meetings or invalid times) or
+    "error" (a malformed command or an unknown employee or room). Output is collected and
+    written in large blocks.
+    """
+
+    def __init__(self, organization: 'Organization', output=None, buffer_lines: int = 4096):
+        """
+        Constructor for the BatchPlanner class.
+
+        :param organization: The Organization to run the commands against.
+        :param output: A text stream for the status lines, or None to only count them.
+        :param buffer_lines: The number of status lines collected before each write.
+        """
+        self.organization = organization
+        self.output = output
+        self.buffer_lines = buffer_lines
+        self.counts = {"ok": 0, "conflict": 0, "error": 0}
+        self._buffer = []
+
+    def run(self, lines, stop_on_error: bool = False) -> dict:
+        """
+        Runs a stream of commands, one per line. Blank lines and lines starting with "#" are
+        skipped but still counted for line numbers.
+
+        :param lines: An iterable of command lines, e.g. an open file or sys.stdin.
+        :param stop_on_error: Whether to stop at the first command that does not succeed.
+        :return: The number of commands per status, for this run and all earlier ones.
+        """
+        try:
+            for number, line in enumerate(lines, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                status = self.execute(line, number)
+                if stop_on_error and status != "ok":
+                    break
+        finally:
+            self.flush()
+        return dict(self.counts)
+
+    def execute(self, line: str, number: int = 0) -> str:
+        """
+        Runs one command and records its status line.
+
+        :param line: The command line.
+        :param number: The line number reported in the status line.
+        :return: The status: "ok", "conflict" or "error".
+        """
+        try:
+            name, arguments = parse_command(line)
+            result = getattr(self, "_" + name)(**arguments)
+            record = {"line": number, "status": "ok", "result": result}
+        except ConflictsException as e:
+            record = {"line": number, "status": "conflict", "kind": e.kind, "message": str(e)}
+        except Exception as e:
+            record = {"line": number, "status": "error", "message": str(e)}
+
+        status = record["status"]
+        self.counts[status] += 1
+        if self.output is not None:
+            self._buffer.append(json.dumps(record))
+            if len(self._buffer) >= self.buffer_lines:
+                self.flush()
+        return status
+
+    def flush(self) -> None:
+        """
+        Writes the collected status lines to the output.
+        """
+        if self._buffer:
+            self.output.write("\n".join(self._buffer) + "\n")
+            self._buffer = []
+
+    def _meeting(self, month: int, day: int, start: int, end: int, room: str, attendees: list,
+                 description: str):
+        """
+        Schedules a meeting for its attendees and room, all or nothing.
+        """
+        people = [self.organization.get_employee(name) for name in attendees]
+        meeting = Meeting(month, day, start, end, people,
+                          self.organization.get_room(room) if room is not None else None, description)
+        conflicts = self.organization.book_meeting(meeting)
+        if conflicts:
+            owners = [entity.get_name() if isinstance(entity, Person) else entity.get_id() for entity in conflicts]
+            clashes = {id(clash): clash for e in conflicts.values() for clash in e.get_conflicts()}
+            kinds = {e.get_kind() for e in conflicts.values()}
+            raise ConflictsException(kind=kinds.pop() if len(kinds) == 1 else ConflictsException.OVERLAP,
+                                     owner=", ".join(owners), owner_type="calendars",
+                                     conflicts=list(clashes.values()))
+        return None
+
+    def _vacation(self, person: str, month: int, first_day: int, last_day: int):
+        """
+        Blocks whole days of an employee's calendar, all or nothing.
+        """
+        employee = self.organization.get_employee(person)
+        days = range(first_day, last_day + 1)
+        for day in days:
+            Calendar.check_times(month, day, 0, 23)
+            conflicts = employee.view_calendar().find_conflicts(month, day, 0, 23)
+            if conflicts:
+                raise ConflictsException(kind=ConflictsException.OVERLAP, owner=person, owner_type="attendee",
+                                         conflicts=conflicts)
+        for day in days:
+            employee.calendar.add_checked_meeting(Meeting(month, day, 0, 23, [employee], None, "Vacation"))
+        return len(days)
+
+    def _free_rooms(self, month: int, day: int, start: int, end: int, capacity: int, building: str):
+        """
+        Lists the IDs of the rooms free in a time frame.
+        """
+        return [room.get_id() for room in self.organization.find_free_rooms(month, day, start, end, capacity,
+                                                                            building=building)]
+
+    def _busy(self, person: str, month: int, day: int, start: int, end: int):
+        """
+        Checks whether an employee is busy in a time frame.
+        """
+        return self.organization.get_employee(person).is_busy(month, day, start, end)
+
+    def _agenda(self, person: str, room: str, month: int, day: int):
+        """
+        Prints the agenda of an employee or a room for a month or a day.
+        """
+        if (person is None) == (room is None):
+            raise ValueError("Give either a person or a room")
+        owner = self.organization.get_employee(person) if person is not None else self.organization.get_room(room)
+        return owner.print_agenda(month, day)
+
+
+def main(argv: list = None) -> int:
+    """
+    Command-line entry point: python -m logic.BatchPlanner [commands] [--employees FILE] [--rooms FILE]
+
+    :param argv: The arguments, or None for sys.argv.
+    :return: The exit status: 0 if every command succeeded, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Run planner commands non-interactively.")
+    parser.add_argument("commands", nargs="?", default="-", help="command file, or - for standard input")
+    parser.add_argument("--employees", help="employee directory file (CSV or JSON Lines)")
+    parser.add_argument("--rooms", help="room directory file (CSV or JSON Lines)")
+    parser.add_argument("--stop-on-error", action="store_true", help="stop at the first failed command")
+    args = parser.parse_args(argv)
+
+    organization = Organization.load(args.employees, args.rooms) if args.employees else Organization()
+    planner = BatchPlanner(organization, sys.stdout)
+    if args.commands == "-":
+        counts = planner.run(sys.stdin, args.stop_on_error)
+    else:
+        with open(args.commands, encoding="utf-8") as commands:
+            counts = planner.run(commands, args.stop_on_error)
+    return 0 if counts["conflict"] == counts["error"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,52 @@
+from bisect import bisect_left, bisect_right
+from itertools import count, islice
+
+from logic.AgendaCache import AgendaCache
 from logic.ConflictException import ConflictsException
+from logic.ContentHash import day_digest, meeting_changes, tree_digest
+from logic.FreeBusy import FreeBusy, hours_mask, slot_is_free
+from logic.Notifications import Subscription, watch_calendar
+
 
+def _add_level(levels: list, span: int) -> None:
+    """
+    Counts one more booking over the hours of a span.
+
+    :param levels: The occupancy levels of a day; levels[k] has bit h set when hour h has
+                   more than k bookings. Modified in place.
+    :param span: The bitmask of the booked hours.
+    """
+    if not levels or levels[-1] & span:
+        levels.append(0)
+    for k in range(len(levels) - 1, 0, -1):
+        levels[k] |= levels[k - 1] & span
+    levels[0] |= span
 
 class Calendar:
     """
     A calendar class to manage meetings, indexed by month and day.
     """
 
+    # Rendered agendas shared by every calendar, keyed by calendar, date and version
+    agenda_cache = AgendaCache()
+    _ids = count()
+
+    # The placeholder meetings blocking days that do not exist, shared by every calendar, and
+    # the shared empty calendar returned by empty(). Both are created on first use.
+    _placeholders = None
+    _empty = None
+    # The empty day lists that new calendars share until they write to them; see _new_storage
+    _template = None
+
+    # The capacity mode: None for single bookings under the usual overlap rule, or the number
+    # of concurrent bookings a shared space accepts; see set_max_concurrent. capacity_changes
+    # counts every change of mode, so caches of free/busy answers can tell they are stale.
+    max_concurrent = None
+    capacity_changes = 0
+    # (month, day) -> (day version, occupancy levels, whether the day does not exist), only
+    # kept in shared mode
+    _levels = None
+
     def __init__(self):
         """
         Default constructor, builds a calendar and initializes each day to an empty list.
@@ -15,18 +56,330 @@ class Calendar:
         Times are indexed 0 - 23.
         Need to check bounds when adding a meeting.
         """
+        # Version counters, bumped whenever a day changes. Missing entries are version 0.
+        self.uid = next(Calendar._ids)
+        self.day_versions = {}
+        self.month_versions = {}
+
+        # Copy-on-write bookkeeping. None means this calendar owns all of its storage; otherwise
+        # only the listed months and days are private to it, e.g. after forking.
+        self._owned_months = None
+        self._owned_days = None
+        self.base = None
+        self.base_versions = None
+        self.occupied = self._new_storage()
+
+        # The days changed in this calendar since it was forked, None if it is not a fork. Unlike
+        # the owned days, forking this calendar again does not reset them.
+        self._edited_days = None
+
+        # Functions notified after every change, created on first subscription
+        self.observers = None
+
+        # Range scan indexes, built by the first iter_range(): the sorted (month, day) keys of
+        # the days with meetings, and each day's meetings in time order with the day's version
+        self._day_index = None
+        self._sorted_days = {}
+
+        # Content digests of days, months (keyed by month) and the whole calendar (keyed by
+        # None), each with the version it was computed at
+        self._content_hashes = {}
+
+    def _new_storage(self) -> dict:
+        """
+        Builds the storage of a new calendar: a dictionary of months, each a dictionary of days,
+        each a list of meetings. Subclasses may return a mapping with the same interface.
+
+        The day lists are shared with every other new calendar and copied on the first write,
+        as in a fork, so creating a calendar does not build its 13 x 32 lists.
+
+        :return: The month dictionary.
+        """
+        if Calendar._template is None:
+            occupied = {month: {day: [] for day in range(0, 32)} for month in range(0, 13)}
+
+            # Not every month should have 31 days. Hack-ish method of handling it.
+            for month, day, placeholder in Calendar.placeholders():
+                occupied[month][day].append(placeholder)
+            Calendar._template = occupied
+        # The month dictionaries are private, only the days are owned one by one
+        self._owned_days = set()
+        return {month: dict(days) for month, days in Calendar._template.items()}
+
+    @staticmethod
+    def placeholders() -> list:
+        """
+        Retrieves the placeholder meetings that block the days that do not exist.
+
+        :return: A list of (month, day, Meeting) tuples, shared by every calendar.
+        """
+        if Calendar._placeholders is None:
+            Calendar._placeholders = Calendar._make_placeholders()
+        return Calendar._placeholders
+
+    @staticmethod
+    def _make_placeholders() -> list:
+        """
+        Builds the placeholder meetings that block the days that do not exist.
+
+        :return: A list of (month, day, Meeting) tuples.
+        """
         from logic.Meeting import Meeting
-        self.occupied = {month: {day: [] for day in range(0, 32)} for month in range(0, 13)}
-
-        # Not every month should have 31 days. Hack-ish method of handling it.
-        self.occupied[2][29].append(Meeting(2, 29, description="Day does not exist"))
-        self.occupied[2][30].append(Meeting(2, 30, description="Day does not exist"))
-        self.occupied[2][31].append(Meeting(2, 31, description="Day does not exist"))
-        self.occupied[4][31].append(Meeting(4, 31, description="Day does not exist"))
-        self.occupied[6][31].append(Meeting(6, 31, description="Day does not exist"))
-        self.occupied[9][31].append(Meeting(9, 31, description="Day does not exist"))
-        self.occupied[11][30].append(Meeting(11, 31, description="Day does not exist"))
-        self.occupied[11][31].append(Meeting(11, 31, description="Day does not exist"))
+        return [(2, 29, Meeting(2, 29, description="Day does not exist")),
+                (2, 30, Meeting(2, 30, description="Day does not exist")),
+                (2, 31, Meeting(2, 31, description="Day does not exist")),
+                (4, 31, Meeting(4, 31, description="Day does not exist")),
+                (6, 31, Meeting(6, 31, description="Day does not exist")),
+                (9, 31, Meeting(9, 31, description="Day does not exist")),
+                (11, 30, Meeting(11, 31, description="Day does not exist")),
+                (11, 31, Meeting(11, 31, description="Day does not exist"))]
+
+    @staticmethod
+    def empty() -> 'Calendar':
+        """
+        Retrieves a calendar without meetings shared by every Person and Room whose own calendar
+        has not been created yet. It must never be modified.
+
+        :return: The shared empty Calendar.
+        """
+        if Calendar._empty is None:
+            Calendar._empty = Calendar()
+        return Calendar._empty
+
+    def get_version(self, month: int, day: int = None) -> int:
+        """
+        Retrieves the version counter of a day or a whole month.
+
+        :param month: The month (1-12).
+        :param day: The day (1-31). If None, the month's version is returned.
+        :return: A number that changes every time a meeting on that day or in that month changes.
+        """
+        if day is None:
+            return self.month_versions.get(month, 0)
+        return self.day_versions.get((month, day), 0)
+
+    def _touch(self, month: int, day: int, op: str, detail=None) -> None:
+        """
+        Bumps the version counters of a day and its month after a change and notifies observers.
+
+        :param month: The month that changed (1-12).
+        :param day: The day that changed (1-31).
+        :param op: The kind of change: "add", "remove", "clear" or "replace".
+        :param detail: The added Meeting, the removed index, or the new list of meetings.
+        """
+        self.day_versions[(month, day)] = self.day_versions.get((month, day), 0) + 1
+        self.month_versions[month] = self.month_versions.get(month, 0) + 1
+        if self._edited_days is not None:
+            self._edited_days.add((month, day))
+        if self._day_index is not None:
+            self._reindex_day(month, day)
+        if self.observers:
+            for observer in list(self.observers):
+                observer(self, op, month, day, detail)
+
+    def refresh_day(self, month: int, day: int) -> None:
+        """
+        Bumps the version counters of a day whose meetings are unchanged but render differently,
+        e.g. after an attendee was renamed, so cached agendas and digests of it are rebuilt.
+        Observers are not notified.
+
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        """
+        self.day_versions[(month, day)] = self.day_versions.get((month, day), 0) + 1
+        self.month_versions[month] = self.month_versions.get(month, 0) + 1
+
+    def set_max_concurrent(self, max_concurrent: int = None) -> None:
+        """
+        Switches the calendar between single and shared bookings. Meetings already booked are
+        kept, even if they now exceed the limit.
+
+        In shared mode bookings are counted per hour (end hour included, as in busy_mask). Each
+        day keeps one 24-bit mask per occupancy level, so "can one more booking fit from 13 to
+        15" is a single mask test. A meeting is only rejected when some hour it covers is full;
+        containment is detected too. Days that do not exist are rejected either way.
+
+        :param max_concurrent: The number of bookings allowed at the same time (at least 1),
+                               or None for the usual single-booking rules.
+        :raises ValueError: If max_concurrent is less than 1.
+        """
+        if max_concurrent is not None and max_concurrent < 1:
+            raise ValueError("A shared calendar needs room for at least one booking")
+        if max_concurrent == self.max_concurrent:
+            return
+        self.max_concurrent = max_concurrent
+        self._levels = {} if max_concurrent is not None else None
+        Calendar.capacity_changes += 1
+
+    def subscribe(self, callback) -> None:
+        """
+        Registers a function to be called after every change to this calendar.
+
+        The callback is called as callback(calendar, op, month, day, detail), where op is
+        "add" (detail is the Meeting), "remove" (detail is the index), "clear" (detail is None)
+        or "replace" (detail is the new list of meetings for the day).
+
+        :param callback: The function to call.
+        """
+        if self.observers is None:
+            self.observers = []
+        self.observers.append(callback)
+
+    def unsubscribe(self, callback) -> None:
+        """
+        Removes a function registered with subscribe().
+
+        :param callback: The function to remove.
+        :raises ValueError: If the function is not registered.
+        """
+        if not self.observers:
+            raise ValueError("Callback is not subscribed")
+        self.observers.remove(callback)
+
+    def _writable_month(self, month: int) -> dict:
+        """
+        Retrieves a month's day dictionary for modification, copying it first if it is shared with a fork.
+
+        :param month: The month (1-12).
+        :return: The dictionary of days for that month, private to this calendar.
+        """
+        days = self.occupied.get(month)
+        if days is None:
+            days = self.occupied[month] = {}
+            if self._owned_months is not None:
+                self._owned_months.add(month)
+        elif self._owned_months is not None and month not in self._owned_months:
+            days = self.occupied[month] = dict(days)
+            self._owned_months.add(month)
+        return days
+
+    def _writable_day(self, month: int, day: int) -> list:
+        """
+        Retrieves a day's meeting list for modification, copying it first if it is shared with a fork.
+
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        :return: The list of meetings for that day, private to this calendar.
+        """
+        if self._owned_days is None:
+            days = self.occupied.get(month)
+            if days is None:
+                days = self.occupied[month] = {}
+            meetings = days.get(day)
+            if meetings is None:
+                meetings = days[day] = []
+            return meetings
+
+        days = self._writable_month(month)
+        if (month, day) not in self._owned_days:
+            days[day] = list(days.get(day, ()))
+            self._owned_days.add((month, day))
+        return days[day]
+
+    def fork(self) -> 'Calendar':
+        """
+        Creates a copy-on-write fork of this calendar.
+
+        The fork shares all day storage with this calendar. Whichever side modifies a day
+        afterwards copies just that day (and the dictionary of its month) first, so forking
+        is constant time and memory only grows with the edits made.
+
+        :return: The forked Calendar.
+        """
+        fork = self._new_fork()
+        fork.occupied = dict(self.occupied)
+        fork.uid = next(Calendar._ids)
+        fork.day_versions = dict(self.day_versions)
+        fork.month_versions = dict(self.month_versions)
+        fork._owned_months = set()
+        fork._owned_days = set()
+        fork.base = self
+        fork.base_versions = dict(self.day_versions)
+        fork._edited_days = set()
+        fork.observers = None
+        fork._day_index = None
+        fork._sorted_days = {}
+        # The fork has the same content at the same versions, so the digests stay valid
+        fork._content_hashes = dict(self._content_hashes)
+        if self.max_concurrent is not None:
+            fork.max_concurrent = self.max_concurrent
+            fork._levels = {}
+
+        # From now on this calendar shares its storage as well. If it is a fork itself, it
+        # still remembers which days it changed.
+        self._owned_months = set()
+        self._owned_days = set()
+        return fork
+
+    def _new_fork(self) -> 'Calendar':
+        """
+        Builds the uninitialized object of a fork, of the same class as this calendar.
+        """
+        return type(self).__new__(type(self))
+
+    def diff(self) -> list:
+        """
+        Compares a forked calendar with the calendar it was forked from.
+
+        Only the days modified in the fork are inspected, including those modified before the
+        fork was forked again.
+
+        :return: A list of (month, day, added, removed) tuples, where added and removed are lists
+                 of Meeting objects, for every day that differs.
+        :raises ValueError: If this calendar is not a fork.
+        """
+        if self.base is None:
+            raise ValueError("Calendar is not a fork")
+        changes = []
+        for month, day in sorted(self._edited_days):
+            mine = self.occupied.get(month, {}).get(day, ())
+            theirs = self.base.occupied.get(month, {}).get(day, ())
+            if mine is theirs:
+                continue
+            added = [meeting for meeting in mine if not any(meeting is other for other in theirs)]
+            removed = [meeting for meeting in theirs if not any(meeting is other for other in mine)]
+            if added or removed:
+                changes.append((month, day, added, removed))
+        return changes
+
+    def check_commit(self) -> None:
+        """
+        Verifies that the days modified in this fork were not changed in the base calendar since the fork.
+
+        :raises ConflictsException: If a modified day was also changed in the base calendar.
+        :raises ValueError: If this calendar is not a fork.
+        """
+        if self.base is None:
+            raise ValueError("Calendar is not a fork")
+        for month, day in self._edited_days:
+            if self.base.get_version(month, day) != self.base_versions.get((month, day), 0):
+                raise ConflictsException(kind=ConflictsException.FORK_CONFLICT)
+
+    def commit(self) -> None:
+        """
+        Writes the days modified in this fork back to the calendar it was forked from.
+
+        :raises ConflictsException: If a modified day was also changed in the base calendar.
+        :raises ValueError: If this calendar is not a fork.
+        """
+        self.check_commit()
+        for month, day, added, removed in self.diff():
+            self.base.replace_day(month, day, self.occupied[month][day])
+            self.base_versions[(month, day)] = self.base.get_version(month, day)
+
+    def watch(self, first_day: tuple = None, last_day: tuple = None, callback=None,
+              max_queue: int = 1024, flush_window: float = 0.1) -> 'Subscription':
+        """
+        Subscribes to changes of this calendar, coalesced into one event per day per flush window.
+
+        :param first_day: The first (month, day) to report changes for, or None for no lower bound.
+        :param last_day: The last (month, day) to report changes for, or None for no upper bound.
+        :param callback: A function called with the list of events of each flush, or None.
+        :param max_queue: The maximum number of unconsumed events kept; the oldest are dropped.
+        :param flush_window: The number of seconds changes are coalesced for before a flush.
+        :return: The Subscription. Iterate it with "async for", poll() it, or close() it.
+        """
+        return watch_calendar(self, self, Subscription(first_day, last_day, callback, max_queue, flush_window))
 
     def is_busy(self, month: int, day: int, start: int, end: int) -> bool:
         """
@@ -36,11 +389,14 @@ class Calendar:
         :param day: The day of the meeting (1-31)
         :param start: The start time of the meeting (0-23)
         :param end: The end time of the meeting (0-23)
-        :return: True if the time slot is occupied, False otherwise.
+        :return: True if the time slot is occupied, False otherwise. In shared mode, True if
+                 some hour of the time slot is full.
         """
         busy = False
 
         self.check_times(month, day, start, end)
+        if self.max_concurrent is not None:
+            return bool(self.full_mask(month, day) & hours_mask(start, end))
 
         for to_check in self.occupied[month][day]:
             if start >= to_check.get_start_time() and start <= to_check.get_end_time():
@@ -49,6 +405,35 @@ class Calendar:
                 busy = True
         return busy
 
+    def is_busy_many(self, probes, as_bits: bool = False):
+        """
+        Checks many time frames at once, e.g. every hour of a week.
+
+        Every probe is validated, in order, before any is answered, and each day touched is scanned once.
+
+        :param probes: A sequence of (month, day, start, end) tuples, or rows of an array.
+        :param as_bits: If True, return an int whose bit i is set when probe i is busy.
+        :return: A list of booleans (True if busy) in probe order, or the bit array.
+        :raises ConflictsException: If any probe has invalid time values.
+        """
+        probes = [tuple(probe) for probe in probes]
+        for month, day, start, end in dict.fromkeys(probes):
+            self.check_times(month, day, start, end)
+
+        masks = {}
+        shared = self.max_concurrent is not None
+        result = [] if not as_bits else 0
+        for index, (month, day, start, end) in enumerate(probes):
+            mask = masks.get((month, day))
+            if mask is None:
+                mask = masks[(month, day)] = self.busy_mask(month, day)
+            busy = bool(mask & hours_mask(start, end)) if shared else not slot_is_free(mask, start, end)
+            if as_bits:
+                result |= busy << index
+            else:
+                result.append(busy)
+        return result
+
     @staticmethod
     def check_times(m_month: int, m_day: int, m_start: int, m_end: int) -> None:
         """
@@ -61,15 +446,15 @@ class Calendar:
         :raises ConflictsException: If any of the values are invalid.
         """
         if m_day < 1 or m_day > 30:
-            raise ConflictsException("Day does not exist.")
+            raise ConflictsException(kind=ConflictsException.INVALID_DAY)
         if m_month < 1 or m_month >= 12:
-            raise ConflictsException("Month does not exist.")
+            raise ConflictsException(kind=ConflictsException.INVALID_MONTH)
         if m_start < 0 or m_start >= 23:
-            raise ConflictsException("Illegal hour.")
+            raise ConflictsException(kind=ConflictsException.ILLEGAL_HOUR)
         if m_end < 0 or m_end > 23:
-            raise ConflictsException("Illegal hour.")
+            raise ConflictsException(kind=ConflictsException.ILLEGAL_HOUR)
         if m_start > m_end:
-            raise ConflictsException("Meeting starts before it ends.")
+            raise ConflictsException(kind=ConflictsException.BAD_ORDER)
 
     def add_meeting(self, to_add: 'Meeting') -> None:
         """
@@ -85,37 +470,69 @@ class Calendar:
 
         self.check_times(m_month, m_day, m_start, m_end)
 
-        # Check if the date exists in the calendar
-        if m_month not in self.occupied:
-            self.occupied[m_month] = {}
-        if m_day not in self.occupied[m_month]:
-            self.occupied[m_month][m_day] = []
+        conflicts = self.find_conflicts(m_month, m_day, m_start, m_end)
+        if conflicts:
+            raise ConflictsException(kind=ConflictsException.OVERLAP, conflicts=conflicts)
+        else:
+            self.add_checked_meeting(to_add)
 
-        # Check whether a meeting is already scheduled at this time
-        that_day = self.occupied[m_month][m_day]
-        booked = False
-        conflict = None
+    def find_conflicts(self, month: int, day: int, start: int, end: int) -> list:
+        """
+        Finds every meeting that a new meeting in the given time frame would overlap with.
+        The values are not validated; call check_times first.
 
-        for to_check in that_day:
+        :param month: The month of the meeting (1-12)
+        :param day: The day of the meeting (1-31)
+        :param start: The start time of the meeting (0-23)
+        :param end: The end time of the meeting (0-23)
+        :return: A list of the conflicting Meeting objects, empty if the time frame is free. In
+                 shared mode, the meetings covering the full hours of the time frame.
+        :raises ConflictsException: If the day does not exist.
+        """
+        if self.max_concurrent is not None:
+            levels, missing = self._day_levels(month, day)
+            if missing:
+                raise ConflictsException(kind=ConflictsException.INVALID_DAY)
+            full = self.full_mask(month, day) & hours_mask(start, end)
+            if not full:
+                return []
+            return [meeting for meeting in self.occupied[month][day]
+                    if hours_mask(meeting.get_start_time(), meeting.get_end_time()) & full]
+
+        conflicts = []
+        for to_check in self.occupied.get(month, {}).get(day, ()):
             if to_check.get_description() == "Day does not exist":
-                 raise ConflictsException("Day does not exist.")
-            if to_check.get_description() != "Day does not exist":
-                # Does the start time fall between this meeting's start and end times?
-                if m_start >= to_check.get_start_time() and m_start <= to_check.get_end_time():
-                    booked = True
-                    conflict = to_check
-                # Does the end time fall between this meeting's start and end times?
-                elif m_end >= to_check.get_start_time() and m_end <= to_check.get_end_time():
-                    booked = True
-                    conflict = to_check
-
-        if booked:
-            raise ConflictsException(
-                f"Overlap with another item - {conflict.get_description()} "
-                f"- scheduled from {conflict.get_start_time()} and {conflict.get_end_time()}"
-            )
-        else:
-            self.occupied[m_month][m_day].append(to_add)
+                raise ConflictsException(kind=ConflictsException.INVALID_DAY)
+            # Does the start time fall between this meeting's start and end times?
+            if start >= to_check.get_start_time() and start <= to_check.get_end_time():
+                conflicts.append(to_check)
+            # Does the end time fall between this meeting's start and end times?
+            elif end >= to_check.get_start_time() and end <= to_check.get_end_time():
+                conflicts.append(to_check)
+        return conflicts
+
+    def add_checked_meeting(self, to_add: 'Meeting') -> None:
+        """
+        Adds a meeting that has already been validated with check_times and find_conflicts.
+
+        :param to_add: A Meeting object to add to the calendar.
+        """
+        month = to_add.get_month()
+        day = to_add.get_day()
+        if self.max_concurrent is None:
+            self._writable_day(month, day).append(to_add)
+            self._touch(month, day, "add", to_add)
+            return
+
+        # Update the occupancy levels of the day in place instead of rebuilding them
+        self._day_levels(month, day)
+        self._writable_day(month, day).append(to_add)
+        self._touch(month, day, "add", to_add)
+        version, levels, missing = self._levels[(month, day)]
+        # Observers may already have rebuilt the levels for the new version
+        if version != self.get_version(month, day):
+            _add_level(levels, hours_mask(to_add.get_start_time(), to_add.get_end_time()))
+            self._levels[(month, day)] = (self.get_version(month, day), levels, missing)
 
     def clear_schedule(self, month: int, day: int) -> None:
         """
@@ -123,36 +540,80 @@ class Calendar:
 
         :param month: The month for which the schedule should be cleared (1-12).
         :param day: The day for which the schedule should be cleared (1-31).
+        :raises KeyError: If the month does not exist.
         """
-        self.occupied[month][day] = []
+        self.occupied[month]
+        self._writable_month(month)[day] = []
+        if self._owned_days is not None:
+            self._owned_days.add((month, day))
+        self._touch(month, day, "clear")
 
     def print_agenda(self, month: int, day: int = None) -> str:
         """
         Prints the agenda for a given month or day in string format.
 
+        Rendered agendas are cached against the version of the day or month, so repeated
+        calls are cheap until a meeting is added or removed through this calendar. Meetings
+        edited in place after booking are not detected.
+
         :param month: The month of the meeting (1-12)
         :param day: The day of the meeting (1-31). If None, prints agenda for the whole month.
         :return: A formatted string with all meetings.
         """
+        key = (self.uid, month, day, self.get_version(month, day))
+        agenda = self.agenda_cache.get(key)
+        if agenda is None:
+            agenda = self._render_agenda(month, day)
+            self.agenda_cache.put(key, agenda)
+        return agenda
+
+    def _render_agenda(self, month: int, day: int = None) -> str:
+        """
+        Renders the agenda for a given month or day, bypassing the cache.
+
+        :param month: The month of the meeting (1-12)
+        :param day: The day of the meeting (1-31). If None, renders the whole month.
+        :return: A formatted string with all meetings.
+        """
+        return "".join(self.iter_agenda(month, day))
+
+    def iter_agenda(self, month: int, day: int = None):
+        """
+        Renders the agenda for a given month or day line by line, bypassing the cache, so a
+        large agenda can be written out without building it as one string.
+
+        :param month: The month of the meeting (1-12)
+        :param day: The day of the meeting (1-31). If None, renders the whole month.
+        :return: An iterator of strings that join to the text of print_agenda().
+        """
         if day is None:
             if month not in self.occupied or not any(self.occupied[month].values()):
-                return "No Meetings booked for this month.\n\n"
+                yield "No Meetings booked for this month.\n\n"
+                return
 
-            agenda = f"Agenda for {month}:\n"
+            yield f"Agenda for {month}:\n"
             for d, meetings in self.occupied[month].items():
                 for meeting in meetings:
-                    agenda += str(meeting) + "\n"
-
-            return agenda
+                    yield str(meeting) + "\n"
         else:
             if month not in self.occupied or day not in self.occupied[month] or not self.occupied[month][day]:
-                return "No Meetings booked on this date.\n\n"
+                yield "No Meetings booked on this date.\n\n"
+                return
 
-            agenda = f"Agenda for {month}/{day} are as follows:\n"
+            yield f"Agenda for {month}/{day} are as follows:\n"
             for meeting in self.occupied[month][day]:
-                agenda += str(meeting) + "\n"
+                yield str(meeting) + "\n"
+
+    def replace_day(self, month: int, day: int, meetings: list) -> None:
+        """
+        Replaces every meeting of a day without conflict checks, e.g. to apply a synchronized copy.
 
-            return agenda
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        :param meetings: The new list of Meeting objects for that day.
+        """
+        self._writable_day(month, day)[:] = meetings
+        self._touch(month, day, "replace", list(meetings))
 
     def get_meeting(self, month: int, day: int, index: int) -> 'Meeting':
         """
@@ -166,6 +627,306 @@ class Calendar:
         """
         return self.occupied[month][day][index]
 
+    def get_meetings(self, month: int, day: int) -> list:
+        """
+        Retrieves every meeting booked on the given date, in booking order.
+
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        :return: The list of Meeting objects for that day. It must not be modified directly.
+        """
+        return self.occupied[month][day]
+
+    def iter_meetings(self):
+        """
+        Iterates over every booked meeting, skipping the placeholders for days that do not exist.
+
+        :return: A generator of Meeting objects, in month and day order.
+        """
+        for month in sorted(self.occupied):
+            days = self.occupied[month]
+            for day in sorted(days):
+                for meeting in days[day]:
+                    if meeting.get_description() != "Day does not exist":
+                        yield meeting
+
+    def _reindex_day(self, month: int, day: int) -> None:
+        """
+        Adds a day to or removes it from the range scan index after a change.
+
+        :param month: The month that changed (1-12).
+        :param day: The day that changed (1-31).
+        """
+        key = (month, day)
+        position = bisect_left(self._day_index, key)
+        present = position < len(self._day_index) and self._day_index[position] == key
+        if self._sorted_meetings(month, day):
+            if not present:
+                self._day_index.insert(position, key)
+        elif present:
+            del self._day_index[position]
+
+    def _sorted_meetings(self, month: int, day: int) -> list:
+        """
+        Retrieves a day's meetings in time order, skipping placeholders. The order is cached
+        against the day's version.
+
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        :return: A list of Meeting objects sorted by start and end time. It must not be modified.
+        """
+        version = self.get_version(month, day)
+        cached = self._sorted_days.get((month, day))
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        meetings = sorted((meeting for meeting in self.occupied.get(month, {}).get(day, ())
+                           if meeting.get_description() != "Day does not exist"),
+                          key=lambda meeting: (meeting.get_start_time(), meeting.get_end_time()))
+        self._sorted_days[(month, day)] = (version, meetings)
+        return meetings
+
+    def iter_range(self, first: tuple = (1, 1, 0), last: tuple = (12, 31, 23), limit: int = None):
+        """
+        Iterates over the meetings between two points in time, ordered by date and start time.
+
+        Only the days that have meetings are visited, so the cost is proportional to the number
+        of meetings returned. Like print_agenda, it only sees changes made through this
+        calendar's methods. To fetch the next page, pass range_cursor() of the last meeting
+        returned as the new first point, so meetings starting at the same hour are not skipped.
+
+        :param first: The first (month, day, hour) to include; meetings starting earlier are skipped.
+                      A (month, day, hour, position) cursor also skips the first position
+                      meetings starting at that hour.
+        :param last: The last (month, day, hour) to include; meetings starting later are skipped.
+        :param limit: The maximum number of meetings to return, or None for no limit.
+        :return: A lazy iterator of Meeting objects.
+        """
+        if self._day_index is None:
+            self._day_index = sorted((month, day) for month, days in self.occupied.items()
+                                     for day in days if self._sorted_meetings(month, day))
+        meetings = self._scan_range(first, last)
+        return meetings if limit is None else islice(meetings, limit)
+
+    def _scan_range(self, first: tuple, last: tuple):
+        """
+        Generates the meetings of iter_range() without a limit.
+        """
+        index = self._day_index
+        position = bisect_left(index, first[:2])
+        while position < len(index) and index[position] <= last[:2]:
+            month, day = index[position]
+            meetings = self._sorted_meetings(month, day)
+            low, high = 0, len(meetings)
+            if (month, day) == first[:2]:
+                low = bisect_left([meeting.get_start_time() for meeting in meetings], first[2])
+                if len(first) > 3:
+                    low += first[3]
+            if (month, day) == last[:2]:
+                high = bisect_right([meeting.get_start_time() for meeting in meetings], last[2])
+            yield from meetings[low:high]
+            # The index may change while the caller consumes the meetings
+            position = bisect_right(index, (month, day))
+
+    def range_cursor(self, meeting: 'Meeting') -> tuple:
+        """
+        Builds the point to resume iter_range() from right after a meeting it returned.
+
+        :param meeting: The last Meeting object of a page.
+        :return: A (month, day, start, position) tuple, where position counts the meetings
+                 starting at the same hour up to and including this one.
+        :raises ValueError: If the meeting is not booked in this calendar.
+        """
+        month, day, start = meeting.get_month(), meeting.get_day(), meeting.get_start_time()
+        meetings = self._sorted_meetings(month, day)
+        low = bisect_left([booked.get_start_time() for booked in meetings], start)
+        for position in range(low, len(meetings)):
+            if meetings[position].get_start_time() != start:
+                break
+            if meetings[position] is meeting:
+                return month, day, start, position - low + 1
+        raise ValueError("Meeting is not booked in this calendar")
+
+    def busy_mask(self, month: int, day: int) -> int:
+        """
+        Retrieves the hours of a day that are covered by meetings as a bitmask.
+
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        :return: A bitmask where bit h is set when some meeting covers hour h (end hour included).
+                 In shared mode, the full hours, so that free/busy views and room searches
+                 treat a shared space as busy only when it is full.
+        """
+        if self.max_concurrent is not None:
+            return self.full_mask(month, day)
+        mask = 0
+        for meeting in self.occupied.get(month, {}).get(day, ()):
+            mask |= hours_mask(meeting.get_start_time(), meeting.get_end_time())
+        return mask
+
+    def _day_levels(self, month: int, day: int) -> tuple:
+        """
+        Retrieves the occupancy levels of a day, rebuilding them if the day changed.
+
+        :return: A (levels, whether the day does not exist) tuple.
+        """
+        version = self.get_version(month, day)
+        entry = self._levels.get((month, day))
+        if entry is None or entry[0] != version:
+            levels, missing = [], False
+            for meeting in self.occupied.get(month, {}).get(day, ()):
+                if meeting.get_description() == "Day does not exist":
+                    missing = True
+                else:
+                    _add_level(levels, hours_mask(meeting.get_start_time(), meeting.get_end_time()))
+            entry = self._levels[(month, day)] = (version, levels, missing)
+        return entry[1], entry[2]
+
+    def full_mask(self, month: int, day: int) -> int:
+        """
+        Retrieves the hours of a day that cannot take another booking in shared mode.
+
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        :return: A bitmask where bit h is set when hour h holds max_concurrent bookings.
+        """
+        levels, missing = self._day_levels(month, day)
+        if missing:
+            return hours_mask(0, 23)
+        return levels[self.max_concurrent - 1] if len(levels) >= self.max_concurrent else 0
+
+    def occupancy(self, month: int, day: int) -> list:
+        """
+        Counts the bookings of each hour of a day in shared mode.
+
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        :return: A list of 24 booking counts, one per hour.
+        """
+        levels, missing = self._day_levels(month, day)
+        return [sum(level >> hour & 1 for level in levels) for hour in range(24)]
+
+    def max_occupancy(self, month: int, day: int, start: int, end: int) -> int:
+        """
+        Finds the largest number of concurrent bookings in a time frame in shared mode.
+
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        :param start: The first hour (0-23).
+        :param end: The last hour (0-23), inclusive.
+        :return: The booking count of the busiest hour from start to end.
+        """
+        levels, missing = self._day_levels(month, day)
+        span = hours_mask(start, end)
+        low, high = 0, len(levels)
+        # Levels are nested, so the occupied ones form a prefix
+        while low < high:
+            middle = (low + high) // 2
+            if levels[middle] & span:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def free_busy(self, first_day: tuple = (1, 1), last_day: tuple = (12, 31)) -> 'FreeBusy':
+        """
+        Exports the busy hours of a date range without any meeting details.
+
+        :param first_day: The first (month, day) of the range, inclusive.
+        :param last_day: The last (month, day) of the range, inclusive.
+        :return: A FreeBusy object with one busy mask per day that has meetings.
+        """
+        masks = {}
+        for month in range(first_day[0], last_day[0] + 1):
+            for day, meetings in self.occupied.get(month, {}).items():
+                if meetings and first_day <= (month, day) <= last_day:
+                    masks[(month, day)] = self.busy_mask(month, day)
+        return FreeBusy(masks)
+
+    def day_hash(self, month: int, day: int) -> bytes:
+        """
+        Retrieves a digest of the content of a day's meetings, independent of their order.
+        Digests are cached and only recomputed after the day changes.
+
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        :return: A 16-byte digest; equal digests mean equal meetings.
+        """
+        version = self.get_version(month, day)
+        entry = self._content_hashes.get((month, day))
+        if entry is None or entry[0] != version:
+            entry = self._content_hashes[(month, day)] = (
+                version, day_digest(self.occupied.get(month, {}).get(day, ())))
+        return entry[1]
+
+    def month_hash(self, month: int) -> bytes:
+        """
+        Retrieves a digest of the content of a month, rolled up from its day digests.
+
+        :param month: The month (1-12).
+        :return: A 16-byte digest.
+        """
+        version = self.get_version(month)
+        entry = self._content_hashes.get(month)
+        if entry is None or entry[0] != version:
+            days = self.occupied.get(month, {})
+            entry = self._content_hashes[month] = (
+                version, tree_digest((day, self.day_hash(month, day)) for day in sorted(days) if days[day]))
+        return entry[1]
+
+    def content_hash(self) -> bytes:
+        """
+        Retrieves a digest of the whole calendar, rolled up from its month digests.
+
+        :return: A 16-byte digest; equal digests mean equal calendars.
+        """
+        # Versions only grow, so their sum changes whenever any day does
+        version = sum(self.month_versions.values())
+        entry = self._content_hashes.get(None)
+        if entry is None or entry[0] != version:
+            entry = self._content_hashes[None] = (
+                version, tree_digest((month, self.month_hash(month)) for month in sorted(self.occupied)))
+        return entry[1]
+
+    def content_diff(self, other: 'Calendar') -> list:
+        """
+        Compares the content of two calendars, e.g. this organization's copy of a schedule and
+        another system's. Only the months and days whose digests differ are inspected, and
+        meetings are matched by content rather than identity.
+
+        :param other: The calendar to compare with.
+        :return: A list of (month, day, added, removed) tuples for every day that differs, where
+                 added are the meetings of other missing here and removed are the meetings here
+                 missing from other.
+        """
+        if self.content_hash() == other.content_hash():
+            return []
+        changes = []
+        for month in sorted(set(self.occupied).union(other.occupied)):
+            if self.month_hash(month) == other.month_hash(month):
+                continue
+            days = set(self.occupied.get(month, {})).union(other.occupied.get(month, {}))
+            for day in sorted(days):
+                if self.day_hash(month, day) != other.day_hash(month, day):
+                    added, removed = meeting_changes(self.occupied.get(month, {}).get(day, ()),
+                                                     other.occupied.get(month, {}).get(day, ()))
+                    changes.append((month, day, added, removed))
+        return changes
+
+    def index_of(self, month: int, day: int, meeting: 'Meeting') -> int:
+        """
+        Finds the index of a specific meeting object on the given date.
+
+        :param month: The month of the meeting (1-12).
+        :param day: The day of the meeting (1-31).
+        :param meeting: The Meeting object to look for.
+        :return: The index of the meeting in the list for that day.
+        :raises ValueError: If the meeting is not booked on that date.
+        """
+        for index, booked in enumerate(self.occupied[month][day]):
+            if booked is meeting:
+                return index
+        raise ValueError("Meeting is not booked on this date")
+
     def remove_meeting(self, month: int, day: int, index: int) -> None:
         """
         Removes a meeting from the calendar at the specified date and index.
@@ -173,6 +934,10 @@ class Calendar:
         :param month: The month of the meeting (1-12).
         :param day: The day of the meeting (1-31).
         :param index: The index of the meeting to be removed in the list.
+        :raises KeyError: If the month or day does not exist.
         :raises IndexError: If the index is out of range for the given date.
         """
-        del self.occupied[month][day][index]
+        # Checked before the day is copied, so a bad date leaves no empty entries behind
+        self.occupied[month][day]
+        del self._writable_day(month, day)[index]
+        self._touch(month, day, "remove", index)
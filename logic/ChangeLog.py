@@ -0,0 +1,219 @@
+import json
+import os
+import time
+import weakref
+from itertools import count
+
+from logic.Meeting import Meeting
+from logic.Person import Person
+
+
+class ChangeLog:
+    """
+    An ordered log of calendar changes, appended as JSON lines to a file that replicas tail.
+
+    Every record carries a sequence number, a timestamp, the owner of the calendar
+    ("person" or "room" plus the employee's stable key or the room ID), the change and
+    the day it applies to. Attendees are identified by their key as well, so renamed
+    employees still match. Meetings are identified by a serial number so a meeting shared
+    by several calendars is rebuilt as one object on the replica.
+    """
+
+    def __init__(self, path: str, flush_every: int = 1):
+        """
+        Constructor for the ChangeLog class.
+
+        :param path: The file to append records to. It is created if it does not exist.
+        :param flush_every: Flush the file after this many records. Defaults to every record.
+        """
+        self.path = path
+        self.flush_every = flush_every
+        self.seq = 0
+        self._unflushed = 0
+        self._file = open(path, "a", encoding="utf-8")
+        self._serials = weakref.WeakKeyDictionary()
+        self._next_serial = count(1)
+
+    def attach(self, organization: 'Organization') -> None:
+        """
+        Starts logging every change to the calendars of an organization.
+
+        :param organization: The Organization to watch.
+        """
+        organization.subscribe(self.record)
+
+    def record(self, entity, op: str, month: int, day: int, detail=None) -> None:
+        """
+        Appends one change record. Matches the Organization.subscribe callback signature.
+
+        :param entity: The Person or Room whose calendar changed.
+        :param op: The kind of change: "add", "remove", "clear" or "replace".
+        :param month: The month that changed (1-12).
+        :param day: The day that changed (1-31).
+        :param detail: The added Meeting, the removed index, or the new list of meetings.
+        """
+        self.seq += 1
+        if isinstance(entity, Person):
+            owner_type, owner = "person", entity.get_key()
+        else:
+            owner_type, owner = "room", entity.get_id()
+
+        record = {"seq": self.seq, "time": time.time(), "type": owner_type, "owner": owner,
+                  "op": op, "month": month, "day": day}
+        if op == "add":
+            record["meeting"] = self._encode(detail)
+        elif op == "remove":
+            record["index"] = detail
+        elif op == "replace":
+            record["meetings"] = [self._encode(meeting) for meeting in detail]
+
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every:
+            self.flush()
+
+    def _encode(self, meeting: 'Meeting') -> dict:
+        """
+        Serializes a meeting, assigning it a serial number the first time it is seen.
+
+        :param meeting: The Meeting object.
+        :return: A JSON-compatible dictionary.
+        """
+        serial = self._serials.get(meeting)
+        if serial is None:
+            serial = self._serials[meeting] = next(self._next_serial)
+        room = meeting.get_room()
+        return {"id": serial, "start": meeting.get_start_time(), "end": meeting.get_end_time(),
+                "description": meeting.get_description(), "room": room.get_id() if room else None,
+                "attendees": [person.get_key() for person in meeting.get_attendees()]}
+
+    def flush(self) -> None:
+        """
+        Flushes buffered records to the file so replicas can read them.
+        """
+        self._file.flush()
+        self._unflushed = 0
+
+    def close(self) -> None:
+        """
+        Flushes and closes the log file.
+        """
+        self._file.close()
+
+
+class Replica:
+    """
+    A read-only copy of an organization's calendars, kept up to date by tailing a ChangeLog file.
+    """
+
+    def __init__(self, path: str, organization: 'Organization' = None):
+        """
+        Constructor for the Replica class.
+
+        :param path: The ChangeLog file to tail.
+        :param organization: The Organization to apply changes to. It must have the same
+                             directory as the leader. Defaults to a new Organization.
+        """
+        if organization is None:
+            from logic.Organization import Organization
+            organization = Organization()
+        self.path = path
+        self.organization = organization
+        self.offset = 0
+        self.applied_seq = 0
+        self.last_record_time = None
+        self.last_applied_time = None
+        self._meetings = {}
+
+    def get_organization(self) -> 'Organization':
+        """
+        Retrieves the replicated organization. It must only be read, never modified directly.
+
+        :return: The Organization object.
+        """
+        return self.organization
+
+    def poll(self) -> int:
+        """
+        Reads and applies every complete record appended to the log since the last poll.
+
+        A record only counts as read once it has been applied. If one cannot be applied, e.g.
+        because its owner is not in the replica's directory yet, it is retried by the next poll.
+
+        :return: The number of records applied.
+        :raises KeyError: If a record's owner is not in the replica's organization.
+        """
+        if not os.path.exists(self.path):
+            return 0
+        applied = 0
+        with open(self.path, "rb") as log:
+            log.seek(self.offset)
+            for line in log:
+                if not line.endswith(b"\n"):
+                    # The leader is still writing this record
+                    break
+                record = json.loads(line)
+                if record["seq"] > self.applied_seq:
+                    self._apply(record)
+                    applied += 1
+                self.offset += len(line)
+        return applied
+
+    def _apply(self, record: dict) -> None:
+        """
+        Applies one change record to the replicated calendars.
+
+        :param record: The decoded record.
+        """
+        # Resolved on every record, so employees and rooms added to the replica later are found
+        organization = self.organization
+        owners = organization._people_by_key if record["type"] == "person" else organization._rooms_by_id
+        calendar = owners[record["owner"]].calendar
+        month, day, op = record["month"], record["day"], record["op"]
+
+        if op == "add":
+            calendar.add_meeting(self._decode(record["meeting"], month, day))
+        elif op == "remove":
+            calendar.remove_meeting(month, day, record["index"])
+        elif op == "clear":
+            calendar.clear_schedule(month, day)
+        elif op == "replace":
+            calendar.replace_day(month, day, [self._decode(meeting, month, day) for meeting in record["meetings"]])
+
+        self.applied_seq = record["seq"]
+        self.last_record_time = record["time"]
+        self.last_applied_time = time.time()
+
+    def _decode(self, data: dict, month: int, day: int) -> 'Meeting':
+        """
+        Rebuilds a meeting, reusing the replica's object if the meeting was seen before.
+
+        :param data: The serialized meeting.
+        :param month: The month of the meeting.
+        :param day: The day of the meeting.
+        :return: The Meeting object.
+        """
+        meeting = self._meetings.get(data["id"])
+        if meeting is None:
+            people = self.organization._people_by_key
+            attendees = [people[key] for key in data["attendees"] if key in people]
+            meeting = Meeting(month, day, data["start"], data["end"], attendees,
+                              self.organization._rooms_by_id.get(data["room"]), data["description"])
+            self._meetings[data["id"]] = meeting
+        return meeting
+
+    def get_lag(self) -> dict:
+        """
+        Reports how far the replica is behind the leader.
+
+        :return: A dictionary with the last applied sequence number ("seq"), the delay in
+                 seconds between the leader writing and the replica applying the last record
+                 ("seconds"), and the number of bytes written but not yet read ("pending_bytes").
+        """
+        pending = os.path.getsize(self.path) - self.offset if os.path.exists(self.path) else 0
+        seconds = 0.0
+        if self.last_record_time is not None:
+            seconds = self.last_applied_time - self.last_record_time
+            if pending:
+                seconds = time.time() - self.last_record_time
+        return {"seq": self.applied_seq, "seconds": seconds, "pending_bytes": pending}
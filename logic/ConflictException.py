@@ -1,16 +1,90 @@
 class ConflictsException(Exception):
-    """ Custom exception class for handling conflicts """
+    """
+    Custom exception class for handling conflicts.
 
-    def __init__(self, message=None, cause=None, enable_suppression=False, writable_stack_trace=False):
+    The exception carries structured fields (the calendar owner, every conflicting
+    meeting and the kind of error) and only renders its message when it is printed.
+    """
+
+    # Kinds of conflict
+    INVALID_DAY = "invalid_day"
+    INVALID_MONTH = "invalid_month"
+    ILLEGAL_HOUR = "illegal_hour"
+    BAD_ORDER = "bad_order"
+    OVERLAP = "overlap"
+    NO_ROOM = "no_room"
+    FORK_CONFLICT = "fork_conflict"
+
+    _MESSAGES = {
+        INVALID_DAY: "Day does not exist.",
+        INVALID_MONTH: "Month does not exist.",
+        ILLEGAL_HOUR: "Illegal hour.",
+        BAD_ORDER: "Meeting starts before it ends.",
+        NO_ROOM: "No room is available for this meeting.",
+        FORK_CONFLICT: "Schedule changed since it was forked.",
+    }
+
+    def __init__(self, message=None, cause=None, enable_suppression=False, writable_stack_trace=False,
+                 kind: str = None, owner: str = None, owner_type: str = None, conflicts: list = None):
         """
         Constructor for ConflictsException.
 
-        :param message: Optional error message.
-        :param cause: Optional cause of the exception.
+        :param message: Optional error message. If omitted, it is rendered from the structured fields.
+        :param cause: Optional cause of the exception. Stored as the exception's __cause__.
         :param enable_suppression: Placeholder for a Java feature (not applicable in Python).
         :param writable_stack_trace: Placeholder for a Java feature (not applicable in Python).
+        :param kind: The kind of conflict (one of the class-level kind constants).
+        :param owner: The name or ID of the calendar owner the conflict occurred for.
+        :param owner_type: What the owner is, e.g. "attendee" or "room".
+        :param conflicts: The list of Meeting objects the rejected meeting overlaps with.
         """
         super().__init__(message)
+        self.message = message
         self.cause = cause
+        if cause is not None:
+            self.__cause__ = cause
         self.enable_suppression = enable_suppression
         self.writable_stack_trace = writable_stack_trace
+        self.kind = kind
+        self.owner = owner
+        self.owner_type = owner_type
+        self.conflicts = conflicts if conflicts is not None else []
+
+    def get_kind(self) -> str:
+        """ Retrieves the kind of conflict. """
+        return self.kind
+
+    def get_owner(self) -> str:
+        """ Retrieves the owner of the calendar the conflict occurred in. """
+        return self.owner
+
+    def get_conflicts(self) -> list:
+        """ Retrieves every meeting the rejected meeting conflicts with. """
+        return self.conflicts
+
+    def __str__(self) -> str:
+        """
+        Renders the error message from the structured fields.
+
+        :return: The error message.
+        """
+        if self.owner is not None:
+            detail = str(self.cause) if self.cause is not None else self._render()
+            return f"Conflict for {self.owner_type} {self.owner}:\n{detail}"
+        return self._render()
+
+    def _render(self) -> str:
+        """
+        Renders the message for this exception, ignoring the owner.
+
+        :return: The error message.
+        """
+        if self.message is not None:
+            return str(self.message)
+        if self.kind == self.OVERLAP:
+            return "\n".join(
+                f"Overlap with another item - {conflict.get_description()} "
+                f"- scheduled from {conflict.get_start_time()} and {conflict.get_end_time()}"
+                for conflict in self.conflicts
+            )
+        return self._MESSAGES.get(self.kind, "")
@@ -0,0 +1,79 @@
+from collections import Counter
+from hashlib import blake2b
+
+# The digest of a day without meetings, also used for days that were never touched
+EMPTY_DIGEST = blake2b(b"", digest_size=16).digest()
+
+
+def meeting_digest(meeting: 'Meeting') -> bytes:
+    """
+    Hashes the content of a meeting: its date, times, room, description and attendees.
+
+    Attendees are hashed by name and in sorted order, so the same meeting built by another
+    system, or listing its attendees in another order, has the same digest.
+
+    :param meeting: The Meeting object.
+    :return: A 16-byte digest.
+    """
+    room = meeting.get_room()
+    content = "\x1f".join((str(meeting.get_month()), str(meeting.get_day()), str(meeting.get_start_time()),
+                           str(meeting.get_end_time()), room.get_id() if room is not None else "",
+                           meeting.get_description() or "",
+                           "\x1e".join(sorted(person.get_name() for person in meeting.get_attendees()))))
+    return blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+
+def day_digest(meetings: list) -> bytes:
+    """
+    Hashes the meetings of a day regardless of their order.
+
+    :param meetings: The Meeting objects of the day.
+    :return: A 16-byte digest, EMPTY_DIGEST for no meetings.
+    """
+    if not meetings:
+        return EMPTY_DIGEST
+    return blake2b(b"".join(sorted(map(meeting_digest, meetings))), digest_size=16).digest()
+
+
+def tree_digest(children) -> bytes:
+    """
+    Hashes the digests of the days of a month or the months of a calendar.
+
+    :param children: (key, digest) pairs in key order. Pairs with EMPTY_DIGEST are skipped,
+                     so a calendar that never had a day does not differ from one whose day
+                     was emptied.
+    :return: A 16-byte digest.
+    """
+    digest = blake2b(digest_size=16)
+    for key, child in children:
+        if child != EMPTY_DIGEST:
+            digest.update(key.to_bytes(1, "big"))
+            digest.update(child)
+    return digest.digest()
+
+
+def meeting_changes(mine: list, theirs: list) -> tuple:
+    """
+    Finds the smallest set of meetings to add and remove to turn one day into another,
+    matching meetings by content.
+
+    :param mine: The meetings of the day to change.
+    :param theirs: The meetings of the day to match.
+    :return: An (added, removed) tuple: the meetings of theirs missing from mine, and the
+             meetings of mine missing from theirs.
+    """
+    wanted = Counter(map(meeting_digest, theirs))
+    removed = []
+    for meeting in mine:
+        digest = meeting_digest(meeting)
+        if wanted[digest]:
+            wanted[digest] -= 1
+        else:
+            removed.append(meeting)
+    added = []
+    for meeting in theirs:
+        digest = meeting_digest(meeting)
+        if wanted[digest]:
+            wanted[digest] -= 1
+            added.append(meeting)
+    return added, removed
@@ -0,0 +1,281 @@
+import random
+import time
+
+from logic.Meeting import Meeting
+from logic.ReferenceCalendar import ReferenceCalendar
+
+# Values drawn for generated operations: the valid range plus the boundaries on both sides,
+# so the existing quirks (month 12, day 31, start hour 23, Nov 30) are exercised too
+_MONTHS = list(range(0, 14))
+_DAYS = list(range(0, 33))
+_HOURS = list(range(-1, 25))
+
+# Relative frequency of each generated operation
+_WEIGHTS = {
+    "add": 8,
+    "remove": 2,
+    "clear": 1,
+    "is_busy": 4,
+    "is_busy_many": 1,
+    "agenda": 2,
+    "get_meeting": 2,
+    "free_busy": 1,
+}
+
+
+def generate_operations(rng: random.Random, length: int, hot_days: int = 4) -> list:
+    """
+    Generates a random sequence of calendar operations.
+
+    Most operations target a few "hot" days so that meetings overlap, conflict and get
+    removed; the rest are drawn from the whole range, invalid values included.
+
+    :param rng: The random number generator.
+    :param length: The number of operations.
+    :param hot_days: The number of days most operations target.
+    :return: A list of operation tuples, e.g. ("add", month, day, start, end, description).
+    """
+    hot = [(rng.randint(1, 11), rng.randint(1, 30)) for _ in range(hot_days)]
+    hot.append((11, 30))
+    names = list(_WEIGHTS)
+    weights = list(_WEIGHTS.values())
+
+    def date():
+        if rng.random() < 0.8:
+            return rng.choice(hot)
+        return rng.choice(_MONTHS), rng.choice(_DAYS)
+
+    def hours():
+        if rng.random() < 0.9:
+            start = rng.randint(0, 22)
+            return start, min(start + rng.randint(0, 3), 23)
+        return rng.choice(_HOURS), rng.choice(_HOURS)
+
+    operations = []
+    for index in range(length):
+        name = rng.choices(names, weights)[0]
+        month, day = date()
+        if name == "add":
+            operations.append((name, month, day) + hours() + (f"Meeting {index}",))
+        elif name in ("remove", "get_meeting"):
+            operations.append((name, month, day, rng.randint(-2, 3)))
+        elif name == "clear":
+            operations.append((name, month, day))
+        elif name == "is_busy":
+            operations.append((name, month, day) + hours())
+        elif name == "is_busy_many":
+            operations.append((name, tuple((month, day) + hours() for _ in range(rng.randint(1, 4)))))
+        elif name == "agenda":
+            operations.append((name, month, day if rng.random() < 0.7 else None))
+        else:
+            operations.append((name, (month, 1), (month, day)))
+    return operations
+
+
+def apply_operation(subject, operation: tuple):
+    """
+    Applies one operation to a Calendar, Person or Room and describes its outcome.
+
+    Exceptions are described by their type and, for a ConflictsException, its kind rather
+    than its message, which names the owner and so differs between a Person and a Calendar.
+
+    :param subject: The Calendar, Person or Room.
+    :param operation: An operation tuple from generate_operations().
+    :return: An ("ok", value) or ("error", type name, kind or message) tuple. Values are
+             plain data (strings, booleans, lists, dictionaries) so outcomes of different
+             engines compare with ==.
+    """
+    name, args = operation[0], operation[1:]
+    try:
+        if name == "add":
+            month, day, start, end, description = args
+            value = subject.add_meeting(Meeting(month, day, start, end, description=description))
+        elif name == "remove":
+            value = subject.remove_meeting(*args)
+        elif name == "clear":
+            value = getattr(subject, "calendar", subject).clear_schedule(*args)
+        elif name == "is_busy":
+            value = subject.is_busy(*args)
+        elif name == "is_busy_many":
+            value = list(subject.is_busy_many(args[0]))
+        elif name == "agenda":
+            value = subject.print_agenda(*args)
+        elif name == "get_meeting":
+            value = str(subject.get_meeting(*args))
+        elif name == "free_busy":
+            value = dict(subject.free_busy(*args).masks)
+        else:
+            raise ValueError("Unknown operation: " + name)
+    except Exception as e:
+        kind = getattr(e, "kind", None)
+        return "error", type(e).__name__, kind if kind is not None else str(e)
+    return "ok", value
+
+
+def run_operations(factory, operations: list) -> list:
+    """
+    Replays a sequence of operations against a new engine.
+
+    :param factory: A function without arguments returning a new Calendar, Person or Room.
+    :param operations: The operation tuples.
+    :return: The list of outcomes, one per operation, as returned by apply_operation().
+    """
+    subject = factory()
+    return [apply_operation(subject, operation) for operation in operations]
+
+
+def first_difference(expected: list, actual: list):
+    """
+    Finds the first operation whose outcomes differ.
+
+    :param expected: The outcomes of the reference engine.
+    :param actual: The outcomes of the engine under test.
+    :return: The index of the first differing outcome, or None if all match.
+    """
+    for index, (left, right) in enumerate(zip(expected, actual)):
+        if left != right:
+            return index
+    return None if len(expected) == len(actual) else min(len(expected), len(actual))
+
+
+def shrink(operations: list, fails) -> list:
+    """
+    Reduces a failing operation sequence to a minimal one that still fails.
+
+    Chunks of operations are removed while the sequence keeps failing, halving the chunk
+    size down to single operations (delta debugging). The result is 1-minimal: removing any
+    single operation makes it pass.
+
+    :param operations: The failing operation tuples.
+    :param fails: A function called with a list of operations, returning True if it fails.
+    :return: The reduced list of operations.
+    """
+    chunk = max(len(operations) // 2, 1)
+    while True:
+        start, removed = 0, False
+        while start < len(operations):
+            candidate = operations[:start] + operations[start + chunk:]
+            if candidate and fails(candidate):
+                operations, removed = candidate, True
+            else:
+                start += chunk
+        if chunk == 1 and not removed:
+            return operations
+        if not removed:
+            chunk = max(chunk // 2, 1)
+
+
+class Mismatch:
+    """
+    A minimal operation sequence on which an engine disagrees with the reference engine.
+    """
+
+    def __init__(self, engine: str, seed: int, operations: list, expected, actual):
+        """
+        Constructor for the Mismatch class.
+
+        :param engine: The name of the engine under test.
+        :param seed: The seed of the generated sequence it was shrunk from.
+        :param operations: The shrunk operation tuples; the last one shows the difference.
+        :param expected: The outcome of the last operation on the reference engine.
+        :param actual: The outcome of the last operation on the engine under test.
+        """
+        self.engine = engine
+        self.seed = seed
+        self.operations = operations
+        self.expected = expected
+        self.actual = actual
+
+    def __str__(self) -> str:
+        steps = "".join(f"\n  {operation}" for operation in self.operations)
+        return (f"{self.engine} differs from the reference (seed {self.seed}):{steps}"
+                f"\n  expected {self.expected}\n  actual   {self.actual}")
+
+
+class DifferentialHarness:
+    """
+    Runs the same random operation sequences against a reference engine and alternative
+    engines, and reports every disagreement and the relative speed of each engine.
+
+    Engines are functions without arguments returning a fresh Calendar, Person or Room (or
+    any object with their interface), e.g. Person or lambda: SqliteCalendar(SqliteStore(), "x").
+    Results, exceptions and agenda output are compared after every operation.
+    """
+
+    def __init__(self, engines: dict, reference=ReferenceCalendar):
+        """
+        Constructor for the DifferentialHarness class.
+
+        :param engines: A dictionary mapping a name to each engine under test.
+        :param reference: The engine whose behaviour is correct. Defaults to ReferenceCalendar,
+                          the frozen original Calendar, so Calendar itself can be tested too.
+        """
+        self.engines = engines
+        self.reference = reference
+        self.mismatches = []
+        self.timings = {name: 0.0 for name in engines}
+        self.reference_time = 0.0
+
+    def run(self, sequences: int = 100, length: int = 60, seed: int = 0) -> list:
+        """
+        Generates and replays operation sequences, shrinking each sequence an engine fails on.
+
+        :param sequences: The number of sequences to generate.
+        :param length: The number of operations per sequence.
+        :param seed: The seed of the first sequence; sequence i uses seed + i.
+        :return: The list of Mismatch objects found, also kept in self.mismatches.
+        """
+        found = []
+        for sequence_seed in range(seed, seed + sequences):
+            operations = generate_operations(random.Random(sequence_seed), length)
+            began = time.perf_counter()
+            expected = run_operations(self.reference, operations)
+            self.reference_time += time.perf_counter() - began
+
+            for name, engine in self.engines.items():
+                began = time.perf_counter()
+                actual = run_operations(engine, operations)
+                self.timings[name] += time.perf_counter() - began
+                if first_difference(expected, actual) is not None:
+                    found.append(self._minimize(name, engine, sequence_seed, operations))
+        self.mismatches += found
+        return found
+
+    def _minimize(self, name: str, engine, seed: int, operations: list) -> 'Mismatch':
+        """
+        Shrinks a failing sequence and records where the engines first differ on it.
+        """
+        def fails(candidate):
+            return first_difference(run_operations(self.reference, candidate),
+                                    run_operations(engine, candidate)) is not None
+
+        operations = shrink(operations, fails)
+        expected = run_operations(self.reference, operations)
+        actual = run_operations(engine, operations)
+        index = first_difference(expected, actual)
+        operations = operations[:index + 1]
+        return Mismatch(name, seed, operations,
+                        expected[index] if index < len(expected) else None,
+                        actual[index] if index < len(actual) else None)
+
+    def relative_speed(self) -> dict:
+        """
+        Compares the time each engine took to replay every sequence with the reference engine.
+
+        :return: A dictionary mapping each engine name to the reference time divided by its
+                 own time, so values above 1 mean faster than the reference.
+        """
+        return {name: self.reference_time / spent if spent else float("inf")
+                for name, spent in self.timings.items()}
+
+    def report(self) -> str:
+        """
+        Summarizes the mismatches found and the relative speed of each engine.
+
+        :return: The summary as a string.
+        """
+        lines = [f"{name}: {speed:.2f}x the reference speed, "
+                 f"{sum(1 for mismatch in self.mismatches if mismatch.engine == name)} mismatches"
+                 for name, speed in self.relative_speed().items()]
+        lines += [str(mismatch) for mismatch in self.mismatches]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,91 @@
+import csv
+import json
+from itertools import islice
+
+from logic.Person import Person
+from logic.Room import Room
+
+# The number of JSON Lines decoded at once
+_JSONL_BLOCK = 8192
+
+
+def read_records(path: str):
+    """
+    Streams the records of a directory file, one dictionary per employee or room.
+
+    Files ending in ".csv" are read as CSV with a header row. Every other file is read as
+    JSON Lines, one object per line; blank lines are skipped.
+
+    :param path: The file to read.
+    :return: A generator of dictionaries.
+    """
+    with open(path, newline="", encoding="utf-8") as source:
+        if path.lower().endswith(".csv"):
+            # Plain csv.reader with a zip is several times faster than csv.DictReader
+            rows = csv.reader(source)
+            header = next(rows, None)
+            if header is not None:
+                for row in rows:
+                    if row:
+                        yield dict(zip(header, row))
+        else:
+            # Decoding a block of lines as one JSON array is much faster than line by line
+            while True:
+                lines = list(islice(source, _JSONL_BLOCK))
+                if not lines:
+                    break
+                block = [line for line in lines if line.strip()]
+                if block:
+                    yield from json.loads("[" + ",".join(block) + "]")
+
+
+def employee_key(record: dict) -> str:
+    """
+    Retrieves the stable key of an employee record: its "key" field, or its name if there is none.
+
+    :param record: The employee record.
+    :return: The key as a string.
+    """
+    key = record.get("key")
+    return str(key) if key not in (None, "") else record["name"]
+
+
+def person_from_record(record: dict) -> 'Person':
+    """
+    Builds an employee from a directory record with a "name" field.
+
+    :param record: The employee record.
+    :return: The Person object.
+    :raises KeyError: If the record has no name.
+    """
+    return Person(record["name"])
+
+
+def room_attributes(record: dict) -> tuple:
+    """
+    Parses the capacity, features and concurrent bookings of a room record.
+
+    The "capacity" and "max_bookings" fields are optional. The "features" field is a list in
+    JSON Lines and a string separated by semicolons in CSV.
+
+    :param record: The room record.
+    :return: A (capacity, frozenset of features, max_bookings) tuple.
+    """
+    capacity = int(record.get("capacity") or 0)
+    features = record.get("features") or ()
+    if isinstance(features, str):
+        features = [feature.strip() for feature in features.split(";") if feature.strip()]
+    return capacity, frozenset(features), int(record.get("max_bookings") or 1)
+
+
+def room_from_record(record: dict) -> 'Room':
+    """
+    Builds a room from a directory record with an "id" field. An optional "max_bookings"
+    field makes it a shared space holding that many meetings at once.
+
+    :param record: The room record.
+    :return: The Room object.
+    :raises KeyError: If the record has no ID.
+    """
+    capacity, features, max_bookings = room_attributes(record)
+    return Room(record["id"], capacity, features, max_bookings)
@@ -0,0 +1,176 @@
+import struct
+
+# Every hour of a day (0-23) as a bitmask
+FULL_DAY = (1 << 24) - 1
+
+# One packed day: month, day and a 24-bit busy mask
+_DAY_RECORD = struct.Struct(">BBI")
+
+
+def hours_mask(start: int, end: int) -> int:
+    """
+    Builds the bitmask of the hours from start to end, inclusive.
+
+    :param start: The first hour (0-23).
+    :param end: The last hour (0-23).
+    :return: A bitmask with bits start through end set.
+    """
+    return (1 << (end + 1)) - (1 << start)
+
+
+def slot_is_free(busy: int, start: int, end: int) -> bool:
+    """
+    Checks a slot against a busy mask with the same overlap rule as Calendar.add_meeting.
+
+    :param busy: The busy bitmask of a day.
+    :param start: The start time of the slot (0-23).
+    :param end: The end time of the slot (0-23).
+    :return: True if neither the start hour nor the end hour is busy.
+    """
+    return not (busy >> start & 1 or busy >> end & 1)
+
+
+def slot_is_clear(busy: int, start: int, end: int) -> bool:
+    """
+    Checks that every hour of a slot is free. Unlike slot_is_free, this also rejects a slot
+    that fully contains a meeting.
+
+    :param busy: The busy bitmask of a day.
+    :param start: The start time of the slot (0-23).
+    :param end: The end time of the slot (0-23).
+    :return: True if no hour from start to end (inclusive) is busy.
+    """
+    return not busy & hours_mask(start, end)
+
+
+class FreeBusy:
+    """
+    A compact free/busy view of a calendar: one 24-bit busy mask per day that has meetings.
+
+    Bit h of a day's mask is set when some meeting covers hour h (inclusive of its end hour).
+    """
+
+    def __init__(self, masks: dict = None):
+        """
+        Constructor for the FreeBusy class.
+
+        :param masks: A dictionary mapping (month, day) to a busy bitmask. Days without
+                      meetings may be left out.
+        """
+        self.masks = {key: mask for key, mask in (masks or {}).items() if mask}
+
+    def get_mask(self, month: int, day: int) -> int:
+        """
+        Retrieves the busy bitmask of a day.
+
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        :return: The busy bitmask, 0 if the day is free.
+        """
+        return self.masks.get((month, day), 0)
+
+    def is_free(self, month: int, day: int, start: int, end: int) -> bool:
+        """
+        Checks whether a slot is free, using the same overlap rule as Calendar.add_meeting.
+
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        :param start: The start time (0-23).
+        :param end: The end time (0-23).
+        :return: True if the slot is free, otherwise False.
+        """
+        return slot_is_free(self.masks.get((month, day), 0), start, end)
+
+    def intervals(self) -> list:
+        """
+        Run-length encodes the busy hours.
+
+        :return: A chronological list of (month, day, start, end) tuples, one per run of
+                 consecutive busy hours.
+        """
+        runs = []
+        for (month, day), mask in sorted(self.masks.items()):
+            hour = 0
+            while mask:
+                # Skip free hours, then measure the run of busy ones
+                skip = (mask & -mask).bit_length() - 1
+                mask >>= skip
+                hour += skip
+                length = (~mask & (mask + 1)).bit_length() - 1
+                runs.append((month, day, hour, hour + length - 1))
+                mask >>= length
+                hour += length
+        return runs
+
+    @staticmethod
+    def from_intervals(intervals) -> 'FreeBusy':
+        """
+        Rebuilds a free/busy view from run-length encoded busy hours.
+
+        :param intervals: An iterable of (month, day, start, end) tuples.
+        :return: The FreeBusy object.
+        """
+        masks = {}
+        for month, day, start, end in intervals:
+            masks[(month, day)] = masks.get((month, day), 0) | hours_mask(start, end)
+        return FreeBusy(masks)
+
+    def pack(self) -> bytes:
+        """
+        Serializes the busy masks into a compact byte string (6 bytes per busy day).
+
+        :return: The packed bytes.
+        """
+        return b"".join(_DAY_RECORD.pack(month, day, mask) for (month, day), mask in sorted(self.masks.items()))
+
+    @staticmethod
+    def unpack(data: bytes) -> 'FreeBusy':
+        """
+        Deserializes busy masks produced by pack().
+
+        :param data: The packed bytes.
+        :return: The FreeBusy object.
+        """
+        return FreeBusy({(month, day): mask for month, day, mask in _DAY_RECORD.iter_unpack(data)})
+
+    def __eq__(self, other) -> bool:
+        """ Two views are equal when they have the same busy hours. """
+        return isinstance(other, FreeBusy) and self.masks == other.masks
+
+
+def union_busy(views) -> FreeBusy:
+    """
+    Combines several free/busy views into the hours when at least one of them is busy.
+
+    :param views: An iterable of FreeBusy objects.
+    :return: A FreeBusy object with the combined busy hours.
+    """
+    masks = {}
+    for view in views:
+        for key, mask in view.masks.items():
+            masks[key] = masks.get(key, 0) | mask
+    return FreeBusy(masks)
+
+
+def common_free_slots(views, duration: int, days, earliest: int = 0, latest: int = 23) -> list:
+    """
+    Finds the slots in which every view is free, every hour of the slot included, so that a
+    slot around a short meeting is not offered.
+
+    :param views: An iterable of FreeBusy objects, e.g. one per attendee.
+    :param duration: The length of the slot in hours (end time minus start time).
+    :param days: An iterable of (month, day) tuples to search.
+    :param earliest: The earliest start time (0-23).
+    :param latest: The latest end time (0-23).
+    :return: A chronological list of (month, day, start, end) tuples.
+    """
+    busy = union_busy(views)
+    slots = []
+    for month, day in days:
+        mask = busy.get_mask(month, day)
+        if mask == FULL_DAY:
+            continue
+        for start in range(earliest, latest - duration + 1):
+            if slot_is_clear(mask, start, start + duration):
+                slots.append((month, day, start, start + duration))
+    return slots
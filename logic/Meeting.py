@@ -1,6 +1,27 @@
+from array import array
+from bisect import bisect_left
+
 from logic.Room import Room
 from logic.Person import Person
 
+# Shared by meetings whose attendees have no organization IDs
+_NO_IDS = ()
+
+
+def ids_from_mask(mask: int) -> list:
+    """
+    Lists the integer IDs whose bits are set in a bitset.
+
+    :param mask: The bitset.
+    :return: A sorted list of IDs.
+    """
+    ids = []
+    while mask:
+        low = mask & -mask
+        ids.append(low.bit_length() - 1)
+        mask ^= low
+    return ids
+
 
 class Meeting:
     """
@@ -28,6 +49,11 @@ class Meeting:
         self.room = room
         self.description = description
 
+        # Sorted organization IDs of the attendees (see Organization.add_employee)
+        ids = sorted(attendee.uid for attendee in self.attendees if attendee.uid is not None)
+        self.attendee_ids = array("I", ids) if ids else _NO_IDS
+        self._mask = None
+
     def add_attendee(self, attendee: 'Person') -> None:
         """
         Adds an attendee to the meeting.
@@ -35,14 +61,70 @@ class Meeting:
         :param attendee: The Person object to add to the meeting.
         """
         self.attendees.append(attendee)
+        if attendee.uid is not None:
+            if not self.attendee_ids:
+                self.attendee_ids = array("I")
+            self.attendee_ids.insert(bisect_left(self.attendee_ids, attendee.uid), attendee.uid)
+            self._mask = None
 
     def remove_attendee(self, attendee: 'Person') -> None:
         """
         Removes an attendee from the meeting.
 
         :param attendee: The Person object to remove from the meeting.
+        :raises ValueError: If the person is not attending.
+        """
+        if attendee.uid is not None:
+            index = bisect_left(self.attendee_ids, attendee.uid)
+            if index == len(self.attendee_ids) or self.attendee_ids[index] != attendee.uid:
+                raise ValueError("Person is not attending this meeting")
+            self.attendees.remove(attendee)
+            del self.attendee_ids[index]
+            self._mask = None
+        else:
+            self.attendees.remove(attendee)
+
+    def has_attendee(self, attendee: 'Person') -> bool:
+        """
+        Checks whether a person attends the meeting, by organization ID when the person has one.
+
+        :param attendee: The Person object to look for.
+        :return: True if the person attends, otherwise False.
+        """
+        if attendee.uid is None:
+            return attendee in self.attendees
+        index = bisect_left(self.attendee_ids, attendee.uid)
+        return index < len(self.attendee_ids) and self.attendee_ids[index] == attendee.uid
+
+    def get_attendee_ids(self) -> 'array':
+        """
+        Retrieves the sorted organization IDs of the attendees.
+
+        :return: A sorted sequence of integer IDs. It must not be modified directly.
+        """
+        return self.attendee_ids
+
+    def get_attendee_mask(self) -> int:
+        """
+        Retrieves the attendees as a bitset, where bit n is set when the person with ID n attends.
+
+        :return: The bitset as an integer.
+        """
+        if self._mask is None:
+            mask = 0
+            for uid in self.attendee_ids:
+                mask |= 1 << uid
+            self._mask = mask
+        return self._mask
+
+    def shared_attendee_ids(self, other: 'Meeting') -> list:
+        """
+        Finds the attendees two meetings have in common.
+
+        :param other: The other Meeting object.
+        :return: A sorted list of the organization IDs attending both meetings.
         """
-        self.attendees.remove(attendee)
+        return ids_from_mask(self.get_attendee_mask() & other.get_attendee_mask())
 
     def __str__(self) -> str:
         """
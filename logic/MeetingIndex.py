@@ -0,0 +1,205 @@
+import re
+from itertools import chain
+
+from logic.Calendar import Calendar
+
+_WORD = re.compile(r"\w+")
+_EMPTY = frozenset()
+
+
+def tokenize(text: str) -> set:
+    """
+    Splits a meeting description into lower-case search tokens.
+
+    :param text: The text to split. May be None.
+    :return: A set of tokens.
+    """
+    if not text:
+        return set()
+    return set(_WORD.findall(text.lower()))
+
+
+def _chronological(meeting: 'Meeting') -> tuple:
+    return meeting.get_month(), meeting.get_day(), meeting.get_start_time(), meeting.get_end_time()
+
+
+class MeetingIndex:
+    """
+    An inverted index over the meetings booked in an organization's calendars.
+
+    Meetings are indexed by the tokens of their description, by every employee or room whose
+    calendar holds them and by day. The index subscribes to the organization's change
+    observers and re-indexes only the calendar day that changed, and the organization tells
+    it when employees or rooms are added or removed. Employees and rooms are keyed by their
+    directory entry; in a fork, their calendars are read from the fork's copies. Descriptions
+    edited in place after booking are not detected.
+    """
+
+    def __init__(self, organization: 'Organization'):
+        """
+        Constructor for the MeetingIndex class. Indexes every calendar of the organization
+        and starts following their changes.
+
+        :param organization: The Organization to index.
+        """
+        self.organization = organization
+        self._by_token = {}
+        self._by_owner = {}
+        self._by_day = {}
+        # The meetings indexed for each (owner, month, day) and, per meeting, its tokens and
+        # the number of calendar days that hold it
+        self._held = {}
+        self._refs = {}
+
+        for entity in chain(organization.employees, organization.rooms):
+            self._add_entity(entity)
+        organization.subscribe(self._on_change)
+
+    def close(self) -> None:
+        """
+        Stops following the organization's changes.
+        """
+        self.organization.unsubscribe(self._on_change)
+
+    def _on_change(self, entity, op: str, month: int, day: int, detail=None) -> None:
+        """
+        Re-indexes one changed calendar day. Matches the Organization.subscribe callback signature.
+        """
+        self._sync(self.organization._directory_entity(entity), month, day)
+
+    def _add_entity(self, entity) -> None:
+        """
+        Indexes every day with meetings in the calendar of an employee or room.
+
+        :param entity: The Person or Room of the directory.
+        """
+        calendar = self.organization._current(entity).view_calendar()
+        if calendar is Calendar.empty():
+            return
+        for month, days in calendar.occupied.items():
+            for day, meetings in days.items():
+                if meetings:
+                    self._sync(entity, month, day)
+
+    def directory_changed(self, added=(), removed=()) -> None:
+        """
+        Indexes the calendars of added employees and rooms and drops those of removed ones.
+
+        :param added: The Person or Room objects added to the directory.
+        :param removed: The Person or Room objects removed from the directory.
+        """
+        for entity in removed:
+            for meeting in list(self._by_owner.pop(entity, ())):
+                self._update(entity, meeting.get_month(), meeting.get_day(), _EMPTY)
+        for entity in added:
+            self._add_entity(entity)
+
+    def _sync(self, entity, month: int, day: int) -> None:
+        """
+        Brings the index up to date with one day of an employee's or room's calendar.
+
+        :param entity: The Person or Room of the directory whose calendar changed.
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        """
+        calendar = self.organization._current(entity).view_calendar()
+        self._update(entity, month, day, frozenset(
+            meeting for meeting in calendar.get_meetings(month, day)
+            if meeting.get_description() != "Day does not exist"))
+
+    def _update(self, entity, month: int, day: int, new: frozenset) -> None:
+        """
+        Replaces the meetings indexed for one day of an employee's or room's calendar.
+
+        :param entity: The Person or Room of the directory.
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        :param new: The meetings the day now holds.
+        """
+        key = (entity, month, day)
+        old = self._held.pop(key, _EMPTY)
+        if new:
+            self._held[key] = new
+
+        for meeting in old - new:
+            self._by_owner.get(entity, set()).discard(meeting)
+            tokens, refs = self._refs[meeting]
+            if refs > 1:
+                self._refs[meeting] = (tokens, refs - 1)
+                continue
+            del self._refs[meeting]
+            for token in tokens:
+                self._by_token[token].discard(meeting)
+            self._by_day[(meeting.get_month(), meeting.get_day())].discard(meeting)
+
+        for meeting in new - old:
+            self._by_owner.setdefault(entity, set()).add(meeting)
+            entry = self._refs.get(meeting)
+            if entry is not None:
+                self._refs[meeting] = (entry[0], entry[1] + 1)
+                continue
+            tokens = tokenize(meeting.get_description())
+            self._refs[meeting] = (tokens, 1)
+            for token in tokens:
+                self._by_token.setdefault(token, set()).add(meeting)
+            self._by_day.setdefault((meeting.get_month(), meeting.get_day()), set()).add(meeting)
+
+    def __len__(self) -> int:
+        """ The number of distinct meetings indexed. """
+        return len(self._refs)
+
+    def query(self, text: str = None, attendees=(), rooms=(), first_day: tuple = None,
+              last_day: tuple = None):
+        """
+        Finds the meetings that match every given predicate.
+
+        The candidate sets of the predicates are intersected smallest first: the smallest one is
+        walked and every other one is only probed for membership.
+
+        :param text: Words that must all appear in the description (case-insensitive), or None.
+        :param attendees: Person objects that must all have the meeting in their calendar.
+        :param rooms: Room objects; the meeting must be in the calendar of at least one of them.
+        :param first_day: The first (month, day) of the meeting date, inclusive, or None.
+        :param last_day: The last (month, day) of the meeting date, inclusive, or None.
+        :return: A lazy iterator of Meeting objects in chronological order.
+        """
+        candidates = [self._by_token.get(token, _EMPTY) for token in tokenize(text)]
+        candidates += [self._by_owner.get(person, _EMPTY) for person in attendees]
+        if rooms:
+            room_sets = [self._by_owner.get(room, _EMPTY) for room in rooms]
+            candidates.append(room_sets[0] if len(room_sets) == 1 else frozenset().union(*room_sets))
+
+        days = None
+        if first_day is not None or last_day is not None:
+            low, high = first_day or (0, 0), last_day or (13, 0)
+            days = sorted(key for key in self._by_day if low <= key <= high)
+
+        return self._scan(candidates, days)
+
+    def _scan(self, candidates: list, days):
+        """
+        Walks the most selective predicate and yields the meetings that satisfy the others.
+
+        :param candidates: The candidate sets of the non-date predicates.
+        :param days: The sorted (month, day) keys in the date range, or None for no date predicate.
+        :return: A generator of Meeting objects in chronological order.
+        """
+        candidates.sort(key=len)
+        day_count = None if days is None else sum(len(self._by_day[key]) for key in days)
+
+        if not candidates or (day_count is not None and day_count < len(candidates[0])):
+            if days is None:
+                days = sorted(self._by_day)
+            for key in days:
+                for meeting in sorted(self._by_day[key], key=_chronological):
+                    if all(meeting in others for others in candidates):
+                        yield meeting
+            return
+
+        walked, others = candidates[0], candidates[1:]
+        days = None if days is None else set(days)
+        for meeting in sorted(walked, key=_chronological):
+            if days is not None and (meeting.get_month(), meeting.get_day()) not in days:
+                continue
+            if all(meeting in other for other in others):
+                yield meeting
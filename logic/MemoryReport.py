@@ -0,0 +1,238 @@
+import sys
+
+from logic.Calendar import Calendar
+from logic.Meeting import Meeting
+from logic.Person import Person
+from logic.Room import Room
+
+# The components memory is broken down into
+COMPONENTS = ("day_containers", "meetings", "attendee_lists", "strings", "calendars", "directory",
+              "indexes", "caches")
+
+# What each byte scales with when projecting to another organization size
+DRIVERS = ("employee", "room", "meeting", "fixed")
+
+_CONTAINERS = (dict, list, tuple, set, frozenset)
+
+
+class MemoryReport:
+    """
+    A deep breakdown of the memory used by an organization, a calendar, an employee or a room.
+
+    Sizes come from sys.getsizeof, walked through every reachable object of the calendar
+    model. Each object is counted once, so a meeting shared by many calendars and the
+    placeholders shared by every calendar are not double counted. Every byte is also
+    attributed to what it grows with (employees, rooms, meetings or nothing) to project
+    the usage of a larger organization. Meetings kept in a SqliteStore are on disk and only
+    the days in its hot-day cache are counted. For a fork, the copies of the employees and
+    rooms it changed are counted with their calendars.
+    """
+
+    def __init__(self):
+        """
+        Constructor for the MemoryReport class. Use MemoryReport.of() to measure an object.
+        """
+        self.components = dict.fromkeys(COMPONENTS, 0)
+        self.drivers = dict.fromkeys(DRIVERS, 0)
+        self.counts = {"employees": 0, "rooms": 0, "calendars": 0, "meetings": 0}
+        self._seen = set()
+
+    @staticmethod
+    def of(target) -> 'MemoryReport':
+        """
+        Measures an Organization, Calendar, Person or Room.
+
+        :param target: The object to measure.
+        :return: The MemoryReport.
+        """
+        from logic.Organization import Organization
+
+        report = MemoryReport()
+        if isinstance(target, Organization):
+            report._organization(target)
+        elif isinstance(target, Person):
+            report._person(target)
+        elif isinstance(target, Room):
+            report._room(target)
+        elif isinstance(target, Calendar):
+            report._calendar(target, "fixed")
+        else:
+            raise TypeError("Can only measure an Organization, Calendar, Person or Room")
+        return report
+
+    def total(self) -> int:
+        """
+        Retrieves the total number of bytes measured.
+
+        :return: The sum of every component.
+        """
+        return sum(self.components.values())
+
+    def _add(self, obj, component: str, driver: str) -> bool:
+        """
+        Counts an object's own size once.
+
+        :return: True if the object had not been counted yet.
+        """
+        if id(obj) in self._seen:
+            return False
+        self._seen.add(id(obj))
+        size = sys.getsizeof(obj)
+        self.components[component] += size
+        self.drivers[driver] += size
+        return True
+
+    def _deep(self, obj, component: str, driver: str) -> None:
+        """
+        Counts an object and, for containers and plain objects, everything they hold. The
+        calendar model's own classes are never entered, so they keep their own components.
+        """
+        stack = [obj]
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, (Person, Room, Meeting, Calendar)) or not self._add(obj, component, driver):
+                continue
+            if isinstance(obj, dict):
+                stack.extend(obj.keys())
+                stack.extend(obj.values())
+            elif isinstance(obj, _CONTAINERS):
+                stack.extend(obj)
+            elif hasattr(obj, "__dict__") and not callable(obj) and not isinstance(obj, type):
+                stack.append(vars(obj))
+
+    def _object(self, obj, component: str, driver: str) -> bool:
+        """
+        Counts an instance and its attribute dictionary.
+
+        :return: True if the object had not been counted yet.
+        """
+        if not self._add(obj, component, driver):
+            return False
+        self._add(vars(obj), component, driver)
+        return True
+
+    def _organization(self, organization: 'Organization') -> None:
+        self._object(organization, "indexes", "fixed")
+        for person in organization.employees:
+            self._person(person)
+        for room in organization.rooms:
+            self._room(room)
+        for name in ("employees", "_people_by_uid", "_people_by_name", "_people_by_key"):
+            self._deep(getattr(organization, name), "indexes", "employee")
+        for name in ("rooms", "_rooms_by_building", "_rooms_by_band", "_rooms_by_feature", "_rooms_by_floor",
+                     "_rooms_by_id"):
+            self._deep(getattr(organization, name), "indexes", "room")
+        for entity in organization._forks.values():
+            self._fork_copy(entity)
+        for name in ("_meeting_index", "availability", "_watchers", "_forks", "_origins"):
+            value = getattr(organization, name)
+            if value is not None:
+                self._deep(value, "caches", "fixed")
+
+    def _person(self, person: 'Person') -> None:
+        if self._object(person, "directory", "employee"):
+            self.counts["employees"] += 1
+            self._add(person.name, "strings", "employee")
+            if person.key is not None:
+                self._add(person.key, "strings", "employee")
+            if person._calendar is not None:
+                self._calendar(person._calendar, "employee")
+
+    def _room(self, room: 'Room') -> None:
+        if self._object(room, "directory", "room"):
+            self.counts["rooms"] += 1
+            self._add(room.id, "strings", "room")
+            self._add(room.building, "strings", "room")
+            self._deep(room.features, "directory", "room")
+            if room._calendar is not None:
+                self._calendar(room._calendar, "room")
+
+    def _fork_copy(self, entity) -> None:
+        # A fork's copy of an employee or room stands for the same directory entry, so it is
+        # not counted again, but its calendar holds the fork's changes
+        driver = "employee" if isinstance(entity, Person) else "room"
+        if self._object(entity, "directory", driver) and entity._calendar is not None:
+            self._calendar(entity._calendar, driver)
+
+    def _calendar(self, calendar: 'Calendar', driver: str) -> None:
+        if not self._object(calendar, "calendars", driver):
+            return
+        self.counts["calendars"] += 1
+        for name in ("day_versions", "month_versions", "_owned_months", "_owned_days", "_edited_days", "base_versions",
+                     "observers", "_day_index", "_sorted_days"):
+            value = getattr(calendar, name, None)
+            if value is not None:
+                self._deep(value, "calendars", driver)
+        # Content digests and, for shared rooms, the per-hour booking levels
+        for name in ("_content_hashes", "_levels"):
+            value = getattr(calendar, name, None)
+            if value is not None:
+                self._deep(value, "caches", driver)
+
+        occupied = calendar.occupied
+        if isinstance(occupied, dict):
+            self._add(occupied, "day_containers", driver)
+            for days in occupied.values():
+                self._add(days, "day_containers", driver)
+                for meetings in days.values():
+                    self._add(meetings, "day_containers", driver)
+                    for meeting in meetings:
+                        self._meeting(meeting)
+        else:
+            store = getattr(calendar, "store", None)
+            if store is not None:
+                for (owner, month, day), meetings in store._days.items():
+                    if owner != calendar.owner:
+                        continue
+                    self._add(meetings, "day_containers", driver)
+                    for meeting in meetings:
+                        self._meeting(meeting)
+
+    def _meeting(self, meeting: 'Meeting') -> None:
+        # The placeholders are shared by every calendar and do not grow with anything
+        driver = "fixed" if meeting.get_description() == "Day does not exist" else "meeting"
+        if not self._object(meeting, "meetings", driver):
+            return
+        if driver == "meeting":
+            self.counts["meetings"] += 1
+        self._add(meeting.attendees, "attendee_lists", driver)
+        self._add(meeting.attendee_ids, "attendee_lists", driver)
+        self._add(meeting.description, "strings", driver)
+        if meeting._mask is not None:
+            self._add(meeting._mask, "caches", driver)
+
+    def project(self, employees: int = None, rooms: int = None, meetings: int = None) -> int:
+        """
+        Projects the memory use of an organization of another size, assuming each employee,
+        room and meeting costs what it costs on average in the measured one.
+
+        :param employees: The target number of employees, or None for the measured number.
+        :param rooms: The target number of rooms, or None for the measured number.
+        :param meetings: The target number of meetings, or None to keep the measured number
+                         of meetings per employee.
+        :return: The projected number of bytes.
+        """
+        employees = self.counts["employees"] if employees is None else employees
+        rooms = self.counts["rooms"] if rooms is None else rooms
+        if meetings is None:
+            per_employee = self.counts["meetings"] / self.counts["employees"] if self.counts["employees"] else 0
+            meetings = per_employee * employees
+
+        projected = self.drivers["fixed"]
+        for driver, target, count in (("employee", employees, self.counts["employees"]),
+                                      ("room", rooms, self.counts["rooms"]),
+                                      ("meeting", meetings, self.counts["meetings"])):
+            # Without any employee, room or meeting to average over, its bytes stay fixed
+            projected += self.drivers[driver] / count * target if count else self.drivers[driver]
+        return int(projected)
+
+    def __str__(self) -> str:
+        """
+        Formats the breakdown as a table in KiB.
+
+        :return: The breakdown as a string.
+        """
+        lines = [f"{component:<16}{size / 1024:>12.1f} KiB" for component, size in self.components.items()]
+        lines.append(f"{'total':<16}{self.total() / 1024:>12.1f} KiB")
+        lines.append(", ".join(f"{count} {name}" for name, count in self.counts.items()))
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,254 @@
+import asyncio
+import threading
+import time
+from collections import deque
+
+
+class ChangeEvent:
+    """
+    A coalesced notification that a day of a calendar changed during one flush window.
+    """
+
+    def __init__(self, owner, month: int, day: int):
+        """
+        Constructor for the ChangeEvent class.
+
+        :param owner: The Calendar, Person or Room whose calendar changed.
+        :param month: The month that changed (1-12).
+        :param day: The day that changed (1-31).
+        """
+        self.owner = owner
+        self.month = month
+        self.day = day
+        self.count = 1
+
+    def get_owner(self):
+        """ Retrieves the Calendar, Person or Room whose calendar changed. """
+        return self.owner
+
+    def get_month(self) -> int:
+        """ Retrieves the month that changed. """
+        return self.month
+
+    def get_day(self) -> int:
+        """ Retrieves the day that changed. """
+        return self.day
+
+    def get_count(self) -> int:
+        """ Retrieves how many changes were coalesced into this event. """
+        return self.count
+
+    def __repr__(self) -> str:
+        return f"ChangeEvent({self.month}/{self.day}, count={self.count})"
+
+
+class Subscription:
+    """
+    A subscription to calendar changes that coalesces them into one event per day per flush window.
+
+    Flushed events go to a bounded queue that drops the oldest event when full, so a slow
+    consumer never blocks booking. Events can be consumed with "async for", with poll(),
+    or pushed to a callback as a list per flush.
+
+    Windows are flushed by the running event loop if there is one, otherwise by a timer
+    thread, so the callback may be called from that thread. Exceptions raised by the callback
+    and a closed event loop never reach the calendar that changed; the callback's exceptions
+    are counted in errors and the last one is kept in last_error.
+    """
+
+    def __init__(self, first_day: tuple = None, last_day: tuple = None, callback=None,
+                 max_queue: int = 1024, flush_window: float = 0.1):
+        """
+        Constructor for the Subscription class. Use the watch() method of a Calendar, Person,
+        Room or Organization to create one.
+
+        :param first_day: The first (month, day) to report changes for, or None for no lower bound.
+        :param last_day: The last (month, day) to report changes for, or None for no upper bound.
+        :param callback: A function called with the list of events of each flush, or None.
+        :param max_queue: The maximum number of unconsumed events kept.
+        :param flush_window: The number of seconds changes are coalesced for before a flush.
+        """
+        self.first_day = first_day
+        self.last_day = last_day
+        self.callback = callback
+        self.flush_window = flush_window
+        self.queue = deque(maxlen=max_queue)
+        self.dropped = 0
+        self.errors = 0
+        self.last_error = None
+        self.closed = False
+        self._lock = threading.Lock()
+        self._timer = None
+        self._pending = {}
+        self._deadline = None
+        self._wakeup = None
+        self._loop = None
+        self._unsubscribe = None
+
+    def on_change(self, owner, month: int, day: int) -> None:
+        """
+        Records a change. Called by the watched calendars; not normally called directly.
+
+        :param owner: The Calendar, Person or Room whose calendar changed.
+        :param month: The month that changed (1-12).
+        :param day: The day that changed (1-31).
+        """
+        if self.first_day is not None and (month, day) < self.first_day:
+            return
+        if self.last_day is not None and (month, day) > self.last_day:
+            return
+
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            # Nothing flushed the expired window yet, so this change starts a new one
+            self.flush()
+        with self._lock:
+            if self._deadline is None:
+                self._deadline = time.monotonic() + self.flush_window
+                self._schedule_flush()
+
+            key = (owner, month, day)
+            event = self._pending.get(key)
+            if event is None:
+                self._pending[key] = ChangeEvent(owner, month, day)
+            else:
+                event.count += 1
+
+    def _schedule_flush(self) -> None:
+        """
+        Arranges for the current window to be flushed when it ends, on the running event loop
+        or, without one, on a timer thread.
+        """
+        try:
+            asyncio.get_running_loop().call_later(self.flush_window, self.flush)
+            return
+        except RuntimeError:
+            pass
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.flush_window, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self) -> list:
+        """
+        Ends the current flush window and delivers its coalesced events.
+
+        :return: The list of events delivered.
+        """
+        with self._lock:
+            events = list(self._pending.values())
+            self._pending = {}
+            self._deadline = None
+            if not events:
+                return events
+
+            overflow = len(self.queue) + len(events) - self.queue.maxlen
+            if overflow > 0:
+                self.dropped += overflow
+            self.queue.extend(events)
+
+        if self.callback is not None:
+            try:
+                self.callback(events)
+            except Exception as e:
+                self.errors += 1
+                self.last_error = e
+        self._wake()
+        return events
+
+    def poll(self) -> list:
+        """
+        Takes every queued event without waiting.
+
+        :return: A list of ChangeEvent objects, oldest first.
+        """
+        # Under the lock, so a timer flush cannot add events between the copy and the clear
+        with self._lock:
+            events = list(self.queue)
+            self.queue.clear()
+        return events
+
+    def close(self) -> None:
+        """
+        Stops watching and ends any "async for" loop once the queue is drained.
+        """
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self.flush()
+        self.closed = True
+        self._wake()
+
+    def _wake(self) -> None:
+        """
+        Wakes an "async for" loop waiting for events. If that loop has been closed, the
+        events stay queued for the next "async for" or poll().
+        """
+        if self._wakeup is None:
+            return
+        if self._loop.is_closed():
+            self._wakeup = None
+            self._loop = None
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # The loop was closed after the check above
+            self._wakeup = None
+            self._loop = None
+
+    def __aiter__(self) -> 'Subscription':
+        return self
+
+    async def __anext__(self) -> ChangeEvent:
+        """
+        Waits for the next event.
+
+        :return: The next ChangeEvent.
+        :raises StopAsyncIteration: When the subscription is closed and drained.
+        """
+        while not self.queue:
+            if self.closed:
+                raise StopAsyncIteration
+            if self._wakeup is None or self._loop is not asyncio.get_running_loop():
+                self._loop = asyncio.get_running_loop()
+                self._wakeup = asyncio.Event()
+            self._wakeup.clear()
+            await self._wakeup.wait()
+        return self.queue.popleft()
+
+
+def watch_calendar(calendar: 'Calendar', owner, subscription: Subscription) -> Subscription:
+    """
+    Connects a subscription to one calendar.
+
+    :param calendar: The Calendar to watch.
+    :param owner: The object reported as the owner of the events.
+    :param subscription: The Subscription to feed.
+    :return: The subscription.
+    """
+    def observer(changed, op, month, day, detail):
+        subscription.on_change(owner, month, day)
+
+    calendar.subscribe(observer)
+    subscription._unsubscribe = lambda: calendar.unsubscribe(observer)
+    return subscription
+
+
+def watch_organization(organization: 'Organization', subscription: Subscription) -> Subscription:
+    """
+    Connects a subscription to every employee and room calendar of an organization.
+
+    :param organization: The Organization to watch.
+    :param subscription: The Subscription to feed.
+    :return: The subscription.
+    """
+    def observer(entity, op, month, day, detail):
+        subscription.on_change(entity, month, day)
+
+    organization.subscribe(observer)
+    subscription._unsubscribe = lambda: organization.unsubscribe(observer)
+    return subscription
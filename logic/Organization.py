@@ -1,6 +1,18 @@
+from bisect import bisect_left, bisect_right, insort
+
+from logic.AvailabilityCache import AvailabilityCache
+from logic.Calendar import Calendar
+from logic.Directory import employee_key, person_from_record, read_records, room_attributes, room_from_record
+from logic.ConflictException import ConflictsException
+from logic.Meeting import ids_from_mask
+from logic.Notifications import Subscription, watch_organization
 from logic.Person import Person
 from logic.Room import Room
 
+# Upper bounds of the capacity bands used by the room index. Rooms larger than
+# the last bound fall into one extra band.
+CAPACITY_BANDS = (4, 8, 12, 20, 50, 100)
+
 
 class Organization:
     """
@@ -8,11 +20,16 @@ class Organization:
     It helps to offload initialization from the main interface.
     """
 
-    def __init__(self):
+    def __init__(self, employees: list = None, rooms: list = None, calendar_factory=None):
         """
         Default constructor - initializes a predefined set of employees and rooms.
+
+        :param employees: The Person objects of the directory, instead of the predefined ones.
+        :param rooms: The Room objects of the directory, instead of the predefined ones.
+        :param calendar_factory: A function building the calendar of an employee or room, e.g.
+                                 SqliteStore.calendar_for, or None for in-memory calendars.
         """
-        self.employees = [
+        self.employees = employees if employees is not None else [
             Person("Justin Gardener"),
             Person("Ashley Matthews"),
             Person("Mary Jane Cook"),
@@ -28,7 +45,7 @@ class Organization:
             Person("Ashley Martin")
         ]
 
-        self.rooms = [
+        self.rooms = rooms if rooms is not None else [
             Room("JO18.330"),
             Room("JO7.221"),
             Room("JO15.236"),
@@ -43,12 +60,73 @@ class Organization:
             Room("ML13.218")
         ]
 
+        self._rooms_by_building = {}
+        self._rooms_by_band = {}
+        self._rooms_by_feature = {}
+        self._rooms_by_floor = {}
+        self._rooms_by_id = {}
+        for room in self.rooms:
+            self._index_room(room)
+
+        # Employees by their dense integer ID (None once removed or not in this organization),
+        # by name and by the stable key of the directory file they were loaded from (the name
+        # if there is none)
+        self._people_by_uid = []
+        self._people_by_name = {}
+        self._people_by_key = {}
+        for employee in self.employees:
+            self._register_employee(employee)
+            self._people_by_name.setdefault(employee.get_name(), employee)
+            self._people_by_key.setdefault(employee.get_key(), employee)
+
+        # Set when this organization is a copy-on-write fork of another one
+        self.base = None
+        self._forks = {}
+        self._origins = {}
+        self._shared_directory = False
+
+        # Organization-wide change observers and the per-entity wrappers registered for them
+        self._watchers = {}
+
+        # Inverted index of booked meetings, built by the first query
+        self._meeting_index = None
+
+        # Memoized answers of find_free_rooms and find_free_employees, created by the first query
+        self.availability = None
+
+        # Builds the calendars of employees and rooms; None means in-memory calendars
+        self.calendar_factory = None
+        if calendar_factory is not None:
+            self.set_calendar_factory(calendar_factory)
+
+    def set_calendar_factory(self, calendar_factory) -> None:
+        """
+        Selects the storage backend of the calendars of every employee and room, including
+        those added later. Calendars that already exist are kept as they are.
+
+        :param calendar_factory: A function called with a Person or Room that returns its new
+                                 Calendar, e.g. SqliteStore.calendar_for, or None for in-memory
+                                 calendars.
+        :raises ValueError: If a room holds more than one meeting at a time; stored calendars
+                            do not support shared rooms.
+        """
+        if calendar_factory is not None:
+            for room in self.rooms:
+                self._check_storage(room, calendar_factory)
+        self.calendar_factory = calendar_factory
+        for entity in self.employees:
+            entity._calendar_factory = calendar_factory
+        for entity in self.rooms:
+            entity._calendar_factory = calendar_factory
+
     def get_employees(self) -> list:
         """
         Retrieves the list of employees.
 
         :return: A list of Person objects.
         """
+        if self.base is not None:
+            return [self._fork_entity(employee) for employee in self.employees]
         return self.employees
 
     def get_rooms(self) -> list:
@@ -57,8 +135,783 @@ class Organization:
 
         :return: A list of Room objects.
         """
+        if self.base is not None:
+            return [self._fork_entity(room) for room in self.rooms]
         return self.rooms
 
+    def subscribe(self, callback) -> None:
+        """
+        Registers a function to be called after every change to any employee's or room's calendar.
+
+        The callback is called as callback(entity, op, month, day, detail), where entity is the
+        Person or Room whose calendar changed and the other arguments are as in Calendar.subscribe.
+        Rooms added later are watched as well. In a fork, the entity is the fork's own copy once
+        the fork has one.
+
+        :param callback: The function to call.
+        """
+        self._watchers[callback] = {}
+        for entity in self.employees:
+            self._watch(entity, callback)
+        for entity in self.rooms:
+            self._watch(entity, callback)
+
+    def unsubscribe(self, callback) -> None:
+        """
+        Removes a function registered with subscribe().
+
+        :param callback: The function to remove.
+        :raises KeyError: If the function is not registered.
+        """
+        for watched, wrapper in self._watchers.pop(callback).values():
+            watched.unsubscribe(wrapper)
+
+    def watch(self, first_day: tuple = None, last_day: tuple = None, callback=None,
+              max_queue: int = 1024, flush_window: float = 0.1) -> 'Subscription':
+        """
+        Subscribes to changes of every employee's and room's calendar, coalesced into one event
+        per calendar and day per flush window.
+
+        :param first_day: The first (month, day) to report changes for, or None for no lower bound.
+        :param last_day: The last (month, day) to report changes for, or None for no upper bound.
+        :param callback: A function called with the list of events of each flush, or None.
+        :param max_queue: The maximum number of unconsumed events kept; the oldest are dropped.
+        :param flush_window: The number of seconds changes are coalesced for before a flush.
+        :return: The Subscription. Iterate it with "async for", poll() it, or close() it.
+        """
+        return watch_organization(self, Subscription(first_day, last_day, callback, max_queue, flush_window))
+
+    def _watch(self, entity, callback) -> None:
+        """
+        Subscribes an organization-wide callback to this organization's version of one
+        employee's or room's calendar.
+
+        :param entity: The Person or Room of the directory to watch.
+        :param callback: The organization-wide callback.
+        """
+        watched = self._current(entity)
+
+        def wrapper(calendar, op, month, day, detail):
+            callback(watched, op, month, day, detail)
+
+        watched.subscribe(wrapper)
+        self._watchers[callback][entity] = (watched, wrapper)
+
+    def fork(self) -> 'Organization':
+        """
+        Creates a copy-on-write fork of the organization for what-if planning.
+
+        The fork shares the directory and every calendar with this organization. An employee or
+        room is only copied (with a forked calendar) when the fork hands it out, and a calendar
+        day is only copied when it is modified, so forking takes constant time. Note that listing
+        every employee or room of a fork copies each of them.
+
+        :return: The forked Organization.
+        """
+        fork = Organization.__new__(Organization)
+        fork.__dict__.update(self.__dict__)
+        fork.base = self
+        fork._forks = {}
+        fork._origins = {}
+        fork._shared_directory = True
+        fork._watchers = {}
+        fork._meeting_index = None
+        fork.availability = None
+        return fork
+
+    def _current(self, entity):
+        """
+        Finds this organization's version of a directory entry.
+
+        :param entity: A Person or Room from the shared directory.
+        :return: The forked copy if this organization (or one it was forked from) has one, else the entity.
+        """
+        if self.base is None:
+            return entity
+        fork = self._forks.get(entity)
+        return fork if fork is not None else self.base._current(entity)
+
+    def _fork_entity(self, entity):
+        """
+        Retrieves the version of a directory entry that this organization may modify.
+
+        :param entity: A Person or Room from the shared directory.
+        :return: The entity itself, or its copy-on-write fork if this organization is a fork.
+        """
+        if self.base is None:
+            return entity
+        fork = self._forks.get(entity)
+        if fork is None:
+            # Copied from the parent's own copy, so a commit lands in the parent fork only
+            source = self.base._fork_entity(entity)
+            fork = self._forks[entity] = source.fork()
+            self._origins[fork] = source
+            # Callbacks watched the calendar this fork now replaces
+            for callback, wrappers in self._watchers.items():
+                if entity in wrappers:
+                    watched, wrapper = wrappers[entity]
+                    watched.unsubscribe(wrapper)
+                    self._watch(entity, callback)
+        return fork
+
+    def _directory_entity(self, entity):
+        """
+        Finds the directory entry that a fork's copy of an employee or room stands for.
+
+        :param entity: A Person or Room, either from the directory or a fork's copy.
+        :return: The Person or Room of the shared directory.
+        """
+        if self.base is None:
+            return entity
+        source = self._origins.get(entity)
+        return entity if source is None else self.base._directory_entity(source)
+
+    def _own_directory(self) -> None:
+        """
+        Copies the directory lists and room index of a fork before they are modified.
+        """
+        if self._shared_directory:
+            self.employees = list(self.employees)
+            self.rooms = list(self.rooms)
+            self._rooms_by_building = {key: set(rooms) for key, rooms in self._rooms_by_building.items()}
+            self._rooms_by_band = {key: set(rooms) for key, rooms in self._rooms_by_band.items()}
+            self._rooms_by_feature = {key: set(rooms) for key, rooms in self._rooms_by_feature.items()}
+            self._rooms_by_floor = {key: list(rooms) for key, rooms in self._rooms_by_floor.items()}
+            self._rooms_by_id = dict(self._rooms_by_id)
+            self._people_by_uid = list(self._people_by_uid)
+            self._people_by_name = dict(self._people_by_name)
+            self._people_by_key = dict(self._people_by_key)
+            self._shared_directory = False
+
+    def diff(self) -> list:
+        """
+        Lists the calendar changes made in a fork compared to the organization it was forked from.
+
+        :return: A list of (entity, month, day, added, removed) tuples, where entity is the Person
+                 or Room of the base organization and added/removed are lists of Meeting objects.
+        :raises ValueError: If this organization is not a fork.
+        """
+        if self.base is None:
+            raise ValueError("Organization is not a fork")
+        changes = []
+        for fork, source in self._origins.items():
+            for month, day, added, removed in fork.calendar.diff():
+                changes.append((source, month, day, added, removed))
+        return changes
+
+    def content_diff(self, other: 'Organization') -> list:
+        """
+        Compares every calendar with the calendar of the same employee (by name) or room (by ID)
+        in another organization, e.g. a copy loaded from another system. Calendars with equal
+        content digests are skipped without looking at their days, so after the first call
+        only the calendars changed since are inspected. Employees and rooms missing from either
+        side are ignored; see sync_directory().
+
+        :param other: The Organization to compare with.
+        :return: A list of (entity, month, day, added, removed) tuples, where entity is this
+                 organization's Person or Room, added are the meetings of other missing here and
+                 removed are the meetings here missing from other.
+        """
+        pairs = [(employee, other._people_by_name.get(employee.get_name())) for employee in self.employees]
+        pairs += [(room, other._rooms_by_id.get(room.get_id())) for room in self.rooms]
+        changes = []
+        for entity, theirs in pairs:
+            if theirs is None:
+                continue
+            mine = self._current(entity).view_calendar()
+            theirs = other._current(theirs).view_calendar()
+            if mine is theirs or mine.content_hash() == theirs.content_hash():
+                continue
+            for month, day, added, removed in mine.content_diff(theirs):
+                changes.append((self._current(entity), month, day, added, removed))
+        return changes
+
+    def commit(self) -> None:
+        """
+        Writes every change made in a fork back to the organization it was forked from.
+
+        Either all changes are committed or, if any modified day was also changed in the base
+        organization since the fork, none are. Committed meetings are updated to refer to the
+        base organization's employees and rooms.
+
+        :raises ConflictsException: If a modified day was also changed in the base organization.
+        :raises ValueError: If this organization is not a fork.
+        """
+        changes = self.diff()
+        for fork in self._origins:
+            fork.calendar.check_commit()
+        for fork in self._origins:
+            fork.calendar.commit()
+
+        for source, month, day, added, removed in changes:
+            for meeting in added:
+                meeting.attendees = [self._origins.get(person, person) for person in meeting.get_attendees()]
+                if meeting.get_room() is not None:
+                    meeting.set_room(self._origins.get(meeting.get_room(), meeting.get_room()))
+
+    @staticmethod
+    def load(employees_path: str, rooms_path: str = None, calendar_factory=None) -> 'Organization':
+        """
+        Builds an organization from directory files instead of the predefined employees and rooms.
+
+        Files ending in ".csv" are read as CSV with a header row, others as JSON Lines. Employee
+        records need a "name" and may have a stable "key" (e.g. an employee number) used to
+        detect renames in sync_directory(). Room records need an "id" and may have a "capacity"
+        and "features" (a list, or a string separated by semicolons in CSV).
+
+        :param employees_path: The employee directory file.
+        :param rooms_path: The room directory file, or None for no rooms.
+        :param calendar_factory: A function building the calendar of an employee or room, or
+                                 None for in-memory calendars.
+        :return: The Organization object.
+        """
+        people = []
+        for record in read_records(employees_path):
+            person = person_from_record(record)
+            person.key = employee_key(record)
+            people.append(person)
+        rooms = [room_from_record(record) for record in read_records(rooms_path)] if rooms_path else []
+        return Organization(people, rooms, calendar_factory)
+
+    def sync_directory(self, employees_path: str = None, rooms_path: str = None) -> dict:
+        """
+        Applies the differences between the directory files and this organization in place.
+
+        Employees are matched by their stable key, so a changed name is a rename and keeps the
+        calendar and integer ID. Rooms are matched by ID; a changed capacity, feature set or
+        number of concurrent bookings is an update. Removed employees keep their ID, which is never reused, but no longer resolve.
+        Employees and rooms that did not change are not touched.
+
+        :param employees_path: The employee directory file, or None to leave employees alone.
+        :param rooms_path: The room directory file, or None to leave rooms alone.
+        :return: A dictionary with the "added", "removed", "renamed" and "updated" Person and
+                 Room objects.
+        :raises ValueError: If this organization is a fork.
+        """
+        if self.base is not None:
+            raise ValueError("Cannot sync the directory of a fork")
+        summary = {"added": [], "removed": [], "renamed": [], "updated": []}
+
+        if employees_path is not None:
+            records = {employee_key(record): record for record in read_records(employees_path)}
+            for key, record in records.items():
+                person = self._people_by_key.get(key)
+                if person is None:
+                    person = person_from_record(record)
+                    self.add_employee(person, key)
+                    summary["added"].append(person)
+                elif person.get_name() != record["name"]:
+                    if self._people_by_name.get(person.get_name()) is person:
+                        del self._people_by_name[person.get_name()]
+                    person.name = record["name"]
+                    self._people_by_name.setdefault(person.name, person)
+                    self._refresh_meetings(person)
+                    self._directory_changed()
+                    summary["renamed"].append(person)
+            removed = [self._people_by_key.pop(key) for key in self._people_by_key.keys() - records.keys()]
+            for person in removed:
+                self._people_by_uid[person.get_uid()] = None
+                if self._people_by_name.get(person.get_name()) is person:
+                    del self._people_by_name[person.get_name()]
+            self._remove_entities(removed, "employees")
+            summary["removed"] += removed
+
+        if rooms_path is not None:
+            records = {record["id"]: record for record in read_records(rooms_path)}
+            for id, record in records.items():
+                room = self._rooms_by_id.get(id)
+                if room is None:
+                    room = room_from_record(record)
+                    self.add_room(room)
+                    summary["added"].append(room)
+                elif room_attributes(record) != (room.get_capacity(), room.get_features(), room.get_max_bookings()):
+                    self._unindex_room(room)
+                    room.capacity, room.features, max_bookings = room_attributes(record)
+                    room.set_max_bookings(max_bookings)
+                    self._index_room(room)
+                    self._directory_changed()
+                    summary["updated"].append(room)
+            removed = [self._rooms_by_id[id] for id in self._rooms_by_id.keys() - records.keys()]
+            for room in removed:
+                self._unindex_room(room)
+            self._remove_entities(removed, "rooms")
+            summary["removed"] += removed
+        return summary
+
+    @staticmethod
+    def _refresh_meetings(person: 'Person') -> None:
+        """
+        Bumps the versions of every calendar day holding a meeting the person attends, whose
+        agendas and content digests include the person's name.
+
+        :param person: The renamed Person.
+        """
+        refreshed = set()
+        for meeting in list(person.view_calendar().iter_meetings()):
+            participants = list(meeting.get_attendees())
+            if meeting.get_room() is not None:
+                participants.append(meeting.get_room())
+            for participant in participants:
+                calendar = participant.view_calendar()
+                key = (calendar.uid, meeting.get_month(), meeting.get_day())
+                if calendar is not Calendar.empty() and key not in refreshed:
+                    refreshed.add(key)
+                    calendar.refresh_day(meeting.get_month(), meeting.get_day())
+
+    def _remove_entities(self, removed: list, attribute: str) -> None:
+        """
+        Drops employees or rooms from a directory list in one pass and stops watching them.
+
+        :param removed: The Person or Room objects to drop.
+        :param attribute: The directory list, "employees" or "rooms".
+        """
+        if not removed:
+            return
+        gone = set(removed)
+        setattr(self, attribute, [entity for entity in getattr(self, attribute) if entity not in gone])
+        for wrappers in self._watchers.values():
+            for entity in removed:
+                if entity in wrappers:
+                    watched, wrapper = wrappers.pop(entity)
+                    watched.unsubscribe(wrapper)
+        self._directory_changed(removed=removed)
+
+    def _directory_changed(self, added=(), removed=()) -> None:
+        """
+        Tells the memoized availability answers and the meeting index that employees or rooms
+        were added, removed or updated.
+
+        :param added: The Person or Room objects added to the directory.
+        :param removed: The Person or Room objects removed from the directory.
+        """
+        if self.availability is not None:
+            self.availability.directory_changed(added, removed)
+        if self._meeting_index is not None:
+            self._meeting_index.directory_changed(added, removed)
+
+    def add_employee(self, person: 'Person', key: str = None) -> None:
+        """
+        Adds an employee to the organization and assigns them the next integer ID.
+
+        :param person: The Person object to add.
+        :param key: The stable key matching the employee in directory files. Defaults to the name.
+        :raises ValueError: If the person's ID from another organization is taken in this one.
+        """
+        self._own_directory()
+        self._register_employee(person)
+        if key is not None:
+            person.key = key
+        self.employees.append(person)
+        if self.calendar_factory is not None:
+            person._calendar_factory = self.calendar_factory
+        self._people_by_name.setdefault(person.get_name(), person)
+        self._people_by_key.setdefault(person.get_key(), person)
+        for callback in self._watchers:
+            self._watch(person, callback)
+        self._directory_changed(added=[person])
+
+    def _register_employee(self, person: 'Person') -> None:
+        """
+        Assigns an employee the next dense integer ID. A person who already has an ID from
+        another organization keeps it, so IDs never change once assigned.
+
+        :param person: The Person object to register.
+        :raises ValueError: If the person's ID belongs to another employee of this organization.
+        """
+        uid = person.get_uid()
+        if uid is None:
+            person._uid = len(self._people_by_uid)
+            self._people_by_uid.append(person)
+            return
+        if uid < len(self._people_by_uid) and self._people_by_uid[uid] not in (None, person):
+            raise ValueError(f"{person.get_name()} has ID {uid}, which another employee already has")
+        self._people_by_uid.extend([None] * (uid + 1 - len(self._people_by_uid)))
+        self._people_by_uid[uid] = person
+
+    def get_employee_by_uid(self, uid: int) -> 'Person':
+        """
+        Retrieves an employee by their integer ID.
+
+        :param uid: The ID assigned by add_employee.
+        :return: The Person object.
+        :raises IndexError: If no employee has that ID.
+        """
+        person = self._people_by_uid[uid]
+        if person is None:
+            raise IndexError("No employee has that ID")
+        return self._fork_entity(person)
+
+    def people_from_ids(self, ids) -> list:
+        """
+        Resolves integer IDs, e.g. Meeting.get_attendee_ids(), to employees.
+
+        :param ids: An iterable of IDs.
+        :return: A list of Person objects.
+        """
+        return [self.get_employee_by_uid(uid) for uid in ids]
+
+    def people_from_mask(self, mask: int) -> list:
+        """
+        Resolves an attendee bitset, e.g. Meeting.get_attendee_mask(), to employees.
+
+        :param mask: The bitset as an integer.
+        :return: A list of Person objects, ordered by ID.
+        """
+        return self.people_from_ids(ids_from_mask(mask))
+
+    def shared_meetings(self, first: 'Person', second: 'Person') -> list:
+        """
+        Finds the meetings two employees both attend.
+
+        :param first: One Person object.
+        :param second: The other Person object.
+        :return: A list of Meeting objects from the first person's calendar, in date order.
+        """
+        return [meeting for meeting in first.view_calendar().iter_meetings() if meeting.has_attendee(second)]
+
+    def add_room(self, room: 'Room') -> None:
+        """
+        Adds a room to the organization and to the room index.
+
+        :param room: The Room object to add.
+        :raises ValueError: If the room holds more than one meeting at a time and the
+                            organization has a calendar factory.
+        """
+        self._check_storage(room, self.calendar_factory)
+        self._own_directory()
+        self.rooms.append(room)
+        if self.calendar_factory is not None:
+            room._calendar_factory = self.calendar_factory
+        self._index_room(room)
+        for callback in self._watchers:
+            self._watch(room, callback)
+        self._directory_changed(added=[room])
+
+    @staticmethod
+    def _check_storage(room: 'Room', calendar_factory) -> None:
+        """
+        Verifies that a room's calendar can be built by a calendar factory.
+
+        :param room: The Room object.
+        :param calendar_factory: The calendar factory, or None for in-memory calendars.
+        :raises ValueError: If the room holds more than one meeting at a time and there is a
+                            calendar factory, which only builds single-booking calendars.
+        """
+        if calendar_factory is not None and room.get_max_bookings() > 1:
+            raise ValueError(f"Room {room.get_id()} is shared, which stored calendars do not support")
+
+    def _index_room(self, room: 'Room') -> None:
+        """
+        Registers a room in the building, capacity band and feature indexes.
+
+        :param room: The Room object to index.
+        """
+        self._rooms_by_id.setdefault(room.get_id(), room)
+        self._rooms_by_building.setdefault(room.get_building(), set()).add(room)
+        self._rooms_by_band.setdefault(bisect_left(CAPACITY_BANDS, room.get_capacity()), set()).add(room)
+        for feature in room.get_features():
+            self._rooms_by_feature.setdefault(feature, set()).add(room)
+        if room.get_floor() is not None:
+            # Sorted by (floor, number) so a floor range is a contiguous slice. The object ID
+            # keeps rooms with the same room ID apart without comparing Room objects.
+            insort(self._rooms_by_floor.setdefault(room.get_building(), []), self._floor_entry(room))
+
+    def _unindex_room(self, room: 'Room') -> None:
+        """
+        Removes a room from the ID, building, capacity band and feature indexes.
+
+        :param room: The Room object to remove.
+        """
+        if self._rooms_by_id.get(room.get_id()) is room:
+            del self._rooms_by_id[room.get_id()]
+        self._rooms_by_building.get(room.get_building(), set()).discard(room)
+        self._rooms_by_band.get(bisect_left(CAPACITY_BANDS, room.get_capacity()), set()).discard(room)
+        for feature in room.get_features():
+            self._rooms_by_feature.get(feature, set()).discard(room)
+        if room.get_floor() is not None:
+            floor = self._rooms_by_floor[room.get_building()]
+            del floor[bisect_left(floor, self._floor_entry(room))]
+
+    @staticmethod
+    def _floor_entry(room: 'Room') -> tuple:
+        """
+        Builds the floor index entry of a room.
+
+        :param room: The Room object, which must have a floor.
+        :return: A (floor, number, room ID, object ID, room) tuple, unique per room.
+        """
+        return room.get_floor(), room.get_number(), room.get_id(), id(room), room
+
+    def get_room_candidates(self, capacity: int = 0, features=(), building: str = None) -> list:
+        """
+        Uses the room index to collect the rooms that satisfy the static requirements.
+
+        :param capacity: The minimum number of seats.
+        :param features: An iterable of required feature names.
+        :param building: The building code the room must be in, or None for any building.
+        :return: The qualifying rooms, smallest fitting capacity first.
+        """
+        candidate_sets = []
+        if building is not None:
+            candidate_sets.append(self._rooms_by_building.get(building, set()))
+        for feature in features:
+            candidate_sets.append(self._rooms_by_feature.get(feature, set()))
+        if capacity > 0:
+            lowest_band = bisect_left(CAPACITY_BANDS, capacity)
+            banded = set()
+            for band, rooms in self._rooms_by_band.items():
+                if band >= lowest_band:
+                    banded.update(rooms)
+            candidate_sets.append(banded)
+
+        if not candidate_sets:
+            candidates = self.rooms
+        else:
+            # Intersect starting from the most selective index entry
+            candidate_sets.sort(key=len)
+            candidates = set(candidate_sets[0])
+            for rooms in candidate_sets[1:]:
+                candidates &= rooms
+                if not candidates:
+                    break
+
+        fitting = [self._fork_entity(room) for room in candidates if room.get_capacity() >= capacity]
+        fitting.sort(key=lambda room: (room.get_capacity(), room.get_id()))
+        return fitting
+
+    def find_free_rooms(self, month: int, day: int, start: int, end: int, capacity: int = 0,
+                        features=(), building: str = None) -> list:
+        """
+        Finds every free room that satisfies the given requirements. Answers are memoized
+        like those of find_free_employees.
+
+        :param month: The month of the meeting (1-12).
+        :param day: The day of the meeting (1-31).
+        :param start: The start time of the meeting (0-23).
+        :param end: The end time of the meeting (0-23).
+        :param capacity: The minimum number of seats. Defaults to 0 (any room).
+        :param features: An iterable of required feature names.
+        :param building: The building code the room must be in, or None for any building.
+        :return: A list of free Room objects, best fitting (smallest capacity) first.
+        :raises ConflictsException: If the date or time values are invalid.
+        """
+        Calendar.check_times(month, day, start, end)
+        return self._availability().free(self.get_room_candidates(capacity, features, building), month, day, start, end)
+
+    def find_free_employees(self, people: list, month: int, day: int, start: int, end: int) -> list:
+        """
+        Finds which of a group of employees are free in a time frame.
+
+        Answers are memoized, so a repeated query only re-checks the calendars whose day
+        changed since it was last asked.
+
+        :param people: The Person objects to check, e.g. a team.
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        :param start: The start time (0-23).
+        :param end: The end time (0-23).
+        :return: The free Person objects, in the given order.
+        :raises ConflictsException: If the date or time values are invalid.
+        """
+        Calendar.check_times(month, day, start, end)
+        return self._availability().free(people, month, day, start, end)
+
+    def _availability(self) -> 'AvailabilityCache':
+        """
+        Retrieves the availability cache, creating it on first use.
+
+        :return: The AvailabilityCache. Outside forks it counts changes per day through the
+                 organization's observers; a fork's cache validates every calendar instead.
+        """
+        if self.availability is None:
+            self.availability = AvailabilityCache()
+            if self.base is None:
+                self.availability.attach(self)
+        return self.availability
+
+    def find_free_rooms_in(self, building: str, month: int, day: int, start: int, end: int,
+                           floors: tuple = None, origin=None) -> list:
+        """
+        Finds the free rooms of a building, optionally limited to a range of floors.
+
+        Only the rooms of the requested building and floors are probed. Results are ranked by
+        their floor distance from an origin room, closest first.
+
+        :param building: The building code, e.g. "ML".
+        :param month: The month of the meeting (1-12).
+        :param day: The day of the meeting (1-31).
+        :param start: The start time of the meeting (0-23).
+        :param end: The end time of the meeting (0-23).
+        :param floors: An inclusive (lowest, highest) floor range, or None for every floor.
+        :param origin: A Room or room ID to rank by floor distance from, or None to rank by floor.
+                       An origin room without a floor also ranks by floor.
+        :return: A list of free Room objects.
+        :raises ConflictsException: If the date or time values are invalid.
+        :raises Exception: If the origin room does not exist.
+        """
+        Calendar.check_times(month, day, start, end)
+        entries = self._rooms_by_floor.get(building, [])
+        if floors is not None:
+            low = bisect_left(entries, (floors[0],))
+            high = bisect_right(entries, (floors[1] + 1,))
+            entries = entries[low:high]
+
+        if isinstance(origin, str):
+            origin = self.get_room(origin)
+        origin_floor = origin.get_floor() if origin is not None else None
+        if origin_floor is None:
+            origin_floor = 0
+
+        free = []
+        for floor, number, id, key, room in entries:
+            room = self._fork_entity(room)
+            if not room.is_busy(month, day, start, end):
+                free.append((abs(floor - origin_floor), floor, number, room))
+        free.sort(key=lambda entry: entry[:3])
+        return [entry[3] for entry in free]
+
+    def book_room(self, meeting: 'Meeting', capacity: int = 0, features=(), building: str = None) -> 'Room':
+        """
+        Books the best fitting free room for a meeting and assigns it to the meeting. If a room
+        refuses the meeting after all, the next best one is tried.
+
+        :param meeting: The Meeting object to book a room for.
+        :param capacity: The minimum number of seats. Defaults to 0 (any room).
+        :param features: An iterable of required feature names.
+        :param building: The building code the room must be in, or None for any building.
+        :return: The booked Room object.
+        :raises ConflictsException: If the times are invalid or no room is available.
+        """
+        rooms = self.find_free_rooms(meeting.get_month(), meeting.get_day(), meeting.get_start_time(),
+                                     meeting.get_end_time(), capacity, features, building)
+        for room in rooms:
+            try:
+                room.add_meeting(meeting)
+            except ConflictsException as e:
+                if e.get_kind() != ConflictsException.OVERLAP:
+                    raise
+                continue
+            meeting.set_room(room)
+            return room
+        raise ConflictsException(kind=ConflictsException.NO_ROOM)
+
+    def book_meeting(self, meeting: 'Meeting') -> dict:
+        """
+        Books a meeting for every attendee and its room in one pass, all or nothing.
+
+        The date and times are validated once. Every calendar is then checked without raising,
+        and the meeting is only added if none of them conflicts. This is the fast path for very
+        large meetings such as all-hands events. An attendee listed more than once is booked
+        once, and in a fork only the fork's calendars are written.
+
+        :param meeting: The Meeting object to book.
+        :return: A dictionary mapping each conflicting Person or Room to a ConflictsException with
+                 the conflict kind and meetings. Empty if the meeting was booked.
+        :raises ConflictsException: If the date or time values are invalid.
+        """
+        month, day = meeting.get_month(), meeting.get_day()
+        start, end = meeting.get_start_time(), meeting.get_end_time()
+        Calendar.check_times(month, day, start, end)
+
+        participants = dict.fromkeys(self._fork_entity(self._directory_entity(person))
+                                     for person in meeting.get_attendees())
+        if meeting.get_room() is not None:
+            participants[self._fork_entity(self._directory_entity(meeting.get_room()))] = None
+
+        summary = {}
+        for participant in participants:
+            try:
+                conflicts = participant.view_calendar().find_conflicts(month, day, start, end)
+            except ConflictsException as e:
+                summary[participant] = e
+                continue
+            if conflicts:
+                summary[participant] = ConflictsException(kind=ConflictsException.OVERLAP, conflicts=conflicts)
+
+        if not summary:
+            for participant in participants:
+                participant.calendar.add_checked_meeting(meeting)
+        return summary
+
+    def query(self, text: str = None, attendees=(), rooms=(), building: str = None,
+              first_day: tuple = None, last_day: tuple = None):
+        """
+        Searches the booked meetings, e.g. every meeting mentioning "budget" in March that
+        Helen West attends in any JO room.
+
+        The first call builds an inverted index of every calendar, which is then kept up to
+        date as meetings are booked and removed.
+
+        :param text: Words that must all appear in the description (case-insensitive), or None.
+        :param attendees: Person objects that must all have the meeting in their calendar.
+        :param rooms: Room objects; the meeting must be booked in one of them.
+        :param building: A building prefix such as "JO"; the meeting must be booked in one of
+                         its rooms (or in one of the given rooms).
+        :param first_day: The first (month, day) of the meeting date, inclusive, or None.
+        :param last_day: The last (month, day) of the meeting date, inclusive, or None.
+        :return: A lazy iterator of Meeting objects in chronological order.
+        """
+        if building is not None:
+            rooms = list(rooms) + list(self._rooms_by_building.get(building, ()))
+            if not rooms:
+                return iter(())
+        if self._meeting_index is None:
+            from logic.MeetingIndex import MeetingIndex
+            self._meeting_index = MeetingIndex(self)
+        attendees = [self._directory_entity(person) for person in attendees]
+        rooms = [self._directory_entity(room) for room in rooms]
+        return self._meeting_index.query(text, attendees, rooms, first_day, last_day)
+
+    def schedule_batch(self, requests: list, time_budget: float = 1.0, max_backtracks: int = 3) -> 'ScheduleResult':
+        """
+        Places a whole set of meeting requests into the existing calendars.
+
+        :param requests: A list of MeetingRequest objects.
+        :param time_budget: The maximum number of seconds to spend on the batch.
+        :param max_backtracks: How many earlier placements may be moved to fit one request.
+        :return: A ScheduleResult with the placements and the unplaceable requests.
+        """
+        from logic.Scheduler import Scheduler
+        return Scheduler(self, time_budget, max_backtracks).schedule(requests)
+
+    def utilization(self, year: int = None, first_day: tuple = (1, 1), last_day: tuple = (12, 31)) -> 'UtilizationReport':
+        """
+        Builds room occupancy rates and employee meeting-load statistics for a period.
+
+        :param year: The year used to find the weekday of each date. Defaults to the current year.
+        :param first_day: The first (month, day) of the period, inclusive.
+        :param last_day: The last (month, day) of the period, inclusive.
+        :return: A UtilizationReport object.
+        """
+        from logic.Analytics import UtilizationReport
+        return UtilizationReport(self, year, first_day, last_day)
+
+    def memory_report(self) -> 'MemoryReport':
+        """
+        Measures the memory used by the organization, broken down by component.
+
+        :return: A MemoryReport object; see MemoryReport.project() to size a larger organization.
+        """
+        from logic.MemoryReport import MemoryReport
+        return MemoryReport.of(self)
+
+    def write_agendas(self, month: int, path: str, archive: bool = False, workers: int = None,
+                      progress=None) -> dict:
+        """
+        Writes the agenda of every employee and room for a month, in parallel worker processes.
+
+        :param month: The month (1-12).
+        :param path: The output directory, or the zip file if archive is True.
+        :param archive: Whether to write one zip archive instead of one file per agenda.
+        :param workers: The number of worker processes. Defaults to the number of CPUs.
+        :param progress: A function called with (done, total) entity counts, or None.
+        :return: A dictionary with the number of "entities", the "bytes" written and the
+                 "elapsed" seconds.
+        """
+        from logic.AgendaReport import AgendaReport
+        report = AgendaReport(self, workers, progress=progress)
+        return report.write_archive(month, path) if archive else report.write_files(month, path)
+
     def get_room(self, id: str) -> 'Room':
         """
         Searches for and retrieves a room by its ID.
@@ -67,10 +920,10 @@ class Organization:
         :return: The requested Room object.
         :raises Exception: If the room does not exist.
         """
-        for room in self.rooms:
-            if room.get_id() == id:
-                return room
-        raise Exception("Requested room does not exist")
+        room = self._rooms_by_id.get(id)
+        if room is None:
+            raise Exception("Requested room does not exist")
+        return self._fork_entity(room)
 
     def get_employee(self, name: str) -> 'Person':
         """
@@ -80,7 +933,7 @@ class Organization:
         :return: The requested Person object.
         :raises Exception: If the person does not exist.
         """
-        for employee in self.employees:
-            if employee.get_name() == name:
-                return employee
-        raise Exception("Requested employee does not exist")
+        employee = self._people_by_name.get(name)
+        if employee is None:
+            raise Exception("Requested employee does not exist")
+        return self._fork_entity(employee)
@@ -1,5 +1,6 @@
 from logic.Calendar import Calendar
 from logic.ConflictException import ConflictsException
+from logic.Notifications import Subscription, watch_calendar
 
 
 class Person:
@@ -7,6 +8,10 @@ class Person:
     A class representing a person with an associated calendar to manage meetings.
     """
 
+    # A function building the calendar from the person, set by an Organization with another
+    # storage backend. None means an in-memory Calendar.
+    _calendar_factory = None
+
     def __init__(self, name: str = ""):
         """
         Constructor for Person class. Initializes the person with a name and an empty calendar.
@@ -14,7 +19,47 @@ class Person:
         :param name: The name of the person.
         """
         self.name = name
-        self.calendar = Calendar()
+        # The calendar is only created when it is first modified; see the calendar property
+        self._calendar = None
+        self._deferred_observers = None
+        # Dense integer ID assigned by the first Organization the person joins; see uid
+        self._uid = None
+        # Stable key matching the person in directory files, e.g. an employee number
+        self.key = None
+
+    @property
+    def calendar(self) -> 'Calendar':
+        """
+        The person's calendar, created on first access together with any observers
+        registered before it existed.
+        """
+        if self._calendar is None:
+            self._calendar = Calendar() if self._calendar_factory is None else self._calendar_factory(self)
+            for callback in self._deferred_observers or ():
+                self._calendar.subscribe(callback)
+            self._deferred_observers = None
+        return self._calendar
+
+    @calendar.setter
+    def calendar(self, calendar: 'Calendar') -> None:
+        self._calendar = calendar
+
+    @property
+    def uid(self) -> int:
+        """ The person's dense integer ID, or None before they join an organization. Read-only. """
+        return self._uid
+
+    def view_calendar(self) -> 'Calendar':
+        """
+        Retrieves the person's calendar for reading only, without creating it.
+
+        :return: The calendar, or the shared empty calendar if it has not been created yet.
+                 It must not be modified. Calendars made by a calendar factory, which may
+                 hold stored meetings, are always created.
+        """
+        if self._calendar is None:
+            return Calendar.empty() if self._calendar_factory is None else self.calendar
+        return self._calendar
 
     def get_name(self) -> str:
         """
@@ -24,6 +69,34 @@ class Person:
         """
         return self.name
 
+    def get_key(self) -> str:
+        """
+        Retrieves the stable key of the person, which survives renames.
+
+        :return: The key from the directory file, or the name if there is none.
+        """
+        return self.key if self.key is not None else self.name
+
+    def get_uid(self) -> int:
+        """
+        Retrieves the person's organization-wide integer ID.
+
+        :return: The ID, or None if the person does not belong to an organization.
+        """
+        return self._uid
+
+    def fork(self) -> 'Person':
+        """
+        Creates a copy of the person whose calendar is a copy-on-write fork of this one.
+
+        :return: The forked Person.
+        """
+        fork = Person.__new__(Person)
+        fork.__dict__.update(self.__dict__)
+        fork.calendar = self.calendar.fork()
+        fork._deferred_observers = None
+        return fork
+
     def add_meeting(self, meeting: 'Meeting') -> None:
         """
         Adds a meeting to the person's calendar.
@@ -34,7 +107,8 @@ class Person:
         try:
             self.calendar.add_meeting(meeting)
         except ConflictsException as e:
-            raise ConflictsException(f"Conflict for attendee {self.name}:\n{e}")
+            raise ConflictsException(cause=e, kind=e.kind, owner=self.name, owner_type="attendee",
+                                     conflicts=e.conflicts) from e
 
     def print_agenda(self, month: int, day: int = None) -> str:
         """
@@ -45,8 +119,8 @@ class Person:
         :return: A formatted string containing the agenda.
         """
         if day is None:
-            return self.calendar.print_agenda(month)
-        return self.calendar.print_agenda(month, day)
+            return self.view_calendar().print_agenda(month)
+        return self.view_calendar().print_agenda(month, day)
 
     def is_busy(self, month: int, day: int, start: int, end: int) -> bool:
         """
@@ -59,7 +133,70 @@ class Person:
         :return: True if the person is occupied during the specified time frame, otherwise False.
         :raises ConflictsException: If the input time values are invalid.
         """
-        return self.calendar.is_busy(month, day, start, end)
+        return self.view_calendar().is_busy(month, day, start, end)
+
+    def is_busy_many(self, probes, as_bits: bool = False):
+        """
+        Checks whether the person is busy in many time frames at once.
+
+        :param probes: A sequence of (month, day, start, end) tuples.
+        :param as_bits: If True, return an int whose bit i is set when probe i is busy.
+        :return: A list of booleans (True if busy) in probe order, or the bit array.
+        :raises ConflictsException: If any probe has invalid time values.
+        """
+        return self.view_calendar().is_busy_many(probes, as_bits)
+
+    def free_busy(self, first_day: tuple = (1, 1), last_day: tuple = (12, 31)) -> 'FreeBusy':
+        """
+        Exports the person's busy hours over a date range without any meeting details.
+
+        :param first_day: The first (month, day) of the range, inclusive.
+        :param last_day: The last (month, day) of the range, inclusive.
+        :return: A FreeBusy object with one busy mask per day that has meetings.
+        """
+        return self.view_calendar().free_busy(first_day, last_day)
+
+    def subscribe(self, callback) -> None:
+        """
+        Registers a function to be called after every change to the person's calendar.
+
+        :param callback: The function to call, as callback(calendar, op, month, day, detail).
+        """
+        if self._calendar is None:
+            # Attached when the calendar is created
+            if self._deferred_observers is None:
+                self._deferred_observers = []
+            self._deferred_observers.append(callback)
+        else:
+            self._calendar.subscribe(callback)
+
+    def unsubscribe(self, callback) -> None:
+        """
+        Removes a function registered with subscribe().
+
+        :param callback: The function to remove.
+        :raises ValueError: If the function is not registered.
+        """
+        if self._calendar is None:
+            if not self._deferred_observers:
+                raise ValueError("Callback is not subscribed")
+            self._deferred_observers.remove(callback)
+        else:
+            self._calendar.unsubscribe(callback)
+
+    def watch(self, first_day: tuple = None, last_day: tuple = None, callback=None,
+              max_queue: int = 1024, flush_window: float = 0.1) -> 'Subscription':
+        """
+        Subscribes to changes of the person's calendar, coalesced into one event per day per flush window.
+
+        :param first_day: The first (month, day) to report changes for, or None for no lower bound.
+        :param last_day: The last (month, day) to report changes for, or None for no upper bound.
+        :param callback: A function called with the list of events of each flush, or None.
+        :param max_queue: The maximum number of unconsumed events kept; the oldest are dropped.
+        :param flush_window: The number of seconds changes are coalesced for before a flush.
+        :return: The Subscription. Iterate it with "async for", poll() it, or close() it.
+        """
+        return watch_calendar(self, self, Subscription(first_day, last_day, callback, max_queue, flush_window))
 
     def get_meeting(self, month: int, day: int, index: int) -> 'Meeting':
         """
@@ -70,7 +207,7 @@ class Person:
         :param index: The index of the meeting in the list for that day.
         :return: The Meeting object at the specified date and index.
         """
-        return self.calendar.get_meeting(month, day, index)
+        return self.view_calendar().get_meeting(month, day, index)
 
     def remove_meeting(self, month: int, day: int, index: int) -> None:
         """
@@ -1,5 +1,24 @@
+import re
+
 from logic.Calendar import Calendar
 from logic.ConflictException import ConflictsException
+from logic.Notifications import Subscription, watch_calendar
+
+# Room IDs look like "ML21.520": building code, then floor and room number.
+ROOM_ID_PATTERN = re.compile(r"^([A-Za-z]+)(\d+)\.(\d+)$")
+
+
+def parse_room_id(id: str) -> tuple:
+    """
+    Splits a room ID such as "ML21.520" into its building, floor and room number.
+
+    :param id: The room ID.
+    :return: A (building, floor, number) tuple, or ("", None, None) if the ID does not follow the pattern.
+    """
+    match = ROOM_ID_PATTERN.match(id)
+    if match is None:
+        return "", None, None
+    return match.group(1), int(match.group(2)), int(match.group(3))
 
 
 class Room:
@@ -7,14 +26,63 @@ class Room:
     A class representing a room with an associated calendar to manage meetings.
     """
 
-    def __init__(self, id: str = ""):
+    # A function building the calendar from the room, set by an Organization with another
+    # storage backend. None means an in-memory Calendar.
+    _calendar_factory = None
+
+    def __init__(self, id: str = "", capacity: int = 0, features: set = None, max_bookings: int = 1):
         """
         Constructor for Room class. Initializes the room with an ID and an empty calendar.
 
         :param id: The unique identifier for the room.
+        :param capacity: The number of people the room seats. Defaults to 0 (unknown).
+        :param features: A set of feature names, e.g. {"projector"}. Defaults to no features.
+        :param max_bookings: The number of meetings the room can hold at the same time, e.g.
+                             for a hot-desk zone or a lab. Defaults to 1 (no overlaps).
         """
         self.id = id
-        self.calendar = Calendar()
+        self.capacity = capacity
+        self.features = frozenset(features) if features else frozenset()
+        self.max_bookings = max_bookings
+        self.building, self.floor, self.number = parse_room_id(id)
+        # The calendar is only created when it is first modified; see the calendar property
+        self._calendar = None
+        self._deferred_observers = None
+
+    @property
+    def calendar(self) -> 'Calendar':
+        """
+        The room's calendar, created on first access together with any observers
+        registered before it existed.
+        """
+        if self._calendar is None:
+            if self._calendar_factory is not None:
+                # Organization refuses shared rooms with a calendar factory
+                self._calendar = self._calendar_factory(self)
+            else:
+                self._calendar = Calendar()
+                if self.max_bookings > 1:
+                    self._calendar.set_max_concurrent(self.max_bookings)
+            for callback in self._deferred_observers or ():
+                self._calendar.subscribe(callback)
+            self._deferred_observers = None
+        return self._calendar
+
+    @calendar.setter
+    def calendar(self, calendar: 'Calendar') -> None:
+        self._calendar = calendar
+
+    def view_calendar(self) -> 'Calendar':
+        """
+        Retrieves the room's calendar for reading only, without creating it.
+
+        :return: The calendar, or the shared empty calendar if it has not been created yet.
+                 It must not be modified. Calendars made by a calendar factory, which may
+                 hold stored meetings, are always created.
+        """
+        if self._calendar is None:
+            return Calendar.empty() if self._calendar_factory is None else self.calendar
+        return self._calendar
 
     def get_id(self) -> str:
         """
@@ -24,6 +92,93 @@ class Room:
         """
         return self.id
 
+    def get_capacity(self) -> int:
+        """
+        Retrieves the number of people the room seats.
+
+        :return: The room's capacity, 0 if unknown.
+        """
+        return self.capacity
+
+    def get_features(self) -> frozenset:
+        """
+        Retrieves the features of the room.
+
+        :return: A frozenset of feature names.
+        """
+        return self.features
+
+    def get_max_bookings(self) -> int:
+        """
+        Retrieves the number of meetings the room can hold at the same time.
+
+        :return: 1 for an ordinary room, more for a shared space.
+        """
+        return self.max_bookings
+
+    def set_max_bookings(self, max_bookings: int) -> None:
+        """
+        Changes the number of meetings the room can hold at the same time. Meetings already
+        booked are kept, even if they now exceed the limit.
+
+        :param max_bookings: The new number of concurrent bookings (at least 1).
+        :raises ValueError: If max_bookings is less than 1, or more than 1 for a room whose
+                            calendar comes from a calendar factory.
+        """
+        if max_bookings < 1:
+            raise ValueError("A room needs room for at least one booking")
+        if max_bookings > 1 and self._calendar_factory is not None:
+            raise ValueError(f"Room {self.id} is shared, which stored calendars do not support")
+        self.max_bookings = max_bookings
+        if self._calendar is not None and self._calendar_factory is None:
+            # Switched in place, so observers, versions and forks keep referring to it
+            self._calendar.set_max_concurrent(max_bookings if max_bookings > 1 else None)
+
+    def has_features(self, features) -> bool:
+        """
+        Checks whether the room offers every requested feature.
+
+        :param features: An iterable of feature names.
+        :return: True if the room has all of the features, otherwise False.
+        """
+        return self.features.issuperset(features)
+
+    def get_building(self) -> str:
+        """
+        Retrieves the building code parsed from the room ID, e.g. "ML" for "ML21.520".
+
+        :return: The building code, or an empty string if the ID does not follow the pattern.
+        """
+        return self.building
+
+    def get_floor(self) -> int:
+        """
+        Retrieves the floor parsed from the room ID, e.g. 21 for "ML21.520".
+
+        :return: The floor, or None if the ID does not follow the pattern.
+        """
+        return self.floor
+
+    def get_number(self) -> int:
+        """
+        Retrieves the room number parsed from the room ID, e.g. 520 for "ML21.520".
+
+        :return: The room number, or None if the ID does not follow the pattern.
+        """
+        return self.number
+
+    def fork(self) -> 'Room':
+        """
+        Creates a copy of the room whose calendar is a copy-on-write fork of this one.
+
+        :return: The forked Room.
+        """
+        fork = Room.__new__(Room)
+        fork.__dict__.update(self.__dict__)
+        fork.calendar = self.calendar.fork()
+        fork._deferred_observers = None
+        return fork
+
     def add_meeting(self, meeting: 'Meeting') -> None:
         """
         Adds a meeting to the room's calendar.
@@ -34,7 +189,8 @@ class Room:
         try:
             self.calendar.add_meeting(meeting)
         except ConflictsException as e:
-            raise ConflictsException(f"Conflict for room {self.id}:\n{e}")
+            raise ConflictsException(cause=e, kind=e.kind, owner=self.id, owner_type="room",
+                                     conflicts=e.conflicts) from e
 
     def print_agenda(self, month: int, day: int = None) -> str:
         """
@@ -45,8 +201,8 @@ class Room:
         :return: A formatted string containing the agenda.
         """
         if day is None:
-            return self.calendar.print_agenda(month)
-        return self.calendar.print_agenda(month, day)
+            return self.view_calendar().print_agenda(month)
+        return self.view_calendar().print_agenda(month, day)
 
     def is_busy(self, month: int, day: int, start: int, end: int) -> bool:
         """
@@ -59,7 +215,70 @@ class Room:
         :return: True if the room is occupied during the specified time frame, otherwise False.
         :raises ConflictsException: If the input time values are invalid.
         """
-        return self.calendar.is_busy(month, day, start, end)
+        return self.view_calendar().is_busy(month, day, start, end)
+
+    def is_busy_many(self, probes, as_bits: bool = False):
+        """
+        Checks whether the room is busy in many time frames at once.
+
+        :param probes: A sequence of (month, day, start, end) tuples.
+        :param as_bits: If True, return an int whose bit i is set when probe i is busy.
+        :return: A list of booleans (True if busy) in probe order, or the bit array.
+        :raises ConflictsException: If any probe has invalid time values.
+        """
+        return self.view_calendar().is_busy_many(probes, as_bits)
+
+    def free_busy(self, first_day: tuple = (1, 1), last_day: tuple = (12, 31)) -> 'FreeBusy':
+        """
+        Exports the room's busy hours over a date range without any meeting details.
+
+        :param first_day: The first (month, day) of the range, inclusive.
+        :param last_day: The last (month, day) of the range, inclusive.
+        :return: A FreeBusy object with one busy mask per day that has meetings.
+        """
+        return self.view_calendar().free_busy(first_day, last_day)
+
+    def subscribe(self, callback) -> None:
+        """
+        Registers a function to be called after every change to the room's calendar.
+
+        :param callback: The function to call, as callback(calendar, op, month, day, detail).
+        """
+        if self._calendar is None:
+            # Attached when the calendar is created
+            if self._deferred_observers is None:
+                self._deferred_observers = []
+            self._deferred_observers.append(callback)
+        else:
+            self._calendar.subscribe(callback)
+
+    def unsubscribe(self, callback) -> None:
+        """
+        Removes a function registered with subscribe().
+
+        :param callback: The function to remove.
+        :raises ValueError: If the function is not registered.
+        """
+        if self._calendar is None:
+            if not self._deferred_observers:
+                raise ValueError("Callback is not subscribed")
+            self._deferred_observers.remove(callback)
+        else:
+            self._calendar.unsubscribe(callback)
+
+    def watch(self, first_day: tuple = None, last_day: tuple = None, callback=None,
+              max_queue: int = 1024, flush_window: float = 0.1) -> 'Subscription':
+        """
+        Subscribes to changes of the room's calendar, coalesced into one event per day per flush window.
+
+        :param first_day: The first (month, day) to report changes for, or None for no lower bound.
+        :param last_day: The last (month, day) to report changes for, or None for no upper bound.
+        :param callback: A function called with the list of events of each flush, or None.
+        :param max_queue: The maximum number of unconsumed events kept; the oldest are dropped.
+        :param flush_window: The number of seconds changes are coalesced for before a flush.
+        :return: The Subscription. Iterate it with "async for", poll() it, or close() it.
+        """
+        return watch_calendar(self, self, Subscription(first_day, last_day, callback, max_queue, flush_window))
 
     def get_meeting(self, month: int, day: int, index: int) -> 'Meeting':
         """
@@ -70,7 +289,7 @@ class Room:
         :param index: The index of the meeting in the list for that day.
         :return: The Meeting object at the specified date and index.
         """
-        return self.calendar.get_meeting(month, day, index)
+        return self.view_calendar().get_meeting(month, day, index)
 
     def remove_meeting(self, month: int, day: int, index: int) -> None:
         """
@@ -0,0 +1,354 @@
+import time
+from itertools import islice
+from bisect import bisect_left, bisect_right
+
+from logic.Calendar import Calendar
+from logic.ConflictException import ConflictsException
+from logic.FreeBusy import hours_mask, slot_is_clear
+from logic.Meeting import Meeting
+
+# Every (month, day) accepted by Calendar.check_times, built on first use
+_ALL_DAYS = None
+
+
+def _all_days() -> list:
+    """
+    Lists every (month, day) pair that passes Calendar.check_times, computed once.
+
+    :return: A sorted list of (month, day) tuples.
+    """
+    global _ALL_DAYS
+    if _ALL_DAYS is None:
+        _ALL_DAYS = []
+        for month in range(1, 13):
+            for day in range(1, 32):
+                try:
+                    Calendar.check_times(month, day, 0, 0)
+                except ConflictsException:
+                    continue
+                _ALL_DAYS.append((month, day))
+    return _ALL_DAYS
+
+
+def valid_days(first_day: tuple, last_day: tuple) -> list:
+    """
+    Lists the (month, day) pairs between two dates (inclusive) that pass Calendar.check_times.
+
+    :param first_day: The first (month, day) of the range.
+    :param last_day: The last (month, day) of the range.
+    :return: A list of (month, day) tuples in chronological order.
+    """
+    days = _all_days()
+    return days[bisect_left(days, tuple(first_day)):bisect_right(days, tuple(last_day))]
+
+
+class MeetingRequest:
+    """
+    A class representing a request to place a meeting somewhere inside a date and time window.
+    """
+
+    def __init__(self, attendees: list, duration: int, first_day: tuple, last_day: tuple = None,
+                 earliest: int = 0, latest: int = 23, needs_room: bool = True, capacity: int = 0,
+                 features=(), building: str = None, description: str = ""):
+        """
+        Constructor for the MeetingRequest class.
+
+        :param attendees: A list of Person objects that must attend.
+        :param duration: The length of the meeting in hours (end time minus start time).
+        :param first_day: The first (month, day) the meeting may take place on.
+        :param last_day: The last (month, day) the meeting may take place on. Defaults to first_day.
+        :param earliest: The earliest start time (0-23). Defaults to 0.
+        :param latest: The latest end time (0-23). Defaults to 23.
+        :param needs_room: Whether a room must be booked. Defaults to True.
+        :param capacity: The minimum number of seats of the room. Defaults to 0 (any room).
+        :param features: An iterable of required room feature names.
+        :param building: The building code the room must be in, or None for any building.
+        :param description: A description of the meeting.
+        """
+        self.attendees = attendees
+        self.duration = duration
+        self.first_day = first_day
+        self.last_day = last_day if last_day is not None else first_day
+        self.earliest = earliest
+        self.latest = latest
+        self.needs_room = needs_room
+        self.capacity = capacity
+        self.features = features
+        self.building = building
+        self.description = description
+
+    def get_attendees(self) -> list:
+        """ Retrieves the attendees of the requested meeting. """
+        return self.attendees
+
+    def get_duration(self) -> int:
+        """ Retrieves the duration of the requested meeting. """
+        return self.duration
+
+    def get_description(self) -> str:
+        """ Retrieves the description of the requested meeting. """
+        return self.description
+
+
+class ScheduleResult:
+    """
+    A class holding the outcome of a batch scheduling run.
+    """
+
+    def __init__(self):
+        """
+        Default constructor, builds an empty result.
+        """
+        self.placements = {}
+        self.unplaced = {}
+        self.backtracks = 0
+        self.elapsed = 0.0
+
+    def get_placements(self) -> dict:
+        """
+        Retrieves the placed requests.
+
+        :return: A dictionary mapping each placed MeetingRequest to its booked Meeting.
+        """
+        return self.placements
+
+    def get_unplaced(self) -> dict:
+        """
+        Retrieves the requests that could not be placed.
+
+        :return: A dictionary mapping each unplaced MeetingRequest to the reason as a string.
+        """
+        return self.unplaced
+
+
+class Scheduler:
+    """
+    A batch scheduler that places many meeting requests into the calendars of an organization.
+
+    Requests are placed greedily, most constrained first, into the earliest slot where every
+    attendee (and a room, if needed) is free for every hour. When a request does not fit, a
+    bounded number of meetings placed earlier in the same batch that block it are moved out of
+    the way and re-placed.
+    """
+
+    def __init__(self, organization: 'Organization', time_budget: float = 1.0, max_backtracks: int = 3):
+        """
+        Constructor for the Scheduler class.
+
+        :param organization: The Organization whose employees and rooms are scheduled.
+        :param time_budget: The maximum number of seconds to spend on one batch.
+        :param max_backtracks: How many earlier placements may be moved to fit one request.
+        """
+        self.organization = organization
+        self.time_budget = time_budget
+        self.max_backtracks = max_backtracks
+        self._masks = {}
+
+    def schedule(self, requests: list) -> ScheduleResult:
+        """
+        Places a batch of meeting requests.
+
+        :param requests: A list of MeetingRequest objects.
+        :return: A ScheduleResult with the placements and the unplaceable requests.
+        """
+        result = ScheduleResult()
+        started = time.perf_counter()
+        deadline = started + self.time_budget
+
+        for request in sorted(requests, key=self._constraint_key):
+            if time.perf_counter() > deadline:
+                result.unplaced[request] = "time budget exhausted"
+                continue
+            try:
+                self._check_request(request)
+            except ConflictsException as e:
+                result.unplaced[request] = str(e)
+                continue
+
+            meeting = self._place(request)
+            if meeting is None:
+                meeting = self._place_with_backtracking(request, result, deadline)
+            if meeting is None:
+                result.unplaced[request] = "no free slot in the requested window"
+            else:
+                result.placements[request] = meeting
+
+        result.elapsed = time.perf_counter() - started
+        return result
+
+    @staticmethod
+    def _constraint_key(request: MeetingRequest) -> tuple:
+        """
+        Orders requests so that the hardest ones to place come first.
+
+        :param request: The MeetingRequest to rank.
+        :return: A sort key (more attendees, longer and narrower windows first).
+        """
+        window = len(valid_days(request.first_day, request.last_day)) * \
+            max(request.latest - request.earliest - request.duration + 1, 0)
+        return -len(request.attendees), window, -request.duration
+
+    @staticmethod
+    def _check_request(request: MeetingRequest) -> None:
+        """
+        Validates the window of a request once, before any slot is probed.
+
+        :param request: The MeetingRequest to validate.
+        :raises ConflictsException: If the window cannot hold a valid meeting.
+        """
+        days = valid_days(request.first_day, request.last_day)
+        if not days:
+            raise ConflictsException(kind=ConflictsException.INVALID_DAY)
+        Calendar.check_times(days[0][0], days[0][1], request.earliest, request.earliest + request.duration)
+        if request.duration < 0 or request.earliest + request.duration > request.latest:
+            raise ConflictsException(kind=ConflictsException.BAD_ORDER)
+
+    def _place(self, request: MeetingRequest, skip: tuple = None) -> 'Meeting':
+        """
+        Books a request into its earliest free slot.
+
+        :param request: The MeetingRequest to place.
+        :param skip: A (month, day, start, end) slot that must not be used.
+        :return: The booked Meeting, or None if no slot is free.
+        """
+        rooms = None
+        if request.needs_room:
+            rooms = self.organization.get_room_candidates(request.capacity, request.features, request.building)
+            if not rooms:
+                return None
+
+        duration = request.duration
+        # Calendar.check_times rejects start hours of 23 and later
+        last_start = min(request.latest - duration, 22)
+        for month, day in valid_days(request.first_day, request.last_day):
+            busy = 0
+            for person in request.attendees:
+                busy |= self._busy_mask(person, month, day)
+            for start in range(request.earliest, last_start + 1):
+                end = start + duration
+                if not slot_is_clear(busy, start, end) or (month, day, start, end) == skip:
+                    continue
+                room = None
+                if rooms is not None:
+                    for candidate in rooms:
+                        room_busy = self._busy_mask(candidate, month, day)
+                        if slot_is_clear(room_busy, start, end):
+                            room = candidate
+                            break
+                    if room is None:
+                        continue
+                meeting = Meeting(month, day, start, end, list(request.attendees), room, request.description)
+                if self._book(meeting):
+                    return meeting
+        return None
+
+    def _busy_mask(self, participant, month: int, day: int) -> int:
+        """
+        Retrieves the hours a participant is busy on a day as a bitmask, caching the result.
+
+        :param participant: The Person or Room to inspect.
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        :return: The busy bitmask for that day.
+        """
+        key = (participant, month, day)
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self._masks[key] = participant.view_calendar().busy_mask(month, day)
+        return mask
+
+    def _place_with_backtracking(self, request: MeetingRequest, result: ScheduleResult, deadline: float) -> 'Meeting':
+        """
+        Tries to fit a request by moving meetings that were placed earlier in this batch.
+
+        :param request: The MeetingRequest that did not fit.
+        :param result: The result of the batch so far. Moved placements are updated in place.
+        :param deadline: The time.perf_counter() value after which no more attempts are made.
+        :return: The booked Meeting, or None if the request still does not fit.
+        """
+        first_day, last_day = request.first_day, request.last_day
+        window = hours_mask(request.earliest, request.latest)
+        rooms = set()
+        if request.needs_room:
+            rooms = set(self.organization.get_room_candidates(request.capacity, request.features, request.building))
+        # Only meetings inside the request's window that hold one of its attendees or rooms block it
+        victims = (
+            (placed, meeting) for placed, meeting in result.placements.items()
+            if first_day <= (meeting.get_month(), meeting.get_day()) <= last_day
+            and hours_mask(meeting.get_start_time(), meeting.get_end_time()) & window
+            and (meeting.get_room() in rooms
+                 or any(meeting.has_attendee(person) for person in request.attendees))
+        )
+
+        for placed, victim in list(islice(victims, self.max_backtracks)):
+            if time.perf_counter() > deadline:
+                break
+            result.backtracks += 1
+            old_slot = (victim.get_month(), victim.get_day(), victim.get_start_time(), victim.get_end_time())
+            self._unbook(victim)
+
+            meeting = self._place(request)
+            if meeting is not None:
+                moved = self._place(placed, skip=old_slot)
+                if moved is not None:
+                    result.placements[placed] = moved
+                    return meeting
+                self._unbook(meeting)
+
+            # Undo: put the victim back where it was
+            self._book(victim)
+        return None
+
+    def _participants(self, meeting: 'Meeting') -> list:
+        """
+        Lists every Person and Room whose calendar holds the meeting, as this organization's
+        versions of them.
+
+        :param meeting: The Meeting object.
+        :return: A list of Person and Room objects.
+        """
+        organization = self.organization
+        participants = [organization._fork_entity(organization._directory_entity(person))
+                        for person in meeting.get_attendees()]
+        if meeting.get_room() is not None:
+            participants.append(organization._fork_entity(organization._directory_entity(meeting.get_room())))
+        return participants
+
+    def _book(self, meeting: 'Meeting') -> bool:
+        """
+        Adds a meeting to every participant, rolling back if any of them rejects it.
+
+        :param meeting: The Meeting object to book.
+        :return: True if the meeting was booked for every participant, otherwise False.
+        """
+        booked = []
+        try:
+            for participant in self._participants(meeting):
+                participant.add_meeting(meeting)
+                self._masks.pop((participant, meeting.get_month(), meeting.get_day()), None)
+                booked.append(participant)
+        except ConflictsException:
+            for participant in booked:
+                self._remove(participant, meeting)
+            return False
+        return True
+
+    def _unbook(self, meeting: 'Meeting') -> None:
+        """
+        Removes a meeting from every participant.
+
+        :param meeting: The Meeting object to remove.
+        """
+        for participant in self._participants(meeting):
+            self._remove(participant, meeting)
+
+    def _remove(self, participant, meeting: 'Meeting') -> None:
+        """
+        Removes one meeting object from a participant's calendar.
+
+        :param participant: The Person or Room holding the meeting.
+        :param meeting: The Meeting object to remove.
+        """
+        month, day = meeting.get_month(), meeting.get_day()
+        self._masks.pop((participant, month, day), None)
+        participant.remove_meeting(month, day, participant.view_calendar().index_of(month, day, meeting))
@@ -0,0 +1,23 @@
+from logic.Calendar import Calendar
+
+
+class SharedCalendar(Calendar):
+    """
+    A calendar for shared spaces such as hot-desk zones or labs, which accept a number of
+    concurrent bookings instead of one.
+
+    This is a Calendar created in shared mode; see Calendar.set_max_concurrent for the rules.
+    Any calendar can be switched between modes later, e.g. when a room's max_bookings changes.
+    """
+
+    def __init__(self, max_concurrent: int):
+        """
+        Constructor for the SharedCalendar class.
+
+        :param max_concurrent: The number of bookings allowed at the same time (at least 1).
+        :raises ValueError: If max_concurrent is less than 1.
+        """
+        if max_concurrent is None or max_concurrent < 1:
+            raise ValueError("A shared calendar needs room for at least one booking")
+        super().__init__()
+        self.set_max_concurrent(max_concurrent)
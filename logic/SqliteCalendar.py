@@ -0,0 +1,491 @@
+import json
+import sqlite3
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from logic.Calendar import Calendar
+from logic.Meeting import Meeting
+from logic.Person import Person
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    id INTEGER PRIMARY KEY,
+    month INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    start_hour INTEGER NOT NULL,
+    end_hour INTEGER NOT NULL,
+    description TEXT,
+    room TEXT,
+    attendees TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bookings (
+    owner TEXT NOT NULL,
+    month INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    start_hour INTEGER NOT NULL,
+    end_hour INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    meeting INTEGER NOT NULL REFERENCES meetings (id)
+);
+CREATE INDEX IF NOT EXISTS bookings_by_slot ON bookings (owner, month, day, start_hour, end_hour);
+CREATE TABLE IF NOT EXISTS cleared_placeholders (
+    owner TEXT NOT NULL,
+    month INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    PRIMARY KEY (owner, month, day)
+);
+"""
+
+# The statements are constant strings, so sqlite3 prepares each one once and reuses it
+_SELECT_DAY = "SELECT meeting FROM bookings WHERE owner = ? AND month = ? AND day = ? ORDER BY position"
+_SELECT_MONTH = "SELECT day, meeting FROM bookings WHERE owner = ? AND month = ? ORDER BY day, position"
+_SELECT_MEETING = "SELECT month, day, start_hour, end_hour, description, room, attendees FROM meetings WHERE id = ?"
+_SELECT_CLEARED = "SELECT 1 FROM cleared_placeholders WHERE owner = ? AND month = ? AND day = ?"
+_INSERT_MEETING = ("INSERT INTO meetings (month, day, start_hour, end_hour, description, room, attendees) "
+                   "VALUES (?, ?, ?, ?, ?, ?, ?)")
+_INSERT_BOOKING = ("INSERT INTO bookings (owner, month, day, start_hour, end_hour, position, meeting) "
+                   "VALUES (?, ?, ?, ?, ?, ?, ?)")
+_INSERT_CLEARED = "INSERT OR IGNORE INTO cleared_placeholders (owner, month, day) VALUES (?, ?, ?)"
+_DELETE_DAY = "DELETE FROM bookings WHERE owner = ? AND month = ? AND day = ?"
+_DELETE_POSITION = "DELETE FROM bookings WHERE owner = ? AND month = ? AND day = ? AND position = ?"
+_SHIFT_POSITIONS = ("UPDATE bookings SET position = position - 1 "
+                    "WHERE owner = ? AND month = ? AND day = ? AND position > ?")
+
+
+class SqliteStore:
+    """
+    A SQLite database holding the calendars of many owners, with a small cache of hot days.
+
+    Each meeting is stored once, however many calendars it is booked in, and is rebuilt as
+    one Meeting object while any caller holds it. Attendees and rooms are stored by their
+    stable key (see Person.get_key) and ID and resolved through the attached organization,
+    so renaming an employee keeps their calendar and meetings. Meetings edited in place after
+    booking are not written back.
+    """
+
+    def __init__(self, path: str = ":memory:", hot_days: int = 256):
+        """
+        Constructor for the SqliteStore class. Creates the tables and indexes if needed.
+
+        :param path: The database file, or ":memory:" for a private in-memory database.
+        :param hot_days: The number of calendar days kept in memory.
+        """
+        self.connection = sqlite3.connect(path, isolation_level=None)
+        self.connection.executescript(_SCHEMA)
+        self.hot_days = hot_days
+        self.organization = None
+        self._days = OrderedDict()
+        self._objects = weakref.WeakValueDictionary()
+        self._ids = weakref.WeakKeyDictionary()
+        self._placeholders = {(month, day): placeholder for month, day, placeholder in Calendar.placeholders()}
+        self._in_batch = False
+        # Meetings stored by the current transaction, forgotten again if it is rolled back
+        self._batch_ids = []
+
+    def attach(self, organization: 'Organization') -> None:
+        """
+        Makes an organization keep the calendars of all its employees and rooms in this store.
+
+        :param organization: The Organization object.
+        """
+        self.organization = organization
+        organization.set_calendar_factory(self.calendar_for)
+
+    def calendar_for(self, entity) -> 'SqliteCalendar':
+        """
+        Builds the calendar of an employee or room. Usable as an Organization calendar factory.
+
+        :param entity: The Person or Room.
+        :return: A SqliteCalendar keyed by the person's stable key or the room's ID.
+        """
+        if isinstance(entity, Person):
+            return SqliteCalendar(self, "person:" + entity.get_key())
+        return SqliteCalendar(self, "room:" + entity.get_id())
+
+    @contextmanager
+    def batch(self):
+        """
+        Runs a block of writes, e.g. a bulk import, in one transaction.
+
+        Usage: "with store.batch(): ...". The transaction is rolled back if the block raises.
+        Nested batches join the outer one.
+        """
+        if self._in_batch:
+            yield
+            return
+        self._in_batch = True
+        self.connection.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            # The cached days may hold writes that were rolled back, and the meetings stored
+            # in the transaction no longer have rows; SQLite will reuse their IDs
+            self._days.clear()
+            for meeting_id in self._batch_ids:
+                meeting = self._objects.pop(meeting_id, None)
+                if meeting is not None:
+                    self._ids.pop(meeting, None)
+            raise
+        else:
+            self.connection.execute("COMMIT")
+        finally:
+            self._in_batch = False
+            self._batch_ids = []
+
+    def load_day(self, owner: str, month: int, day: int) -> list:
+        """
+        Retrieves the meetings of one day of one calendar, from the hot-day cache if possible.
+
+        :param owner: The calendar owner key.
+        :param month: The month (0-12).
+        :param day: The day (0-31).
+        :return: The list of Meeting objects, placeholder first, in booking order.
+        """
+        key = (owner, month, day)
+        meetings = self._days.get(key)
+        if meetings is not None:
+            self._days.move_to_end(key)
+            return meetings
+
+        rows = self.connection.execute(_SELECT_DAY, key).fetchall()
+        meetings = self._day_list(owner, month, day, [meeting_id for meeting_id, in rows])
+        self._days[key] = meetings
+        if len(self._days) > self.hot_days:
+            self._days.popitem(last=False)
+        return meetings
+
+    def load_month(self, owner: str, month: int) -> dict:
+        """
+        Retrieves the meetings of every day of one month of one calendar with a single query.
+
+        :param owner: The calendar owner key.
+        :param month: The month (0-12).
+        :return: A dictionary mapping each day with meetings or a placeholder to its list.
+        """
+        ids = {}
+        for day, meeting_id in self.connection.execute(_SELECT_MONTH, (owner, month)):
+            ids.setdefault(day, []).append(meeting_id)
+        days = {}
+        for day in set(ids).union(d for m, d in self._placeholders if m == month):
+            cached = self._days.get((owner, month, day))
+            days[day] = cached if cached is not None else self._day_list(owner, month, day, ids.get(day, ()))
+        return days
+
+    def _day_list(self, owner: str, month: int, day: int, meeting_ids) -> list:
+        """
+        Builds the meeting list of a day from stored meeting IDs.
+        """
+        meetings = [self._meeting(meeting_id) for meeting_id in meeting_ids]
+        placeholder = self._placeholders.get((month, day))
+        if placeholder is not None and not self._is_cleared(owner, month, day):
+            meetings.insert(0, placeholder)
+        return meetings
+
+    def _is_cleared(self, owner: str, month: int, day: int) -> bool:
+        return self.connection.execute(_SELECT_CLEARED, (owner, month, day)).fetchone() is not None
+
+    def _meeting(self, meeting_id: int) -> 'Meeting':
+        """
+        Retrieves a stored meeting, rebuilding it if no caller holds it any more.
+        """
+        meeting = self._objects.get(meeting_id)
+        if meeting is None:
+            month, day, start, end, description, room, attendees = \
+                self.connection.execute(_SELECT_MEETING, (meeting_id,)).fetchone()
+            people = [person for person in map(self._resolve_person, json.loads(attendees)) if person is not None]
+            meeting = Meeting(month, day, start, end, people, self._resolve_room(room), description)
+            self._objects[meeting_id] = meeting
+            self._ids[meeting] = meeting_id
+        return meeting
+
+    def _resolve_person(self, key: str) -> 'Person':
+        if self.organization is None:
+            return None
+        person = self.organization._people_by_key.get(key)
+        if person is not None:
+            return person
+        try:
+            return self.organization.get_employee(key)
+        except Exception:
+            return None
+
+    def _resolve_room(self, id: str) -> 'Room':
+        if id is None or self.organization is None:
+            return None
+        try:
+            return self.organization.get_room(id)
+        except Exception:
+            return None
+
+    def _meeting_id(self, meeting: 'Meeting') -> int:
+        """
+        Retrieves the stored ID of a meeting, storing the meeting the first time it is seen.
+        """
+        meeting_id = self._ids.get(meeting)
+        if meeting_id is None:
+            room = meeting.get_room()
+            attendees = json.dumps([person.get_key() for person in meeting.get_attendees()])
+            meeting_id = self.connection.execute(_INSERT_MEETING, (
+                meeting.get_month(), meeting.get_day(), meeting.get_start_time(), meeting.get_end_time(),
+                meeting.get_description(), room.get_id() if room is not None else None, attendees)).lastrowid
+            self._ids[meeting] = meeting_id
+            self._objects[meeting_id] = meeting
+            if self._in_batch:
+                self._batch_ids.append(meeting_id)
+        return meeting_id
+
+    def append(self, owner: str, month: int, day: int, meeting: 'Meeting') -> None:
+        """
+        Adds a meeting to the end of a day.
+
+        :param owner: The calendar owner key.
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        :param meeting: The Meeting object.
+        """
+        meetings = self.load_day(owner, month, day)
+        stored = len(meetings) - (1 if meetings and meetings[0] is self._placeholders.get((month, day)) else 0)
+        with self.batch():
+            self.connection.execute(_INSERT_BOOKING, (owner, month, day, meeting.get_start_time(),
+                                                      meeting.get_end_time(), stored, self._meeting_id(meeting)))
+        meetings.append(meeting)
+
+    def remove(self, owner: str, month: int, day: int, index: int) -> None:
+        """
+        Removes the meeting at an index of a day.
+
+        :param owner: The calendar owner key.
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        :param index: The index in the day's list, placeholder included.
+        :raises IndexError: If the index is out of range.
+        """
+        meetings = self.load_day(owner, month, day)
+        if not -len(meetings) <= index < len(meetings):
+            raise IndexError("list assignment index out of range")
+        index %= len(meetings)
+        with self.batch():
+            if meetings[index] is self._placeholders.get((month, day)):
+                self.connection.execute(_INSERT_CLEARED, (owner, month, day))
+            else:
+                has_placeholder = meetings[0] is self._placeholders.get((month, day))
+                position = index - 1 if has_placeholder else index
+                self.connection.execute(_DELETE_POSITION, (owner, month, day, position))
+                self.connection.execute(_SHIFT_POSITIONS, (owner, month, day, position))
+        del meetings[index]
+
+    def replace(self, owner: str, month: int, day: int, new_meetings: list) -> None:
+        """
+        Replaces every meeting of a day.
+
+        :param owner: The calendar owner key.
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        :param new_meetings: The new list of Meeting objects. The day's placeholder is kept
+                             only if it is in the list.
+        """
+        meetings = self.load_day(owner, month, day)
+        placeholder = self._placeholders.get((month, day))
+        with self.batch():
+            self.connection.execute(_DELETE_DAY, (owner, month, day))
+            if placeholder is not None and not any(meeting is placeholder for meeting in new_meetings):
+                self.connection.execute(_INSERT_CLEARED, (owner, month, day))
+            stored = [meeting for meeting in new_meetings if meeting is not placeholder]
+            self.connection.executemany(_INSERT_BOOKING, [
+                (owner, month, day, meeting.get_start_time(), meeting.get_end_time(), position, self._meeting_id(meeting))
+                for position, meeting in enumerate(stored)])
+        meetings[:] = ([placeholder] if placeholder is not None and len(stored) < len(new_meetings) else []) + stored
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        self.connection.close()
+
+
+class _StoredDays:
+    """
+    The days of one month of a SqliteCalendar, read like the day dictionary of a Calendar.
+    """
+
+    def __init__(self, calendar: 'SqliteCalendar', month: int):
+        self.calendar = calendar
+        self.month = month
+
+    def __getitem__(self, day: int) -> list:
+        if day not in self:
+            raise KeyError(day)
+        return self.calendar.store.load_day(self.calendar.owner, self.month, day)
+
+    def get(self, day: int, default=None):
+        return self[day] if day in self else default
+
+    def __contains__(self, day) -> bool:
+        return isinstance(day, int) and 0 <= day <= 31
+
+    def __iter__(self):
+        return iter(range(0, 32))
+
+    def keys(self):
+        return range(0, 32)
+
+    def __len__(self) -> int:
+        return 32
+
+    def items(self):
+        days = self.calendar.store.load_month(self.calendar.owner, self.month)
+        return [(day, days.get(day, [])) for day in range(0, 32)]
+
+    def values(self):
+        return [meetings for day, meetings in self.items()]
+
+
+class _StoredMonths:
+    """
+    The months of a SqliteCalendar, read like the occupied dictionary of a Calendar.
+    """
+
+    def __init__(self, calendar: 'SqliteCalendar'):
+        self.calendar = calendar
+
+    def __getitem__(self, month: int) -> _StoredDays:
+        if month not in self:
+            raise KeyError(month)
+        return _StoredDays(self.calendar, month)
+
+    def get(self, month: int, default=None):
+        return self[month] if month in self else default
+
+    def __contains__(self, month) -> bool:
+        return isinstance(month, int) and 0 <= month <= 12
+
+    def __iter__(self):
+        return iter(range(0, 13))
+
+    def keys(self):
+        return range(0, 13)
+
+    def __len__(self) -> int:
+        return 13
+
+    def items(self):
+        return [(month, self[month]) for month in range(0, 13)]
+
+    def values(self):
+        return [self[month] for month in range(0, 13)]
+
+
+class SqliteCalendar(Calendar):
+    """
+    A Calendar whose meetings live in a SqliteStore instead of in memory.
+
+    Every Calendar method works unchanged: reads go through the store's hot-day cache and
+    writes go to the database before observers are notified. Version counters, observers
+    and the agenda cache behave as for an in-memory calendar.
+    """
+
+    def __init__(self, store: SqliteStore, owner: str):
+        """
+        Constructor for the SqliteCalendar class.
+
+        :param store: The SqliteStore holding the meetings.
+        :param owner: The key of this calendar in the store, e.g. "person:Helen West".
+        """
+        self.store = store
+        self.owner = owner
+        # The live forks of this calendar, created by the first fork()
+        self._forks = None
+        super().__init__()
+
+    def _new_storage(self) -> _StoredMonths:
+        """
+        Builds a read-only view of the stored days with the interface of Calendar.occupied.
+        """
+        return _StoredMonths(self)
+
+    def add_checked_meeting(self, to_add: 'Meeting') -> None:
+        """
+        Adds a meeting that has already been validated with check_times and find_conflicts.
+
+        :param to_add: A Meeting object to add to the calendar.
+        """
+        month, day = to_add.get_month(), to_add.get_day()
+        self._preserve(month, day)
+        self.store.append(self.owner, month, day, to_add)
+        self._touch(month, day, "add", to_add)
+
+    def remove_meeting(self, month: int, day: int, index: int) -> None:
+        """
+        Removes a meeting from the calendar at the specified date and index.
+
+        :param month: The month of the meeting (1-12).
+        :param day: The day of the meeting (1-31).
+        :param index: The index of the meeting to be removed in the list.
+        :raises KeyError: If the month or day does not exist.
+        :raises IndexError: If the index is out of range for the given date.
+        """
+        self.occupied[month][day]
+        self._preserve(month, day)
+        self.store.remove(self.owner, month, day, index)
+        self._touch(month, day, "remove", index)
+
+    def clear_schedule(self, month: int, day: int) -> None:
+        """
+        Clears all meetings for a given day.
+
+        :param month: The month for which the schedule should be cleared (1-12).
+        :param day: The day for which the schedule should be cleared (1-31).
+        :raises KeyError: If the month does not exist.
+        """
+        self.occupied[month]
+        self._preserve(month, day)
+        self.store.replace(self.owner, month, day, [])
+        self._touch(month, day, "clear")
+
+    def replace_day(self, month: int, day: int, meetings: list) -> None:
+        """
+        Replaces every meeting of a day without conflict checks.
+
+        :param month: The month (1-12).
+        :param day: The day (1-31).
+        :param meetings: The new list of Meeting objects for that day.
+        """
+        self._preserve(month, day)
+        self.store.replace(self.owner, month, day, list(meetings))
+        self._touch(month, day, "replace", list(meetings))
+
+    def fork(self) -> 'Calendar':
+        """
+        Creates an in-memory copy-on-write fork of this calendar for what-if planning.
+
+        Like an in-memory calendar's fork, it takes constant time: the fork reads through to
+        the store until a day is modified. Before this calendar changes a day, it hands every
+        live fork a private copy of that day, so the fork keeps seeing the day as it was.
+
+        :return: A Calendar whose commit() writes back to this calendar.
+        """
+        fork = super().fork()
+        if self._forks is None:
+            self._forks = weakref.WeakSet()
+        self._forks.add(fork)
+        return fork
+
+    def _new_fork(self) -> 'Calendar':
+        """
+        Builds the uninitialized object of a fork, which is an in-memory Calendar.
+        """
+        return Calendar.__new__(Calendar)
+
+    def _preserve(self, month: int, day: int) -> None:
+        """
+        Gives every live fork that still reads a day from the store its own copy of the day.
+
+        :param month: The month about to change (1-12).
+        :param day: The day about to change (1-31).
+        """
+        for fork in list(self._forks or ()):
+            if (month, day) not in fork._owned_days:
+                fork._writable_month(month)[day] = list(self.occupied[month][day])
+                fork._owned_days.add((month, day))
@@ -0,0 +1,69 @@
+"""
+White-Box Tests for the versioned agenda render cache
+
+Goal: Verify that day versions are bumped by every mutation, that repeated
+agenda requests are served from the cache, and that the cache stays bounded.
+"""
+
+from logic.AgendaCache import AgendaCache
+from logic.Calendar import Calendar
+from logic.Person import Person
+from logic.Meeting import Meeting
+
+
+class TestVersions:
+    """Test the day and month version counters"""
+
+    def test_mutations_bump_versions(self):
+        """add_meeting, remove_meeting and clear_schedule should bump the day version"""
+        cal = Calendar()
+        assert cal.get_version(6, 15) == 0
+
+        cal.add_meeting(Meeting(6, 15, 10, 12, description="Team Meeting"))
+        assert cal.get_version(6, 15) == 1
+        cal.remove_meeting(6, 15, 0)
+        assert cal.get_version(6, 15) == 2
+        cal.clear_schedule(6, 15)
+        assert cal.get_version(6, 15) == 3
+        assert cal.get_version(6) == 3
+        assert cal.get_version(6, 16) == 0
+
+
+class TestAgendaCache:
+    """Test caching of rendered agendas"""
+
+    def test_repeated_agenda_is_a_cache_hit(self):
+        """A second identical request should be served from the cache"""
+        person = Person("Helen West")
+        person.add_meeting(Meeting(6, 15, 10, 12, description="Team Meeting"))
+        hits = Calendar.agenda_cache.stats()["hits"]
+
+        first = person.print_agenda(6, 15)
+        second = person.print_agenda(6, 15)
+
+        assert first is second
+        assert Calendar.agenda_cache.stats()["hits"] == hits + 1
+
+    def test_agenda_reflects_changes(self):
+        """A booking change should invalidate the cached day and month agendas"""
+        cal = Calendar()
+        cal.add_meeting(Meeting(6, 15, 10, 12, description="Team Meeting"))
+        assert "Team Meeting" in cal.print_agenda(6, 15)
+        assert "Team Meeting" in cal.print_agenda(6)
+
+        cal.clear_schedule(6, 15)
+
+        assert cal.print_agenda(6, 15) == "No Meetings booked on this date.\n\n"
+        assert "Team Meeting" not in cal.print_agenda(6)
+
+    def test_cache_is_bounded(self):
+        """The least recently used entry should be evicted first"""
+        cache = AgendaCache(max_size=2)
+        cache.put(("a",), "A")
+        cache.put(("b",), "B")
+        cache.get(("a",))
+        cache.put(("c",), "C")
+
+        assert cache.get(("b",)) is None
+        assert cache.get(("a",)) == "A"
+        assert cache.stats() == {"hits": 2, "misses": 1, "size": 2, "max_size": 2}
@@ -0,0 +1,100 @@
+"""
+White-Box Tests for org-wide agenda reports
+
+Goal: Verify that AgendaReport writes the same text as print_agenda for every
+employee and room, to per-entity files or one zip archive, in parallel worker
+processes or in-process, and reports progress.
+"""
+
+import os
+import random
+import zipfile
+
+import pytest
+
+from logic.AgendaReport import AgendaReport, entry_names
+from logic.Meeting import Meeting
+from logic.Organization import Organization
+from logic.Person import Person
+from logic.Room import Room
+
+
+def build(employees=40, rooms=6, seed=0):
+    rng = random.Random(seed)
+    org = Organization(employees=[Person(f"Employee {index}") for index in range(employees)],
+                       rooms=[Room(f"JO{index}.100") for index in range(rooms)])
+    people = org.get_employees()
+    for index in range(employees * 3):
+        start = rng.randint(0, 20)
+        org.book_meeting(Meeting(3, rng.randint(1, 28), start, start + 1, rng.sample(people, 3),
+                                 rng.choice(org.get_rooms()), f"Meeting {index}"))
+    return org
+
+
+def expected(org, month=3):
+    return {name: entity.print_agenda(month)
+            for entity, name in entry_names(org.get_employees(), org.get_rooms())}
+
+
+class TestAgendaReport:
+    """Test AgendaReport"""
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_files_match_print_agenda(self, tmp_path, workers):
+        """Each file holds exactly the entity's print_agenda text"""
+        org = build()
+        summary = AgendaReport(org, workers, chunk_size=7).write_files(3, str(tmp_path))
+
+        agendas = expected(org)
+        assert summary["entities"] == len(agendas) == 46
+        for name, text in agendas.items():
+            with open(os.path.join(tmp_path, name), encoding="utf-8") as stream:
+                assert stream.read() == text
+        assert summary["bytes"] == sum(len(text.encode("utf-8")) for text in agendas.values())
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_archive_in_directory_order(self, tmp_path, workers):
+        """The archive holds every agenda, in directory order"""
+        org = build()
+        path = str(tmp_path / "agendas.zip")
+        org.write_agendas(3, path, archive=True, workers=workers)
+
+        agendas = expected(org)
+        with zipfile.ZipFile(path) as archive:
+            assert archive.namelist() == list(agendas)
+            for name, text in agendas.items():
+                assert archive.read(name).decode("utf-8") == text
+        assert os.listdir(tmp_path) == ["agendas.zip"]
+
+    def test_progress_reported_in_order(self, tmp_path):
+        """Progress is reported after every chunk and ends at the total"""
+        calls = []
+        AgendaReport(build(), workers=2, chunk_size=10,
+                     progress=lambda done, total: calls.append((done, total))).write_files(3, str(tmp_path))
+        assert calls == [(10, 46), (20, 46), (30, 46), (40, 46), (46, 46)]
+
+    def test_entry_names_are_safe_and_unique(self):
+        """Unsafe characters are replaced and duplicate names numbered"""
+        jobs = entry_names([Person("Helen West"), Person("Helen West"), Person("../etc/passwd")], [Room("JO18.330")])
+        assert [name for _, name in jobs] == ["employees/Helen_West.txt", "employees/Helen_West-2.txt",
+                                              "employees/_etc_passwd.txt", "rooms/JO18.330.txt"]
+
+    def test_lazy_calendars_and_forks(self, tmp_path):
+        """Employees without a calendar get an empty agenda, and forks report their own changes"""
+        helen = Person("Helen West")
+        org = Organization(employees=[helen, Person("Mike Smith")], rooms=[])
+        fork = org.fork()
+        fork.book_meeting(Meeting(3, 14, 9, 10, [fork.get_employee("Helen West")], None, "Planning"))
+
+        fork.write_agendas(3, str(tmp_path / "fork"), workers=1)
+        org.write_agendas(3, str(tmp_path / "base"), workers=1)
+        assert "Planning" in (tmp_path / "fork" / "employees" / "Helen_West.txt").read_text()
+        assert (tmp_path / "base" / "employees" / "Helen_West.txt").read_text() == helen.print_agenda(3)
+        assert (tmp_path / "base" / "employees" / "Mike_Smith.txt").read_text() == "No Meetings booked for this month.\n\n"
+
+    def test_invalid_arguments(self):
+        """Workers, chunk size and in-flight tasks must be positive"""
+        with pytest.raises(ValueError):
+            AgendaReport(Organization(), workers=0)
+        with pytest.raises(ValueError):
+            AgendaReport(Organization(), chunk_size=0)
@@ -0,0 +1,109 @@
+"""
+White-Box Tests for utilization analytics
+
+Goal: Verify that UtilizationReport computes room occupancy by hour, weekday
+and building, the weekday x hour heat map and per-employee load percentiles,
+and that the NumPy and pure-Python paths agree.
+"""
+
+import pytest
+
+from logic import Analytics
+from logic.Analytics import UtilizationReport, percentile_summary
+from logic.Meeting import Meeting
+from logic.Organization import Organization
+
+
+def booked_org():
+    org = Organization()
+    helen = org.get_employee("Helen West")
+    mike = org.get_employee("Mike Smith")
+    # 2024-03-04 is a Monday and 2024-03-05 a Tuesday
+    org.book_meeting(Meeting(3, 4, 9, 10, [helen, mike], org.get_room("JO18.330"), "Review"))
+    org.book_meeting(Meeting(3, 5, 9, 9, [helen], org.get_room("ML5.123"), "Stand-up"))
+    return org
+
+
+class TestPercentileSummary:
+    """Test percentile_summary()"""
+
+    def test_linear_interpolation(self):
+        """Percentiles should interpolate between ranks"""
+        summary = percentile_summary([1, 2, 3, 4], (50, 100))
+        assert summary == {"count": 4, "mean": 2.5, "min": 1, "max": 4, "p50": 2.5, "p100": 4}
+
+    def test_empty(self):
+        """An empty sequence should report zeros"""
+        assert percentile_summary([], (50,))["p50"] == 0
+
+
+class TestUtilizationReport:
+    """Test UtilizationReport aggregates"""
+
+    def setup_method(self):
+        self.report = UtilizationReport(booked_org(), year=2024, first_day=(3, 4), last_day=(3, 10),
+                                        use_numpy=False)
+
+    def test_occupancy_by_hour(self):
+        """Hour 9 is booked in two room-days out of 12 rooms x 7 days"""
+        by_hour = self.report.room_occupancy_by_hour()
+        assert by_hour[9] == pytest.approx(2 / 84)
+        assert by_hour[10] == pytest.approx(1 / 84)
+        assert by_hour[8] == 0
+
+    def test_occupancy_by_weekday(self):
+        """Monday has two booked room-hours, Tuesday one"""
+        by_weekday = self.report.room_occupancy_by_weekday()
+        assert by_weekday[0] == pytest.approx(2 / (12 * 24))
+        assert by_weekday[1] == pytest.approx(1 / (12 * 24))
+        assert by_weekday[2:] == [0.0] * 5
+
+    def test_occupancy_by_building(self):
+        """Each building should be measured against its own rooms"""
+        by_building = self.report.room_occupancy_by_building()
+        assert by_building["JO"] == pytest.approx(2 / (6 * 7 * 24))
+        assert by_building["ML"] == pytest.approx(1 / (6 * 7 * 24))
+
+    def test_heat_map(self):
+        """The grid should be 7 x 24 with the Monday 9 o'clock cell set"""
+        grid = self.report.heat_map()
+        assert len(grid) == 7 and all(len(row) == 24 for row in grid)
+        assert grid[0][9] == pytest.approx(1 / 12)
+
+    def test_employee_load(self):
+        """Helen has two meetings, Mike one and everyone else none"""
+        load = self.report.meeting_load((100,))
+        assert load["count"] == 13
+        assert load["max"] == 2 and load["p100"] == 2
+        assert self.report.busy_hours_load()["max"] == 3
+
+    def test_period_excludes_other_days(self):
+        """Meetings outside the period should be ignored"""
+        report = UtilizationReport(booked_org(), year=2024, first_day=(4, 1), last_day=(4, 30),
+                                   use_numpy=False)
+        assert report.meeting_load()["max"] == 0
+
+    def test_organization_shortcut(self):
+        """Organization.utilization should build the same report"""
+        report = booked_org().utilization(2024, (3, 4), (3, 10))
+        assert report.heat_map() == self.report.heat_map()
+
+
+class TestNumpyPath:
+    """Test the NumPy aggregation path"""
+
+    def test_matches_pure_python(self):
+        """Both paths should produce the same aggregates"""
+        pytest.importorskip("numpy")
+        org = booked_org()
+        fast = UtilizationReport(org, 2024, (3, 1), (3, 31), use_numpy=True)
+        slow = UtilizationReport(org, 2024, (3, 1), (3, 31), use_numpy=False)
+        assert fast.heat_map() == slow.heat_map()
+        assert fast.room_occupancy_by_building() == slow.room_occupancy_by_building()
+        assert fast.meeting_load() == pytest.approx(slow.meeting_load())
+
+    def test_forcing_missing_numpy(self, monkeypatch):
+        """Requesting NumPy without it installed should raise ImportError"""
+        monkeypatch.setattr(Analytics, "numpy", None)
+        with pytest.raises(ImportError):
+            UtilizationReport(booked_org(), 2024, use_numpy=True)
@@ -0,0 +1,113 @@
+"""
+White-Box Tests for organization-wide integer IDs and attendee bitsets
+
+Goal: Verify that employees get dense IDs, that meetings keep their attendee
+IDs sorted for fast membership, and that shared attendees and shared meetings
+are answered with bitwise operations.
+"""
+
+import pytest
+from logic.Organization import Organization
+from logic.Person import Person
+from logic.Meeting import Meeting, ids_from_mask
+
+
+class TestEmployeeIds:
+    """Test ID assignment"""
+
+    def test_ids_are_dense(self):
+        """Employees should be numbered 0..n-1 in directory order"""
+        org = Organization()
+
+        assert [person.get_uid() for person in org.get_employees()] == list(range(13))
+        assert org.get_employee_by_uid(5).get_name() == "Helen West"
+
+    def test_added_employee_gets_next_id(self):
+        """add_employee should assign the next free ID"""
+        org = Organization()
+        person = Person("New Hire")
+        org.add_employee(person)
+
+        assert person.get_uid() == 13
+        assert org.get_employee("New Hire") is person
+
+
+    def test_ids_are_read_only_and_kept_across_organizations(self):
+        """A person keeps the ID of the first organization they join"""
+        first = Organization()
+        person = Person("New Hire")
+        first.add_employee(person)
+        with pytest.raises(AttributeError):
+            person.uid = 0
+
+        second = Organization(employees=[Person("Helen West")], rooms=[])
+        second.add_employee(person)
+        assert person.get_uid() == 13
+        assert second.get_employee_by_uid(13) is person
+        assert second.get_employee("Helen West").get_uid() == 0
+
+    def test_conflicting_id_is_refused(self):
+        """An ID already taken by another employee cannot be reused"""
+        first, second = Organization(), Organization()
+        with pytest.raises(ValueError):
+            second.add_employee(first.get_employee("Helen West"))
+        assert len(second.get_employees()) == 13
+
+    def test_ids_are_dense_in_every_organization(self):
+        """Each organization numbers its own people from 0, so bitsets stay small"""
+        Organization()
+        org = Organization(employees=[Person("Helen West"), Person("Mike Smith")], rooms=[])
+        meeting = Meeting(3, 14, 10, 12, org.get_employees())
+
+        assert meeting.get_attendee_mask() == 0b11
+
+
+class TestAttendeeSets:
+    """Test the attendee ID set on Meeting"""
+
+    def test_membership_and_removal(self):
+        """Attendee IDs should follow add_attendee and remove_attendee"""
+        org = Organization()
+        helen, mike, rose = (org.get_employee(name) for name in ["Helen West", "Mike Smith", "Rose Austin"])
+        meeting = Meeting(3, 14, 10, 12, [helen, mike])
+
+        meeting.add_attendee(rose)
+        assert list(meeting.get_attendee_ids()) == [3, 4, 5]
+        meeting.remove_attendee(mike)
+
+        assert meeting.has_attendee(rose)
+        assert not meeting.has_attendee(mike)
+        assert meeting.get_attendees() == [helen, rose]
+        with pytest.raises(ValueError):
+            meeting.remove_attendee(mike)
+
+    def test_people_without_ids_still_work(self):
+        """Attendees outside an organization should fall back to the list"""
+        person = Person("Visitor")
+        meeting = Meeting(3, 14, 10, 12, [person])
+
+        assert meeting.has_attendee(person)
+        meeting.remove_attendee(person)
+        assert meeting.get_attendees() == []
+
+    def test_meeting_keeps_its_attendees(self):
+        """Attendees referenced only by the meeting should still be listed"""
+        meeting = Meeting(3, 4, 9, 10, [Person("Alice"), Person("Bob")])
+
+        assert str(meeting).endswith("Attending: Alice, Bob")
+        assert [person.get_name() for person in meeting.attendees] == ["Alice", "Bob"]
+
+    def test_shared_attendees_and_meetings(self):
+        """Overlaps should be computed from the bitsets"""
+        org = Organization()
+        helen, mike, rose = (org.get_employee(name) for name in ["Helen West", "Mike Smith", "Rose Austin"])
+        first = Meeting(3, 14, 10, 12, [helen, mike], description="First")
+        second = Meeting(3, 15, 10, 12, [helen, mike, rose], description="Second")
+        for meeting in (first, second):
+            for person in meeting.get_attendees():
+                person.add_meeting(meeting)
+
+        assert org.people_from_ids(first.shared_attendee_ids(second)) == [mike, helen]
+        assert org.people_from_mask(second.get_attendee_mask()) == [rose, mike, helen]
+        assert org.shared_meetings(helen, rose) == [second]
+        assert ids_from_mask(0b1010) == [1, 3]
@@ -0,0 +1,133 @@
+"""
+White-Box Tests for memoized availability queries
+
+Goal: Verify that find_free_rooms and find_free_employees answer repeated
+queries from the AvailabilityCache and re-probe exactly the calendars whose
+day version changed.
+"""
+
+import pytest
+
+from logic.AvailabilityCache import AvailabilityCache
+from logic.ConflictException import ConflictsException
+from logic.Meeting import Meeting
+from logic.Organization import Organization
+from logic.Person import Person
+from logic.Room import Room
+
+
+class TestFindFreeEmployees:
+    """Test Organization.find_free_employees()"""
+
+    def setup_method(self):
+        self.org = Organization()
+        self.team = [self.org.get_employee(name) for name in ("Helen West", "Mike Smith", "Rose Austin")]
+
+    def test_repeated_query_is_a_hit(self):
+        """The second identical query should not re-probe anything"""
+        self.team[1].add_meeting(Meeting(3, 14, 10, 11))
+
+        first = self.org.find_free_employees(self.team, 3, 14, 10, 12)
+        second = self.org.find_free_employees(self.team, 3, 14, 10, 12)
+
+        assert first == second == [self.team[0], self.team[2]]
+        assert self.org.availability.stats()["hits"] == 1
+        assert self.org.availability.stats()["reprobed"] == 0
+
+    def test_only_changed_calendars_are_reprobed(self):
+        """A booking should re-probe just the affected calendar"""
+        # Give everyone a calendar first; creating one also counts as a change
+        for person in self.team:
+            person.add_meeting(Meeting(3, 1, 9, 9))
+        self.org.find_free_employees(self.team, 3, 14, 10, 12)
+        self.team[2].add_meeting(Meeting(3, 14, 12, 13))
+        self.team[0].add_meeting(Meeting(3, 15, 10, 11))
+
+        assert self.org.find_free_employees(self.team, 3, 14, 10, 12) == self.team[:2]
+        assert self.org.availability.stats()["reprobed"] == 1
+
+    def test_removal_frees_again(self):
+        """Removing the blocking meeting should be reflected"""
+        self.team[0].add_meeting(Meeting(3, 14, 10, 11))
+        assert self.team[0] not in self.org.find_free_employees(self.team, 3, 14, 10, 12)
+
+        self.team[0].remove_meeting(3, 14, 0)
+
+        assert self.team[0] in self.org.find_free_employees(self.team, 3, 14, 10, 12)
+
+    def test_invalid_times(self):
+        """Invalid values should still raise"""
+        with pytest.raises(ConflictsException):
+            self.org.find_free_employees(self.team, 3, 14, 12, 10)
+
+
+class TestFindFreeRooms:
+    """Test the memoized Organization.find_free_rooms()"""
+
+    def test_booking_invalidates_room(self):
+        """A room booked after the first query should disappear from the answer"""
+        org = Organization()
+        room = org.get_room("ML21.520")
+        assert room in org.find_free_rooms(3, 14, 10, 12)
+
+        room.add_meeting(Meeting(3, 14, 11, 12))
+
+        assert room not in org.find_free_rooms(3, 14, 10, 12)
+        assert org.availability.stats() == {"hits": 1, "misses": 1, "reprobed": 1, "size": 1, "max_size": 1024}
+
+    def test_room_added_later(self):
+        """A room added after the first query is observed once booked"""
+        org = Organization()
+        org.find_free_rooms(3, 4, 9, 10)
+        room = Room("ML9.100")
+        org.add_room(room)
+        assert room in org.find_free_rooms(3, 4, 9, 10)
+
+        room.add_meeting(Meeting(3, 4, 9, 10))
+
+        assert room.is_busy(3, 4, 9, 10)
+        assert room not in org.find_free_rooms(3, 4, 9, 10)
+
+
+class TestUnobservedPeople:
+    """Test find_free_employees() with people outside the organization"""
+
+    def test_outsider_is_validated(self):
+        """A person who is not an employee is re-checked on every query"""
+        org = Organization()
+        guest = Person("Guest Speaker")
+        team = [org.get_employee("Helen West"), guest]
+        assert org.find_free_employees(team, 3, 14, 10, 12) == team
+
+        guest.add_meeting(Meeting(3, 14, 10, 11))
+
+        assert org.find_free_employees(team, 3, 14, 10, 12) == team[:1]
+
+    def test_removed_employee_is_validated(self, tmp_path):
+        """An employee removed by a directory sync is no longer trusted to report changes"""
+        path = tmp_path / "employees.jsonl"
+        path.write_text('{"name": "Helen West"}\n{"name": "Mike Smith"}\n')
+        org = Organization.load(str(path))
+        mike = org.get_employee("Mike Smith")
+        assert org.find_free_employees([mike], 3, 14, 10, 12) == [mike]
+
+        path.write_text('{"name": "Helen West"}\n')
+        org.sync_directory(str(path))
+        mike.add_meeting(Meeting(3, 14, 10, 11))
+
+        assert org.find_free_employees([mike], 3, 14, 10, 12) == []
+
+
+class TestAvailabilityCache:
+    """Test AvailabilityCache eviction"""
+
+    def test_least_recently_used_is_evicted(self):
+        """The cache should stay within max_size"""
+        org = Organization()
+        cache = AvailabilityCache(max_size=2)
+        people = org.get_employees()
+        for hour in (8, 9, 10):
+            cache.free(people, 3, 14, hour, hour)
+
+        assert cache.stats()["size"] == 2
+        assert (3, 14, 8, 8, tuple(people)) not in cache.entries
@@ -0,0 +1,112 @@
+"""
+White-Box Tests for the non-interactive batch planner
+
+Goal: Verify that DSL and JSON command lines parse to the same commands, that
+each command gets one status line (ok, conflict or error), that meetings and
+vacations are booked all or nothing, and that output is written in blocks.
+"""
+
+import io
+import json
+
+import pytest
+
+from logic.BatchPlanner import BatchPlanner, main, parse_command
+from logic.Meeting import Meeting
+from logic.Organization import Organization
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+def statuses(output):
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+class TestParseCommand:
+    """Test parse_command()"""
+
+    def test_dsl_and_json_agree(self):
+        """Both syntaxes should give the same arguments, with defaults filled in"""
+        dsl = parse_command("meeting 3,14,9,10,JO7.221,Helen West; Mike Smith,Planning, part 2")
+        data = parse_command('{"cmd": "meeting", "month": 3, "day": 14, "start": 9, "end": 10, '
+                             '"room": "JO7.221", "attendees": ["Helen West", "Mike Smith"], '
+                             '"description": "Planning, part 2"}')
+        assert dsl == data
+        assert parse_command("meeting 3,14,9,10")[1]["room"] is None
+
+    @pytest.mark.parametrize("line", ["bogus 1", "busy Helen West,3", "meeting x,14,9,10",
+                                      '{"cmd": "busy", "who": "Helen West"}'])
+    def test_invalid_lines(self, line):
+        """Unknown commands, missing arguments and bad values are rejected"""
+        with pytest.raises(ValueError):
+            parse_command(line)
+
+
+class TestBatchPlanner:
+    """Test BatchPlanner.run()"""
+
+    def setup_method(self):
+        self.org = Organization()
+        self.output = io.StringIO()
+        self.planner = BatchPlanner(self.org, self.output)
+
+    def test_status_per_command(self):
+        """Every command gets a status line; comments and blank lines are skipped"""
+        counts = self.planner.run([
+            "# comment",
+            "meeting 3,14,9,10,JO7.221,Helen West;Mike Smith,Planning",
+            "",
+            "meeting 3,14,10,11,,Mike Smith",
+            '{"cmd": "busy", "person": "Helen West", "month": 3, "day": 14, "start": 9, "end": 9}',
+            "agenda -,JO7.221,3,14",
+            "busy Nobody,3,14,9,10",
+        ])
+
+        results = statuses(self.output)
+        assert counts == {"ok": 3, "conflict": 1, "error": 1}
+        assert [(r["line"], r["status"]) for r in results] == \
+               [(2, "ok"), (4, "conflict"), (5, "ok"), (6, "ok"), (7, "error")]
+        assert results[1]["kind"] == "overlap" and "Mike Smith" in results[1]["message"]
+        assert results[2]["result"] is True and "Planning" in results[3]["result"]
+
+    def test_meeting_is_all_or_nothing(self):
+        """A meeting clashing for one attendee is booked for nobody"""
+        self.org.get_employee("Mike Smith").add_meeting(Meeting(3, 14, 9, 10))
+        self.planner.run(["meeting 3,14,9,10,JO7.221,Helen West;Mike Smith"])
+        assert not self.org.get_employee("Helen West").is_busy(3, 14, 9, 10)
+        assert not self.org.get_room("JO7.221").is_busy(3, 14, 9, 10)
+
+    def test_vacation_is_all_or_nothing(self):
+        """A vacation over a booked day blocks no day at all"""
+        self.planner.run(["vacation Helen West,4,10,12", "vacation Helen West,4,1,10"])
+        helen = self.org.get_employee("Helen West")
+        assert [r["status"] for r in statuses(self.output)] == ["ok", "conflict"]
+        assert helen.is_busy(4, 12, 0, 23) and not helen.is_busy(4, 1, 0, 23)
+
+    def test_stop_on_error(self):
+        """Processing stops after the first failed command when asked"""
+        counts = self.planner.run(["bogus", "busy Helen West,3,14,9,10"], stop_on_error=True)
+        assert counts == {"ok": 0, "conflict": 0, "error": 1}
+
+    def test_output_is_buffered(self):
+        """Status lines are written in blocks, not one write per command"""
+        output = CountingStream()
+        BatchPlanner(self.org, output, buffer_lines=100).run(["busy Helen West,3,14,9,10"] * 250)
+        assert output.writes == 3 and len(output.getvalue().splitlines()) == 250
+
+    def test_main(self, tmp_path, capsys):
+        """The command-line entry point reads a file and reports failure in its exit status"""
+        commands = tmp_path / "commands.txt"
+        commands.write_text("free_rooms 3,14,9,10,0,ML\n", encoding="utf-8")
+        assert main([str(commands)]) == 0
+        assert len(json.loads(capsys.readouterr().out)["result"]) == 6
+        commands.write_text("meeting 12,1,9,10\n", encoding="utf-8")
+        assert main([str(commands)]) == 1
@@ -0,0 +1,61 @@
+"""
+White-Box Tests for batched is_busy probing
+
+Goal: Verify that is_busy_many answers every probe exactly like is_busy,
+validates all probes before answering, and can return a bit array.
+"""
+
+import pytest
+
+from logic.Calendar import Calendar
+from logic.ConflictException import ConflictsException
+from logic.Meeting import Meeting
+from logic.Person import Person
+from logic.Room import Room
+
+
+class TestIsBusyMany:
+    """Test Calendar.is_busy_many()"""
+
+    def setup_method(self):
+        self.cal = Calendar()
+        self.cal.add_meeting(Meeting(3, 14, 10, 12))
+        self.cal.add_meeting(Meeting(3, 15, 9, 9))
+
+    def test_matches_is_busy(self):
+        """Every hour of two days should agree with single probes"""
+        probes = [(3, d, h, h + 1) for d in (14, 15) for h in range(0, 22)]
+        assert self.cal.is_busy_many(probes) == [self.cal.is_busy(*probe) for probe in probes]
+
+    def test_placeholder_days_are_busy(self):
+        """Days that do not exist should report busy, as is_busy does"""
+        assert self.cal.is_busy_many([(2, 30, 9, 10)]) == [True]
+
+    def test_bit_array(self):
+        """Bit i should be set when probe i is busy"""
+        probes = [(3, 14, 8, 9), (3, 14, 9, 10), (3, 15, 8, 8), (3, 15, 9, 9)]
+        assert self.cal.is_busy_many(probes, as_bits=True) == 0b1010
+
+    def test_validates_before_answering(self):
+        """One invalid probe should reject the whole batch"""
+        with pytest.raises(ConflictsException) as info:
+            self.cal.is_busy_many([(3, 14, 9, 10), (3, 14, 12, 10)])
+        assert info.value.get_kind() == ConflictsException.BAD_ORDER
+
+    def test_empty(self):
+        """No probes should give no results"""
+        assert self.cal.is_busy_many([]) == []
+        assert self.cal.is_busy_many([], as_bits=True) == 0
+
+
+class TestEntities:
+    """Test Person.is_busy_many() and Room.is_busy_many()"""
+
+    @pytest.mark.parametrize("entity", [Person("Helen West"), Room("ML21.520")])
+    def test_delegates(self, entity):
+        """Entities should answer from their calendar, creating none for reads"""
+        assert entity.is_busy_many([(3, 14, 10, 11)]) == [False]
+        assert entity._calendar is None
+
+        entity.add_meeting(Meeting(3, 14, 10, 11))
+        assert entity.is_busy_many([(3, 14, 10, 11), (3, 14, 12, 13)]) == [True, False]
@@ -0,0 +1,146 @@
+"""
+White-Box Tests for change-log replication
+
+Goal: Verify that calendar mutations emit ordered change records and that a
+replica tailing the log reproduces the leader's calendars.
+"""
+
+import json
+
+import pytest
+
+from logic.Calendar import Calendar
+from logic.ChangeLog import ChangeLog, Replica
+from logic.Organization import Organization
+from logic.Meeting import Meeting
+from logic.Person import Person
+from logic.Room import Room
+
+
+def book(org, description, month, day, start, end, names, room_id):
+    """Books a meeting for the named employees and room"""
+    attendees = [org.get_employee(name) for name in names]
+    room = org.get_room(room_id)
+    meeting = Meeting(month, day, start, end, attendees, room, description)
+    for participant in attendees + [room]:
+        participant.add_meeting(meeting)
+    return meeting
+
+
+class TestCalendarObservers:
+    """Test Calendar.subscribe()"""
+
+    def test_observer_receives_changes(self):
+        """Every mutation should be reported to subscribers"""
+        cal = Calendar()
+        changes = []
+        cal.subscribe(lambda calendar, op, month, day, detail: changes.append((op, month, day)))
+
+        cal.add_meeting(Meeting(6, 15, 10, 12, description="Team Meeting"))
+        cal.remove_meeting(6, 15, 0)
+        cal.clear_schedule(6, 16)
+
+        assert changes == [("add", 6, 15), ("remove", 6, 15), ("clear", 6, 16)]
+
+
+class TestOrganizationObservers:
+    """Test Organization.subscribe()"""
+
+    def test_rooms_added_later_are_watched(self):
+        """A room added after subscribing reports its changes, and unsubscribing still works"""
+        org = Organization()
+        changes = []
+
+        def callback(entity, op, month, day, detail):
+            changes.append((entity, op, month, day))
+
+        org.subscribe(callback)
+        room = Room("ML9.100")
+        org.add_room(room)
+        org.add_employee(Person("New Hire"))
+        room.add_meeting(Meeting(3, 4, 9, 10, [], room, "Budget"))
+        assert changes == [(room, "add", 3, 4)]
+
+        org.unsubscribe(callback)
+        room.add_meeting(Meeting(3, 4, 11, 12, [], room, "Review"))
+        org.get_employee("Helen West").add_meeting(Meeting(3, 5, 9, 10, description="Sync"))
+        assert len(changes) == 1
+
+
+class TestReplication:
+    """Test ChangeLog and Replica"""
+
+    def test_records_are_ordered(self, tmp_path):
+        """Records should be written with increasing sequence numbers"""
+        org = Organization()
+        log = ChangeLog(str(tmp_path / "changes.log"))
+        log.attach(org)
+
+        book(org, "Budget", 3, 14, 10, 12, ["Helen West", "Mike Smith"], "JO18.330")
+        log.close()
+
+        records = [json.loads(line) for line in open(tmp_path / "changes.log")]
+        assert [record["seq"] for record in records] == [1, 2, 3]
+        assert {record["owner"] for record in records} == {"Helen West", "Mike Smith", "JO18.330"}
+
+    def test_replica_follows_leader(self, tmp_path):
+        """A replica should reproduce bookings and removals of the leader"""
+        path = str(tmp_path / "changes.log")
+        leader = Organization()
+        log = ChangeLog(path)
+        log.attach(leader)
+        replica = Replica(path)
+
+        book(leader, "Budget", 3, 14, 10, 12, ["Helen West", "Mike Smith"], "JO18.330")
+        book(leader, "Review", 3, 15, 9, 10, ["Helen West"], "ML5.123")
+        assert replica.poll() == 5
+        leader.get_employee("Helen West").remove_meeting(3, 15, 0)
+        assert replica.poll() == 1
+
+        mirror = replica.get_organization()
+        for name in ["Helen West", "Mike Smith"]:
+            assert mirror.get_employee(name).print_agenda(3) == leader.get_employee(name).print_agenda(3)
+        shared = mirror.get_employee("Helen West").get_meeting(3, 14, 0)
+        assert shared is mirror.get_room("JO18.330").get_meeting(3, 14, 0)
+        assert replica.get_lag()["seq"] == 6
+        assert replica.get_lag()["pending_bytes"] == 0
+
+    def test_unknown_owner_is_retried(self, tmp_path):
+        """A record for an employee the replica lacks stays pending until it can be applied"""
+        path = str(tmp_path / "changes.log")
+        leader = Organization()
+        log = ChangeLog(path)
+        log.attach(leader)
+        replica = Replica(path)
+
+        leader.add_employee(Person("New Hire"), "E42")
+        book(leader, "Onboarding", 3, 14, 10, 12, ["New Hire"], "JO18.330")
+        with pytest.raises(KeyError):
+            replica.poll()
+        assert replica.get_lag()["pending_bytes"] > 0
+
+        replica.get_organization().add_employee(Person("New Hire"), "E42")
+        assert replica.poll() == 2
+        assert replica.get_organization().get_employee("New Hire").is_busy(3, 14, 10, 12)
+        assert replica.get_lag()["pending_bytes"] == 0
+
+    def test_renamed_owner_still_matches(self, tmp_path):
+        """Records identify employees by key, so a rename on the leader does not break the replica"""
+        people = tmp_path / "people.csv"
+        people.write_text("key,name\n1,Helen West\n2,Mike Smith\n")
+        path = str(tmp_path / "changes.log")
+        leader = Organization.load(str(people))
+        log = ChangeLog(path)
+        log.attach(leader)
+        replica = Replica(path, Organization.load(str(people)))
+
+        people.write_text("key,name\n1,Helen East\n2,Mike Smith\n")
+        leader.sync_directory(str(people))
+        helen, mike = leader.get_employee("Helen East"), leader.get_employee("Mike Smith")
+        meeting = Meeting(3, 14, 10, 12, [helen, mike], None, "Budget")
+        helen.add_meeting(meeting)
+        mike.add_meeting(meeting)
+
+        assert replica.poll() == 2
+        mirrored = replica.get_organization().get_employee("Helen West").get_meeting(3, 14, 0)
+        assert [person.get_key() for person in mirrored.get_attendees()] == ["1", "2"]
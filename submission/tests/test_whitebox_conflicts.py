@@ -0,0 +1,76 @@
+"""
+White-Box Tests for structured ConflictsException reports
+
+Goal: Verify that conflicts carry the owner, every conflicting meeting and the
+error kind, and that the message is only rendered when the exception is printed.
+"""
+
+import pytest
+from logic.Calendar import Calendar
+from logic.Person import Person
+from logic.Room import Room
+from logic.Meeting import Meeting
+from logic.ConflictException import ConflictsException
+
+
+class TestConflictFields:
+    """Test the structured fields of a conflict"""
+
+    def test_overlap_reports_every_conflict(self):
+        """All overlapping meetings should be reported, not only the last one"""
+        cal = Calendar()
+        first = Meeting(6, 15, 9, 10, description="First")
+        second = Meeting(6, 15, 12, 14, description="Second")
+        cal.add_meeting(first)
+        cal.add_meeting(second)
+
+        with pytest.raises(ConflictsException) as exc_info:
+            cal.add_meeting(Meeting(6, 15, 10, 12, description="Clash"))
+
+        assert exc_info.value.get_kind() == ConflictsException.OVERLAP
+        assert exc_info.value.get_conflicts() == [first, second]
+        assert "First" in str(exc_info.value)
+        assert "Second" in str(exc_info.value)
+
+    def test_validation_error_kind(self):
+        """Validation errors should carry a kind and no conflicts"""
+        with pytest.raises(ConflictsException) as exc_info:
+            Calendar.check_times(0, 15, 10, 12)
+
+        assert exc_info.value.get_kind() == ConflictsException.INVALID_MONTH
+        assert exc_info.value.get_conflicts() == []
+
+    def test_explicit_message_still_supported(self):
+        """A plain message should be rendered unchanged"""
+        assert str(ConflictsException("Something went wrong")) == "Something went wrong"
+
+
+class TestConflictChaining:
+    """Test that owner conflicts are chained to the calendar conflict"""
+
+    def test_person_conflict_chains_cause(self):
+        """Person conflicts should carry the owner and chain the calendar conflict"""
+        person = Person("Helen West")
+        existing = Meeting(6, 15, 10, 12, description="Existing")
+        person.add_meeting(existing)
+
+        with pytest.raises(ConflictsException) as exc_info:
+            person.add_meeting(Meeting(6, 15, 11, 13, description="New"))
+
+        assert exc_info.value.get_owner() == "Helen West"
+        assert exc_info.value.get_conflicts() == [existing]
+        assert isinstance(exc_info.value.__cause__, ConflictsException)
+        assert exc_info.value.__cause__.get_owner() is None
+
+    def test_room_conflict_message(self):
+        """Room conflicts should render the owner and the overlap"""
+        room = Room("ML21.520")
+        room.add_meeting(Meeting(6, 15, 10, 12, description="Existing"))
+
+        with pytest.raises(ConflictsException) as exc_info:
+            room.add_meeting(Meeting(6, 15, 9, 11, description="New"))
+
+        assert str(exc_info.value) == (
+            "Conflict for room ML21.520:\n"
+            "Overlap with another item - Existing - scheduled from 10 and 12"
+        )
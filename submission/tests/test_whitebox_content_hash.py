@@ -0,0 +1,127 @@
+"""
+White-Box Tests for per-day content hashes
+
+Goal: Verify that day, month and calendar digests depend only on meeting content,
+are recomputed only after a change, and that content_diff descends only into the
+days that differ and returns the minimal add/remove sets.
+"""
+
+from logic.Calendar import Calendar
+from logic.ContentHash import EMPTY_DIGEST, meeting_digest
+from logic.Meeting import Meeting
+from logic.Organization import Organization
+from logic.Person import Person
+from logic.Room import Room
+
+
+def meeting(month=3, day=14, start=9, end=10, attendees=(), room=None, description="Planning"):
+    return Meeting(month, day, start, end, list(attendees), room, description)
+
+
+class TestDigests:
+    """Test day, month and calendar digests"""
+
+    def test_empty_calendars_are_equal(self):
+        """Two empty calendars have the same digest, and empty days the empty digest"""
+        assert Calendar().content_hash() == Calendar().content_hash()
+        assert Calendar().day_hash(3, 14) == EMPTY_DIGEST
+
+    def test_digest_independent_of_identity_and_order(self):
+        """Equal meetings in another order, with attendees in another order, hash the same"""
+        helen, mike = Person("Helen West"), Person("Mike Smith")
+        first, second = Calendar(), Calendar()
+        first.add_meeting(meeting(start=9, end=10, attendees=[helen, mike]))
+        first.add_meeting(meeting(start=11, end=12, description="Review"))
+        second.add_meeting(meeting(start=11, end=12, description="Review"))
+        second.add_meeting(meeting(start=9, end=10, attendees=[Person("Mike Smith"), Person("Helen West")]))
+        assert first.day_hash(3, 14) == second.day_hash(3, 14)
+        assert first.content_hash() == second.content_hash()
+
+    def test_digest_changes_with_content(self):
+        """Changing any field of a meeting changes the digest"""
+        base = meeting()
+        assert meeting_digest(base) == meeting_digest(meeting())
+        for changed in (meeting(start=8), meeting(end=11), meeting(day=15), meeting(description="Other"),
+                        meeting(room=Room("JO18.330")), meeting(attendees=[Person("Helen West")])):
+            assert meeting_digest(changed) != meeting_digest(base)
+
+    def test_emptied_day_matches_untouched(self):
+        """A day whose meetings were removed does not differ from one never used"""
+        calendar = Calendar()
+        calendar.add_meeting(meeting())
+        calendar.remove_meeting(3, 14, 0)
+        assert calendar.content_hash() == Calendar().content_hash()
+
+    def test_digests_cached_until_change(self, monkeypatch):
+        """Unchanged days are not rehashed; a change rehashes only that day"""
+        import logic.Calendar as module
+        calls = []
+        real = module.day_digest
+        monkeypatch.setattr(module, "day_digest", lambda meetings: calls.append(1) or real(meetings))
+
+        calendar = Calendar()
+        calendar.add_meeting(meeting(day=14))
+        calendar.add_meeting(meeting(day=15))
+        before = calendar.content_hash()
+        hashed = len(calls)
+        assert calendar.content_hash() == before
+        assert len(calls) == hashed
+
+        calendar.add_meeting(meeting(day=15, start=12, end=13))
+        assert calendar.content_hash() != before
+        assert len(calls) == hashed + 1
+
+
+class TestContentDiff:
+    """Test Calendar.content_diff and Organization.content_diff"""
+
+    def test_identical_calendars_have_no_diff(self):
+        """Equal calendars produce no changes"""
+        first, second = Calendar(), Calendar()
+        first.add_meeting(meeting())
+        second.add_meeting(meeting())
+        assert first.content_diff(second) == []
+
+    def test_diff_returns_minimal_changes(self):
+        """Only the differing meetings of the differing days are reported"""
+        mine, theirs = Calendar(), Calendar()
+        kept, dropped, new = meeting(start=9, end=10), meeting(start=11, end=12), meeting(start=13, end=14)
+        mine.add_meeting(kept)
+        mine.add_meeting(dropped)
+        mine.add_meeting(meeting(month=5, day=2))
+        theirs.add_meeting(meeting(start=9, end=10))
+        theirs.add_meeting(new)
+        theirs.add_meeting(meeting(month=5, day=2))
+
+        assert mine.content_diff(theirs) == [(3, 14, [new], [dropped])]
+        assert theirs.content_diff(mine) == [(3, 14, [dropped], [new])]
+
+    def test_diff_skips_unchanged_months(self, monkeypatch):
+        """Days of months with equal digests are never compared"""
+        import logic.Calendar as module
+        compared = []
+        real = module.meeting_changes
+        monkeypatch.setattr(module, "meeting_changes",
+                            lambda mine, theirs: compared.append(1) or real(mine, theirs))
+        mine, theirs = Calendar(), Calendar()
+        for month in range(1, 12):
+            mine.add_meeting(meeting(month=month, day=3))
+            theirs.add_meeting(meeting(month=month, day=3))
+        theirs.add_meeting(meeting(month=7, day=4))
+        assert [(month, day) for month, day, _, _ in mine.content_diff(theirs)] == [(7, 4)]
+        assert len(compared) == 1
+
+    def test_organization_diff_by_name_and_room_id(self):
+        """Calendars are paired by employee name and room ID across organizations"""
+        helen, room = Person("Helen West"), Room("JO18.330")
+        ours = Organization(employees=[helen, Person("Mike Smith")], rooms=[room])
+        other_helen, other_room = Person("Helen West"), Room("JO18.330")
+        theirs = Organization(employees=[other_helen, Person("Mike Smith")], rooms=[other_room])
+
+        ours.book_meeting(meeting(attendees=[helen], room=room))
+        theirs.book_meeting(meeting(attendees=[other_helen], room=other_room))
+        assert ours.content_diff(theirs) == []
+
+        extra = meeting(day=20, attendees=[other_helen])
+        theirs.book_meeting(extra)
+        assert ours.content_diff(theirs) == [(helen, 3, 20, [extra], [])]
@@ -0,0 +1,83 @@
+"""
+White-Box Tests for the differential reference-oracle harness
+
+Goal: Verify that the harness replays identical operation sequences against
+several engines, reports no mismatch for equivalent engines, finds and shrinks
+a disagreement to a minimal reproduction, and measures relative speed.
+"""
+
+import random
+
+from logic.Calendar import Calendar
+from logic.Differential import (DifferentialHarness, apply_operation, first_difference,
+                                generate_operations, shrink)
+from logic.Person import Person
+from logic.ReferenceCalendar import ReferenceCalendar
+from logic.Room import Room
+from logic.SqliteCalendar import SqliteCalendar, SqliteStore
+
+
+class IgnoresPlaceholders(Calendar):
+    """An engine with a deliberate bug: Nov 30 is treated as a normal day"""
+
+    def is_busy(self, month, day, start, end):
+        if (month, day) == (11, 30):
+            return any(not (end < m.get_start_time() or start > m.get_end_time())
+                       for m in self.get_meetings(month, day)[1:])
+        return super().is_busy(month, day, start, end)
+
+
+class TestHelpers:
+    """Test generate_operations(), apply_operation(), first_difference() and shrink()"""
+
+    def test_generation_is_deterministic(self):
+        """The same seed should give the same sequence"""
+        assert generate_operations(random.Random(5), 50) == generate_operations(random.Random(5), 50)
+
+    def test_exceptions_compare_by_kind(self):
+        """A Person and a Calendar rejecting the same meeting should give the same outcome"""
+        operation = ("add", 12, 1, 9, 10, "Review")
+        assert apply_operation(Person("Helen West"), operation) == apply_operation(Calendar(), operation)
+        assert apply_operation(Calendar(), operation) == ("error", "ConflictsException", "invalid_month")
+
+    def test_probes_are_validated_in_order(self):
+        """The first invalid probe decides the error, as with the reference"""
+        operation = ("is_busy_many", ((4, 23, 7, 10), (4, 23, 24, 6), (4, 23, 20, 2)))
+        expected = ("error", "ConflictsException", "illegal_hour")
+        assert apply_operation(ReferenceCalendar(), operation) == expected
+        assert apply_operation(Calendar(), operation) == expected
+
+    def test_first_difference(self):
+        """The first differing index, or the shorter length, or None"""
+        assert first_difference([1, 2, 3], [1, 2, 3]) is None
+        assert first_difference([1, 2, 3], [1, 5, 3]) == 1
+        assert first_difference([1, 2], [1, 2, 3]) == 2
+
+    def test_shrink_is_minimal(self):
+        """Only the operations needed for the failure should remain"""
+        assert shrink(list(range(40)), lambda ops: 3 in ops and 27 in ops) == [3, 27]
+
+
+class TestDifferentialHarness:
+    """Test DifferentialHarness"""
+
+    def test_equivalent_engines_agree(self):
+        """Calendar, Person, Room and the SQLite engine behave like the original Calendar"""
+        harness = DifferentialHarness({"calendar": Calendar, "person": Person, "room": lambda: Room("JO1.101"),
+                                       "sqlite": lambda: SqliteCalendar(SqliteStore(), "x")})
+        assert harness.reference is ReferenceCalendar
+        assert harness.run(sequences=15, length=40) == []
+        assert set(harness.relative_speed()) == {"calendar", "person", "room", "sqlite"}
+        assert "0 mismatches" in harness.report()
+
+    def test_finds_and_shrinks_a_bug(self):
+        """A disagreement is reduced to a short sequence that still reproduces it"""
+        harness = DifferentialHarness({"buggy": IgnoresPlaceholders})
+        found = harness.run(sequences=10, length=60)
+
+        assert found and found == harness.mismatches
+        mismatch = found[0]
+        assert mismatch.operations[-1][:3] == ("is_busy", 11, 30)
+        assert len(mismatch.operations) <= 2
+        assert mismatch.expected == ("ok", True) and mismatch.actual == ("ok", False)
+        assert "buggy differs from the reference" in str(mismatch)
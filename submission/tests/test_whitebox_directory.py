@@ -0,0 +1,172 @@
+"""
+White-Box Tests for loading and syncing the directory from files
+
+Goal: Verify that Organization.load builds employees, rooms and their indexes
+from CSV and JSON Lines files, and that sync_directory applies additions,
+removals, renames and room updates in place.
+"""
+
+import json
+
+import pytest
+
+from logic.Directory import read_records, room_attributes
+from logic.Meeting import Meeting
+from logic.Organization import Organization
+
+
+def write_csv(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def write_jsonl(path, records):
+    path.write_text("".join(json.dumps(record) + "\n" for record in records), encoding="utf-8")
+    return str(path)
+
+
+class TestReadRecords:
+    """Test read_records() and room_attributes()"""
+
+    def test_csv_and_jsonl(self, tmp_path):
+        """Both formats should yield one dictionary per record, skipping blank lines"""
+        csv_path = write_csv(tmp_path / "people.csv", ["key,name", "7,Helen West", "", "8,Mike Smith"])
+        jsonl_path = str(tmp_path / "people.jsonl")
+        with open(jsonl_path, "w", encoding="utf-8") as file:
+            file.write('{"key": 7, "name": "Helen West"}\n\n{"key": 8, "name": "Mike Smith"}\n')
+
+        assert list(read_records(csv_path)) == [{"key": "7", "name": "Helen West"},
+                                                {"key": "8", "name": "Mike Smith"}]
+        assert [record["name"] for record in read_records(jsonl_path)] == ["Helen West", "Mike Smith"]
+
+    def test_room_attributes(self):
+        """Features may be a list or a semicolon-separated string"""
+        assert room_attributes({"capacity": "8", "features": "projector; vc"}) == (8, frozenset({"projector", "vc"}), 1)
+        assert room_attributes({"features": ["vc"], "max_bookings": "3"}) == (0, frozenset({"vc"}), 3)
+
+
+class TestLoad:
+    """Test Organization.load()"""
+
+    def test_builds_directory_and_indexes(self, tmp_path):
+        """Employees get dense IDs and rooms are indexed"""
+        people = write_csv(tmp_path / "people.csv", ["key,name", "1,Helen West", "2,Mike Smith"])
+        rooms = write_jsonl(tmp_path / "rooms.jsonl", [{"id": "JO1.101", "capacity": 10, "features": ["vc"]},
+                                                       {"id": "ML2.201"}])
+        org = Organization.load(people, rooms)
+
+        assert [person.get_name() for person in org.get_employees()] == ["Helen West", "Mike Smith"]
+        assert org.get_employee("Mike Smith").get_uid() == 1
+        assert org.get_room("JO1.101").get_capacity() == 10
+        assert org.get_room_candidates(capacity=8, features={"vc"}) == [org.get_room("JO1.101")]
+        with pytest.raises(Exception):
+            org.get_room("JO18.330")
+
+    def test_without_rooms(self, tmp_path):
+        """A missing room file should give an organization without rooms"""
+        org = Organization.load(write_csv(tmp_path / "people.csv", ["name", "Helen West"]))
+        assert org.get_rooms() == []
+
+
+class TestSyncDirectory:
+    """Test Organization.sync_directory()"""
+
+    def setup_method(self):
+        self.people = ["key,name", "1,Helen West", "2,Mike Smith", "3,Rose Austin"]
+        self.rooms = [{"id": "JO1.101", "capacity": 10}, {"id": "JO1.102", "capacity": 4}]
+
+    def test_adds_removes_and_renames(self, tmp_path):
+        """Renamed employees keep their calendar and ID; removed ones stop resolving"""
+        org = Organization.load(write_csv(tmp_path / "people.csv", self.people))
+        helen = org.get_employee("Helen West")
+        helen.add_meeting(Meeting(3, 14, 9, 10))
+
+        summary = org.sync_directory(write_csv(tmp_path / "people.csv",
+                                               ["key,name", "1,Helen East", "3,Rose Austin", "4,Edith Cowan"]))
+
+        assert summary["renamed"] == [helen]
+        assert [person.get_name() for person in summary["added"]] == ["Edith Cowan"]
+        assert [person.get_name() for person in summary["removed"]] == ["Mike Smith"]
+        assert org.get_employee("Helen East") is helen and helen.is_busy(3, 14, 9, 9)
+        assert org.get_employee("Edith Cowan").get_uid() == 3
+        with pytest.raises(Exception):
+            org.get_employee("Mike Smith")
+        with pytest.raises(IndexError):
+            org.get_employee_by_uid(1)
+        assert [person.get_name() for person in org.get_employees()] == ["Helen East", "Rose Austin", "Edith Cowan"]
+
+    def test_rename_refreshes_agendas_and_digests(self, tmp_path):
+        """Cached agendas and digests of days showing a renamed attendee are rebuilt"""
+        org = Organization.load(write_csv(tmp_path / "people.csv", self.people),
+                                write_jsonl(tmp_path / "rooms.jsonl", self.rooms))
+        helen, mike, room = org.get_employee("Helen West"), org.get_employee("Mike Smith"), org.get_room("JO1.101")
+        meeting = Meeting(3, 14, 9, 10, [helen, mike], room, "Budget")
+        assert org.book_meeting(meeting) == {}
+        before = [participant.print_agenda(3, 14) for participant in (helen, mike, room)]
+        digest = mike.view_calendar().day_hash(3, 14)
+
+        org.sync_directory(write_csv(tmp_path / "people.csv", ["key,name", "1,Helen East", "2,Mike Smith",
+                                                               "3,Rose Austin"]))
+
+        for participant, agenda in zip((helen, mike, room), before):
+            assert participant.print_agenda(3, 14) == agenda.replace("Helen West", "Helen East")
+        assert mike.view_calendar().day_hash(3, 14) != digest
+
+    def test_room_updates_and_removals(self, tmp_path):
+        """Changed rooms are re-indexed and removed rooms leave every index"""
+        org = Organization.load(write_csv(tmp_path / "people.csv", self.people),
+                                write_jsonl(tmp_path / "rooms.jsonl", self.rooms))
+        small = org.get_room("JO1.102")
+
+        summary = org.sync_directory(rooms_path=write_jsonl(tmp_path / "rooms.jsonl",
+                                                            [{"id": "JO1.102", "capacity": 12}]))
+
+        assert summary["updated"] == [small] and len(summary["removed"]) == 1
+        assert org.get_room_candidates(capacity=12) == [small]
+        assert org.find_free_rooms_in("JO", 3, 14, 9, 10) == [small]
+
+    def test_max_bookings_update(self, tmp_path):
+        """A changed number of concurrent bookings is an update and applies to the calendar"""
+        org = Organization.load(write_csv(tmp_path / "people.csv", self.people),
+                                write_jsonl(tmp_path / "rooms.jsonl", [{"id": "JO1.102", "capacity": 4}]))
+        room = org.get_room("JO1.102")
+        room.add_meeting(Meeting(3, 14, 9, 10))
+        assert org.find_free_rooms(3, 14, 9, 10) == []
+
+        summary = org.sync_directory(rooms_path=write_jsonl(tmp_path / "rooms.jsonl",
+                                                            [{"id": "JO1.102", "capacity": 4, "max_bookings": 2}]))
+
+        assert summary["updated"] == [room] and room.get_max_bookings() == 2
+        assert org.find_free_rooms(3, 14, 9, 10) == [room]
+        room.add_meeting(Meeting(3, 14, 9, 10))
+        assert room.is_busy(3, 14, 9, 10)
+        assert org.find_free_rooms(3, 14, 9, 10) == []
+
+    def test_duplicate_room_ids(self, tmp_path):
+        """Syncing a directory with a repeated room ID does not fail"""
+        org = Organization.load(write_csv(tmp_path / "people.csv", self.people),
+                                write_jsonl(tmp_path / "rooms.jsonl", [{"id": "JO1.102"}, {"id": "JO1.102"}]))
+
+        summary = org.sync_directory(rooms_path=write_jsonl(tmp_path / "rooms.jsonl",
+                                                            [{"id": "JO1.102", "capacity": 8}]))
+
+        assert len(summary["updated"]) == 1
+        assert len(org.find_free_rooms_in("JO", 3, 14, 9, 10)) == 2
+
+    def test_removed_entities_are_no_longer_watched(self, tmp_path):
+        """Organization observers should detach from removed employees"""
+        org = Organization.load(write_csv(tmp_path / "people.csv", self.people))
+        mike = org.get_employee("Mike Smith")
+        changes = []
+        org.subscribe(lambda entity, op, month, day, detail: changes.append(entity))
+
+        org.sync_directory(write_csv(tmp_path / "people.csv", self.people[:2]))
+        mike.add_meeting(Meeting(3, 14, 9, 10))
+
+        assert changes == []
+
+    def test_fork_cannot_sync(self, tmp_path):
+        """Directory sync is only allowed on the main organization"""
+        org = Organization.load(write_csv(tmp_path / "people.csv", self.people))
+        with pytest.raises(ValueError):
+            org.fork().sync_directory(write_csv(tmp_path / "people.csv", self.people))
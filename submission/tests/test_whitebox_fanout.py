@@ -0,0 +1,85 @@
+"""
+White-Box Tests for the fan-out booking path
+
+Goal: Verify that Organization.book_meeting validates once, books every
+attendee and the room when all are free, and otherwise books nobody and
+returns a per-participant conflict summary.
+"""
+
+import pytest
+from logic.Organization import Organization
+from logic.Meeting import Meeting
+from logic.ConflictException import ConflictsException
+
+
+class TestBookMeeting:
+    """Test Organization.book_meeting()"""
+
+    def test_books_everyone_when_free(self):
+        """All attendees and the room should receive the meeting"""
+        org = Organization()
+        attendees = org.get_employees()[:5]
+        room = org.get_room("ML21.520")
+        meeting = Meeting(3, 14, 9, 10, list(attendees), room, "All hands")
+
+        assert org.book_meeting(meeting) == {}
+
+        for participant in attendees + [room]:
+            assert participant.get_meeting(3, 14, 0) is meeting
+
+    def test_conflicts_book_nobody(self):
+        """One busy attendee should block the whole booking and be reported"""
+        org = Organization()
+        helen = org.get_employee("Helen West")
+        existing = Meeting(3, 14, 9, 9, description="Stand-up")
+        helen.add_meeting(existing)
+        mike = org.get_employee("Mike Smith")
+        meeting = Meeting(3, 14, 9, 10, [helen, mike], None, "All hands")
+
+        summary = org.book_meeting(meeting)
+
+        assert list(summary) == [helen]
+        assert summary[helen].get_kind() == ConflictsException.OVERLAP
+        assert summary[helen].get_conflicts() == [existing]
+        assert mike.is_busy(3, 14, 9, 10) == False
+
+    def test_nonexistent_day_is_reported(self):
+        """A pre-blocked day should show up as an INVALID_DAY conflict"""
+        org = Organization()
+        helen = org.get_employee("Helen West")
+
+        summary = org.book_meeting(Meeting(2, 29, 9, 10, [helen]))
+
+        assert summary[helen].get_kind() == ConflictsException.INVALID_DAY
+
+    def test_invalid_times_raise(self):
+        """Invalid times should be rejected once, before any calendar is checked"""
+        org = Organization()
+
+        with pytest.raises(ConflictsException, match="Illegal hour"):
+            org.book_meeting(Meeting(3, 14, 9, 24, org.get_employees()))
+
+    def test_duplicate_attendee_is_booked_once(self):
+        """A person listed twice should get the meeting once"""
+        org = Organization()
+        helen = org.get_employee("Helen West")
+        meeting = Meeting(3, 14, 9, 10, [helen, helen], org.get_room("ML21.520"), "All hands")
+
+        assert org.book_meeting(meeting) == {}
+
+        assert helen.view_calendar().get_meetings(3, 14) == [meeting]
+
+    def test_fork_books_its_own_calendars(self):
+        """Booking in a fork should leave the base organization untouched until commit"""
+        org = Organization()
+        fork = org.fork()
+        helen, room = org.get_employee("Helen West"), org.get_room("ML21.520")
+        meeting = Meeting(3, 14, 9, 10, [helen], room, "Offsite")
+
+        assert fork.book_meeting(meeting) == {}
+
+        assert not helen.is_busy(3, 14, 9, 10) and not room.is_busy(3, 14, 9, 10)
+        assert fork.get_employee("Helen West").is_busy(3, 14, 9, 10)
+        assert fork.get_room("ML21.520").is_busy(3, 14, 9, 10)
+        fork.commit()
+        assert helen.is_busy(3, 14, 9, 10) and room.is_busy(3, 14, 9, 10)
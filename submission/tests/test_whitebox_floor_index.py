@@ -0,0 +1,76 @@
+"""
+White-Box Tests for the building/floor room index
+
+Goal: Verify that room IDs are parsed into building, floor and number, and
+that locality queries only return free rooms on the requested floors, ranked
+by floor distance from an origin room.
+"""
+
+from logic.Organization import Organization
+from logic.Room import Room, parse_room_id
+from logic.Meeting import Meeting
+
+
+class TestRoomIdParsing:
+    """Test parse_room_id() and the Room accessors"""
+
+    def test_parse_room_id(self):
+        """Building, floor and number should be split out of the ID"""
+        assert parse_room_id("ML21.520") == ("ML", 21, 520)
+        assert parse_room_id("Lobby") == ("", None, None)
+
+    def test_room_accessors(self):
+        """Rooms should expose the parsed parts"""
+        room = Room("JO18.330")
+
+        assert (room.get_building(), room.get_floor(), room.get_number()) == ("JO", 18, 330)
+
+
+class TestFloorQueries:
+    """Test Organization.find_free_rooms_in()"""
+
+    def test_floor_range_filters_rooms(self):
+        """Only rooms of the building on the requested floors should be returned"""
+        org = Organization()
+
+        rooms = org.find_free_rooms_in("ML", 3, 14, 9, 11, floors=(10, 20))
+
+        assert [room.get_id() for room in rooms] == ["ML13.213", "ML13.218", "ML18.330"]
+
+    def test_ranked_by_floor_distance(self):
+        """Rooms closest to the origin's floor should come first"""
+        org = Organization()
+
+        rooms = org.find_free_rooms_in("ML", 3, 14, 9, 11, origin="ML21.310")
+
+        assert [room.get_id() for room in rooms] == [
+            "ML21.310", "ML21.520", "ML18.330", "ML13.213", "ML13.218", "ML5.123"
+        ]
+
+    def test_busy_rooms_are_skipped(self):
+        """Rooms booked during the slot should not be returned"""
+        org = Organization()
+        org.get_room("ML13.213").add_meeting(Meeting(3, 14, 10, 12, description="Taken"))
+
+        rooms = org.find_free_rooms_in("ML", 3, 14, 9, 11, floors=(13, 13))
+
+        assert [room.get_id() for room in rooms] == ["ML13.218"]
+
+    def test_duplicate_room_ids(self):
+        """Two rooms with the same ID can be indexed, listed and removed"""
+        first, second = Room("ML13.213"), Room("ML13.213")
+        org = Organization(employees=[], rooms=[first, second])
+
+        assert org.find_free_rooms_in("ML", 3, 14, 9, 11) == sorted([first, second], key=id)
+
+        org._unindex_room(second)
+        assert org.find_free_rooms_in("ML", 3, 14, 9, 11) == [first]
+
+    def test_origin_without_floor(self):
+        """An origin room whose ID has no floor ranks rooms by floor"""
+        org = Organization()
+        org.add_room(Room("Boardroom"))
+
+        rooms = org.find_free_rooms_in("ML", 3, 14, 9, 11, floors=(10, 20), origin="Boardroom")
+
+        assert [room.get_id() for room in rooms] == ["ML13.213", "ML13.218", "ML18.330"]
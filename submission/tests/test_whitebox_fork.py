@@ -0,0 +1,166 @@
+"""
+White-Box Tests for copy-on-write forks of Calendar and Organization
+
+Goal: Verify that forks share storage until modified, that changes stay
+isolated, and that diff/commit write only the modified days back.
+"""
+
+import pytest
+from logic.Calendar import Calendar
+from logic.Organization import Organization
+from logic.Meeting import Meeting
+from logic.Room import Room
+from logic.ConflictException import ConflictsException
+
+
+class TestCalendarFork:
+    """Test Calendar.fork(), diff() and commit()"""
+
+    def test_fork_shares_days_until_modified(self):
+        """Only the modified day and its month should be copied"""
+        cal = Calendar()
+        cal.add_meeting(Meeting(6, 15, 10, 12, description="Team Meeting"))
+        fork = cal.fork()
+
+        assert fork.occupied[6] is cal.occupied[6]
+        fork.add_meeting(Meeting(6, 16, 10, 12, description="What if"))
+
+        assert fork.occupied[6][15] is cal.occupied[6][15]
+        assert fork.occupied[7] is cal.occupied[7]
+        assert cal.is_busy(6, 16, 10, 12) == False
+        assert fork.is_busy(6, 16, 10, 12) == True
+
+    def test_base_changes_do_not_leak_into_fork(self):
+        """Changing the base after forking should not affect the fork"""
+        cal = Calendar()
+        fork = cal.fork()
+
+        cal.add_meeting(Meeting(6, 15, 10, 12, description="Live"))
+
+        assert fork.print_agenda(6, 15) == "No Meetings booked on this date.\n\n"
+
+    def test_diff_and_commit(self):
+        """diff should list added/removed meetings and commit should apply them"""
+        cal = Calendar()
+        old = Meeting(6, 15, 10, 12, description="Old")
+        cal.add_meeting(old)
+        fork = cal.fork()
+        new = Meeting(6, 15, 14, 15, description="New")
+        fork.remove_meeting(6, 15, 0)
+        fork.add_meeting(new)
+
+        assert fork.diff() == [(6, 15, [new], [old])]
+        fork.commit()
+
+        assert cal.get_meetings(6, 15) == [new]
+        assert "New" in cal.print_agenda(6, 15)
+
+    def test_commit_conflict(self):
+        """Committing a day that also changed in the base should fail"""
+        cal = Calendar()
+        fork = cal.fork()
+        fork.add_meeting(Meeting(6, 15, 10, 12, description="Fork"))
+        cal.add_meeting(Meeting(6, 15, 14, 15, description="Live"))
+
+        with pytest.raises(ConflictsException) as exc_info:
+            fork.commit()
+
+        assert exc_info.value.get_kind() == ConflictsException.FORK_CONFLICT
+
+    def test_fork_of_fork_keeps_edits(self):
+        """Forking a fork should not make it forget the days it changed"""
+        cal = Calendar()
+        first = cal.fork()
+        meeting = Meeting(6, 15, 10, 12, description="First")
+        first.add_meeting(meeting)
+        assert len(first.diff()) == 1
+
+        second = first.fork()
+        second.add_meeting(Meeting(6, 16, 9, 10, description="Second"))
+
+        assert first.diff() == [(6, 15, [meeting], [])]
+        assert len(second.diff()) == 1
+        first.commit()
+        assert cal.get_meetings(6, 15) == [meeting]
+        assert cal.get_meetings(6, 16) == []
+
+
+    def test_bad_date_leaves_no_entries(self):
+        """Removing from a missing month should raise KeyError and create nothing, forked or not"""
+        calendar = Calendar()
+        fork = calendar.fork()
+        for target in (calendar, fork):
+            with pytest.raises(KeyError):
+                target.remove_meeting(13, 27, 2)
+            with pytest.raises(KeyError):
+                target.clear_schedule(13, 27)
+            with pytest.raises(IndexError):
+                target.remove_meeting(3, 14, 0)
+            assert 13 not in target.occupied
+            assert target.get_version(3, 14) == 0
+
+
+class TestOrganizationFork:
+    """Test Organization.fork(), diff() and commit()"""
+
+    def test_fork_isolates_and_commits(self):
+        """Bookings in a forked organization should only reach the base on commit"""
+        org = Organization()
+        fork = org.fork()
+        helen = fork.get_employee("Helen West")
+        room = fork.get_room("ML21.520")
+        meeting = Meeting(3, 14, 10, 12, [helen], room, "Offsite")
+        helen.add_meeting(meeting)
+        room.add_meeting(meeting)
+
+        assert org.get_employee("Helen West").is_busy(3, 14, 10, 12) == False
+        assert len(fork.diff()) == 2
+
+        fork.commit()
+
+        base_helen = org.get_employee("Helen West")
+        assert base_helen.is_busy(3, 14, 10, 12) == True
+        assert org.get_room("ML21.520").is_busy(3, 14, 10, 12) == True
+        assert meeting.get_attendees() == [base_helen]
+        assert meeting.get_room() is org.get_room("ML21.520")
+
+    def test_add_room_to_fork_does_not_touch_base(self):
+        """Directory changes in a fork should not reach the base organization"""
+        org = Organization()
+        fork = org.fork()
+        fork.add_room(Room("ML9.900", 10))
+
+        assert len(fork.get_rooms()) == len(org.get_rooms()) + 1
+        assert fork.find_free_rooms(3, 14, 10, 12, capacity=10)[0].get_id() == "ML9.900"
+        assert org.find_free_rooms(3, 14, 10, 12, capacity=10) == []
+
+    def test_fork_of_forked_organization(self):
+        """A fork of a fork should leave the first fork's changes committable"""
+        org = Organization()
+        fork = org.fork()
+        helen = fork.get_employee("Helen West")
+        helen.add_meeting(Meeting(3, 14, 10, 12, [helen], None, "Offsite"))
+
+        nested = fork.fork()
+        nested.get_employee("Helen West").add_meeting(Meeting(3, 15, 10, 12, description="What if"))
+
+        assert len(fork.diff()) == 1
+        fork.commit()
+        assert org.get_employee("Helen West").is_busy(3, 14, 10, 12) == True
+        assert org.get_employee("Helen West").is_busy(3, 15, 10, 12) == False
+
+    def test_nested_commit_lands_in_parent_fork(self):
+        """Committing a fork of a fork should reach the parent fork, not the base"""
+        org = Organization()
+        fork = org.fork()
+        nested = fork.fork()
+        mike = nested.get_employee("Mike Smith")
+        mike.add_meeting(Meeting(3, 14, 10, 12, [mike], None, "What if"))
+
+        nested.commit()
+
+        assert fork.get_employee("Mike Smith").is_busy(3, 14, 10, 12) == True
+        assert org.get_employee("Mike Smith").is_busy(3, 14, 10, 12) == False
+        fork.commit()
+        assert org.get_employee("Mike Smith").is_busy(3, 14, 10, 12) == True
+        assert org.get_employee("Mike Smith").get_meeting(3, 14, 0).get_attendees() == [org.get_employee("Mike Smith")]
@@ -0,0 +1,79 @@
+"""
+White-Box Tests for the free/busy export
+
+Goal: Verify the per-day busy masks, their run-length and packed encodings,
+and the multi-party intersection of free time.
+"""
+
+from logic.Calendar import Calendar
+from logic.FreeBusy import FreeBusy, common_free_slots, union_busy
+from logic.Person import Person
+from logic.Meeting import Meeting
+
+
+class TestFreeBusyExport:
+    """Test Calendar.free_busy() and its encodings"""
+
+    def test_busy_mask_covers_meeting_hours(self):
+        """A 10-12 meeting should mark hours 10, 11 and 12 as busy"""
+        cal = Calendar()
+        cal.add_meeting(Meeting(6, 15, 10, 12, description="Team Meeting"))
+
+        assert cal.busy_mask(6, 15) == (1 << 10) | (1 << 11) | (1 << 12)
+
+    def test_intervals_merge_adjacent_hours(self):
+        """Consecutive busy hours should be run-length encoded as one interval"""
+        person = Person("Helen West")
+        person.add_meeting(Meeting(6, 15, 9, 10, description="First"))
+        person.add_meeting(Meeting(6, 15, 11, 12, description="Second"))
+        person.add_meeting(Meeting(6, 15, 16, 17, description="Third"))
+
+        view = person.free_busy((6, 1), (6, 30))
+
+        assert view.intervals() == [(6, 15, 9, 12), (6, 15, 16, 17)]
+        assert FreeBusy.from_intervals(view.intervals()) == view
+
+    def test_range_excludes_other_days(self):
+        """Only days inside the range should be exported"""
+        cal = Calendar()
+        cal.add_meeting(Meeting(6, 15, 10, 12, description="Inside"))
+        cal.add_meeting(Meeting(7, 15, 10, 12, description="Outside"))
+
+        assert list(cal.free_busy((6, 1), (6, 30)).masks) == [(6, 15)]
+
+    def test_pack_round_trip(self):
+        """Packed bytes should decode to the same view"""
+        cal = Calendar()
+        cal.add_meeting(Meeting(6, 15, 10, 12, description="Team Meeting"))
+        view = cal.free_busy((6, 1), (6, 30))
+
+        data = view.pack()
+
+        assert len(data) == 6
+        assert FreeBusy.unpack(data) == view
+
+
+class TestGroupAvailability:
+    """Test intersection of several free/busy views"""
+
+    def test_common_free_slots(self):
+        """Only slots free for everyone should be returned"""
+        helen = Person("Helen West")
+        mike = Person("Mike Smith")
+        helen.add_meeting(Meeting(6, 15, 9, 10, description="Helen busy"))
+        mike.add_meeting(Meeting(6, 15, 12, 13, description="Mike busy"))
+        views = [helen.free_busy(), mike.free_busy()]
+
+        slots = common_free_slots(views, 1, [(6, 15)], earliest=9, latest=15)
+
+        assert slots == [(6, 15, 14, 15)]
+        assert union_busy(views).is_free(6, 15, 14, 15)
+
+    def test_common_free_slots_skip_contained_meetings(self):
+        """A slot whose start and end are free but which contains a meeting is not offered"""
+        helen = Person("Helen West")
+        helen.add_meeting(Meeting(6, 15, 11, 12, description="Helen busy"))
+
+        slots = common_free_slots([helen.free_busy()], 3, [(6, 15)], earliest=9, latest=16)
+
+        assert slots == [(6, 15, 13, 16)]
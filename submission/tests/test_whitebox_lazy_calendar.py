@@ -0,0 +1,103 @@
+"""
+White-Box Tests for lazily created calendars
+
+Goal: Verify that Person and Room only create their Calendar on first
+modification, answer read-only calls from the shared empty calendar, and
+attach observers registered before the calendar existed.
+"""
+
+import pytest
+
+from logic.Calendar import Calendar
+from logic.ConflictException import ConflictsException
+from logic.Meeting import Meeting
+from logic.Organization import Organization
+from logic.Person import Person
+from logic.Room import Room
+
+
+class TestLazyCreation:
+    """Test the calendar property of Person and Room"""
+
+    @pytest.mark.parametrize("entity", [Person("Helen West"), Room("ML21.520")])
+    def test_reads_do_not_create_the_calendar(self, entity):
+        """Read-only calls should be answered without a calendar of their own"""
+        assert entity.is_busy(3, 14, 9, 10) is False
+        assert entity.print_agenda(3, 14) == "No Meetings booked on this date.\n\n"
+        assert entity.free_busy() == Calendar().free_busy()
+        assert entity.view_calendar() is Calendar.empty()
+        assert entity._calendar is None
+
+    def test_reads_still_validate(self):
+        """Invalid times should raise as they do on a real calendar"""
+        with pytest.raises(ConflictsException):
+            Person("Helen West").is_busy(13, 1, 9, 10)
+
+    def test_first_write_creates_the_calendar(self):
+        """Adding a meeting should create a private calendar"""
+        person = Person("Helen West")
+        person.add_meeting(Meeting(3, 14, 9, 10))
+
+        assert person.view_calendar() is person.calendar
+        assert person.view_calendar() is not Calendar.empty()
+        assert person.is_busy(3, 14, 9, 9) is True
+        assert Calendar.empty().get_meetings(3, 14) == []
+
+    def test_placeholders_are_shared(self):
+        """Every calendar should block the same non-existent days"""
+        first, second = Calendar(), Calendar()
+        assert first.get_meeting(2, 30, 0) is second.get_meeting(2, 30, 0)
+        first.remove_meeting(2, 30, 0)
+        assert first.get_meetings(2, 30) == [] and len(second.get_meetings(2, 30)) == 1
+
+    def test_new_calendars_share_days_until_written(self):
+        """Creating a calendar copies no day list; the first write copies only that day"""
+        first, second = Calendar(), Calendar()
+        assert first.occupied[3][14] is second.occupied[3][14]
+        assert first.occupied[3] is not second.occupied[3]
+
+        first.add_meeting(Meeting(3, 14, 9, 10))
+        first.clear_schedule(3, 15)
+
+        assert second.get_meetings(3, 14) == [] and Calendar().get_meetings(3, 14) == []
+        assert first.occupied[3][16] is second.occupied[3][16]
+
+
+class TestDeferredObservers:
+    """Test subscribe() before the calendar exists"""
+
+    def test_observer_attached_on_creation(self):
+        """An early subscription should see the first change"""
+        room = Room("ML21.520")
+        changes = []
+        room.subscribe(lambda calendar, op, month, day, detail: changes.append((op, month, day)))
+        assert room._calendar is None
+
+        room.add_meeting(Meeting(3, 14, 9, 10))
+
+        assert changes == [("add", 3, 14)]
+
+    def test_unsubscribe_before_creation(self):
+        """A deferred observer should be removable, and unknown ones rejected"""
+        person = Person("Helen West")
+        changes = []
+        callback = changes.append
+        person.subscribe(callback)
+        person.unsubscribe(callback)
+        with pytest.raises(ValueError):
+            person.unsubscribe(callback)
+
+        person.add_meeting(Meeting(3, 14, 9, 10))
+        assert changes == []
+
+    def test_organization_watch_stays_lazy(self):
+        """Watching an organization should not create any calendar"""
+        org = Organization()
+        subscription = org.watch(flush_window=60)
+        assert all(person._calendar is None for person in org.get_employees())
+
+        helen = org.get_employee("Helen West")
+        helen.add_meeting(Meeting(3, 14, 9, 10))
+        subscription.flush()
+
+        assert [event.get_owner() for event in subscription.poll()] == [helen]
@@ -0,0 +1,148 @@
+"""
+White-Box Tests for the meeting query API
+
+Goal: Verify that Organization.query combines the description, attendee, room
+and date indexes, returns meetings lazily in chronological order, and keeps
+the inverted index up to date as meetings are booked and removed.
+"""
+
+import types
+
+from logic.MeetingIndex import tokenize
+from logic.Meeting import Meeting
+from logic.Organization import Organization
+from logic.Room import Room
+
+
+def book(org, month, day, start, end, names, room_id, description):
+    attendees = [org.get_employee(name) for name in names]
+    room = org.get_room(room_id) if room_id else None
+    meeting = Meeting(month, day, start, end, attendees, room, description)
+    assert org.book_meeting(meeting) == {}
+    return meeting
+
+
+class TestTokenize:
+    """Test tokenize()"""
+
+    def test_lower_cases_and_splits(self):
+        """Punctuation should separate words and case should be ignored"""
+        assert tokenize("Q3 Budget-review, final") == {"q3", "budget", "review", "final"}
+        assert tokenize(None) == set()
+
+
+class TestQuery:
+    """Test Organization.query()"""
+
+    def setup_method(self):
+        self.org = Organization()
+        self.budget = book(self.org, 3, 14, 9, 10, ["Helen West", "Mike Smith"], "JO18.330", "Budget review")
+        self.late = book(self.org, 3, 20, 9, 10, ["Helen West"], "JO7.221", "Budget sign-off")
+        self.ml = book(self.org, 3, 21, 9, 10, ["Helen West"], "ML5.123", "Budget planning")
+        self.april = book(self.org, 4, 2, 9, 10, ["Helen West"], "JO7.221", "Budget review")
+        self.other = book(self.org, 3, 14, 12, 13, ["Mike Smith"], None, "Lunch")
+
+    def test_combined_predicates(self):
+        """Text, attendee, building and date range should all apply"""
+        helen = self.org.get_employee("Helen West")
+        result = self.org.query("budget", attendees=[helen], building="JO",
+                                first_day=(3, 1), last_day=(3, 31))
+
+        assert isinstance(result, types.GeneratorType)
+        assert list(result) == [self.budget, self.late]
+
+    def test_all_words_must_match(self):
+        """Every query word should be required"""
+        assert list(self.org.query("budget review")) == [self.budget, self.april]
+        assert list(self.org.query("budget lunch")) == []
+
+    def test_date_range_only(self):
+        """A date range alone should walk the day index in order"""
+        assert list(self.org.query(first_day=(3, 14), last_day=(3, 14))) == [self.budget, self.other]
+
+    def test_rooms_are_alternatives(self):
+        """A meeting in any of the given rooms should match"""
+        rooms = [self.org.get_room("JO18.330"), self.org.get_room("ML5.123")]
+        assert list(self.org.query(rooms=rooms)) == [self.budget, self.ml]
+
+    def test_unknown_building(self):
+        """A building without rooms should match nothing"""
+        assert list(self.org.query("budget", building="XX")) == []
+
+    def test_index_follows_changes(self):
+        """Bookings and removals after the first query should be reflected"""
+        mike = self.org.get_employee("Mike Smith")
+        assert list(self.org.query(attendees=[mike])) == [self.budget, self.other]
+
+        mike.remove_meeting(3, 14, 1)
+        extra = book(self.org, 5, 1, 9, 9, ["Mike Smith"], None, "Budget retro")
+
+        assert list(self.org.query(attendees=[mike])) == [self.budget, extra]
+        assert list(self.org.query("lunch")) == []
+
+    def test_meeting_stays_while_any_calendar_holds_it(self):
+        """Removing a meeting from one attendee should keep it for the others"""
+        mike = self.org.get_employee("Mike Smith")
+        helen = self.org.get_employee("Helen West")
+        list(self.org.query("review"))
+
+        mike.remove_meeting(3, 14, 0)
+
+        assert list(self.org.query("review", attendees=[helen])) == [self.budget, self.april]
+        assert list(self.org.query("review", attendees=[mike])) == []
+
+
+class TestDirectoryChanges:
+    """Test that the index follows directory changes and forks"""
+
+    def test_room_added_after_first_query(self):
+        """Meetings booked in a room added later are found"""
+        org = Organization()
+        assert list(org.query("budget")) == []
+        org.add_room(Room("ML9.100"))
+        meeting = book(org, 3, 4, 9, 10, ["Helen West"], "ML9.100", "Budget")
+
+        assert list(org.query("budget")) == [meeting]
+        assert list(org.query(rooms=[org.get_room("ML9.100")])) == [meeting]
+
+    def test_removed_room_is_dropped(self, tmp_path):
+        """A room removed by a directory sync no longer contributes meetings"""
+        rooms = tmp_path / "rooms.jsonl"
+        rooms.write_text('{"id": "JO1.100"}\n{"id": "JO2.100"}\n')
+        employees = tmp_path / "employees.jsonl"
+        employees.write_text('{"name": "Helen West"}\n')
+        org = Organization.load(str(employees), str(rooms))
+        room = org.get_room("JO2.100")
+        room.add_meeting(Meeting(3, 4, 9, 10, [], room, "Budget"))
+        assert len(list(org.query("budget"))) == 1
+
+        rooms.write_text('{"id": "JO1.100"}\n')
+        org.sync_directory(rooms_path=str(rooms))
+
+        assert list(org.query("budget")) == []
+
+    def test_fork_indexes_its_own_calendars(self):
+        """A fork's index reads the fork's copies and follows their changes"""
+        org = Organization()
+        base_meeting = book(org, 3, 4, 9, 10, ["Helen West"], None, "Budget")
+        fork = org.fork()
+        helen = fork.get_employee("Helen West")
+        helen.remove_meeting(3, 4, 0)
+        assert list(fork.query("budget")) == []
+
+        what_if = Meeting(3, 5, 9, 10, [helen], None, "Budget what-if")
+        helen.add_meeting(what_if)
+        assert list(fork.query("budget", attendees=[helen])) == [what_if]
+        assert list(org.query("budget")) == [base_meeting]
+
+    def test_fork_copies_made_after_first_query(self):
+        """Copies handed out by a fork after its index was built are followed"""
+        org = Organization()
+        fork = org.fork()
+        assert list(fork.query("budget")) == []
+        helen = fork.get_employee("Helen West")
+        meeting = Meeting(3, 5, 9, 10, [helen], None, "Budget")
+        helen.add_meeting(meeting)
+
+        assert list(fork.query("budget", attendees=[helen])) == [meeting]
+        assert list(org.query("budget")) == []
@@ -0,0 +1,108 @@
+"""
+White-Box Tests for memory footprint accounting
+
+Goal: Verify that MemoryReport breaks memory down by component, counts shared
+meetings and placeholders once, skips calendars that were never created, agrees
+with tracemalloc, and projects usage for another organization size.
+"""
+
+import random
+import sys
+import tracemalloc
+
+import pytest
+
+from logic.Calendar import Calendar
+from logic.Meeting import Meeting
+from logic.MemoryReport import COMPONENTS, MemoryReport
+from logic.Organization import Organization
+from logic.Person import Person
+from logic.Room import Room
+
+
+def build(employees, seed=0):
+    rng = random.Random(seed)
+    org = Organization(employees=[Person(f"Employee {index}") for index in range(employees)], rooms=[])
+    people = org.get_employees()
+    for index in range(employees * 2):
+        start = rng.randint(0, 20)
+        org.book_meeting(Meeting(rng.randint(1, 11), rng.randint(1, 28), start, start + 1,
+                                 rng.sample(people, 3), None, f"Meeting {index}"))
+    return org
+
+
+class TestMemoryReport:
+    """Test MemoryReport"""
+
+    def test_shared_meeting_counted_once(self):
+        """A meeting in two calendars is measured once"""
+        helen, mike = Person("Helen West"), Person("Mike Smith")
+        org = Organization(employees=[helen, mike], rooms=[])
+        meeting = Meeting(3, 14, 9, 10, [helen, mike], None, "Planning")
+        org.book_meeting(meeting)
+        alone = MemoryReport.of(helen)
+
+        report = org.memory_report()
+        assert report.counts == {"employees": 2, "rooms": 0, "calendars": 2, "meetings": 1}
+        assert report.components["attendee_lists"] == alone.components["attendee_lists"]
+        assert report.components["meetings"] == alone.components["meetings"]
+        assert report.components["day_containers"] > alone.components["day_containers"]
+
+    def test_components_and_drivers_add_up(self):
+        """The total is the sum of the components and of the drivers"""
+        report = build(50).memory_report()
+        assert set(report.components) == set(COMPONENTS)
+        assert report.total() == sum(report.drivers.values()) > 0
+        assert report.project() == pytest.approx(report.total(), abs=1)
+        assert "total" in str(report)
+
+    def test_calendar_day_containers(self):
+        """An empty calendar's day containers are its month and day dictionaries and lists"""
+        calendar = Calendar()
+        expected = sys.getsizeof(calendar.occupied) + sum(
+            sys.getsizeof(days) + sum(sys.getsizeof(meetings) for meetings in days.values())
+            for days in calendar.occupied.values())
+        assert MemoryReport.of(calendar).components["day_containers"] == expected
+
+    def test_lazy_calendars_cost_nothing(self):
+        """Employees whose calendar was never created have no calendar memory"""
+        report = MemoryReport.of(Organization(employees=[Person("Helen West")], rooms=[]))
+        assert report.counts["calendars"] == 0 and report.components["day_containers"] == 0
+
+    def test_agrees_with_tracemalloc_and_projects(self):
+        """The walk matches traced allocations, and a projection matches a real larger organization"""
+        tracemalloc.start()
+        try:
+            org = build(200, seed=1)
+            traced = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        small = build(100).memory_report()
+
+        assert org.memory_report().total() == pytest.approx(traced, rel=0.1)
+        assert small.project(employees=200) == pytest.approx(org.memory_report().total(), rel=0.1)
+
+    def test_fork_copies_and_calendar_caches(self):
+        """A fork's copies and calendars, content digests and booking levels are counted"""
+        org = build(20)
+        fork = org.fork()
+        helen = fork.get_employee("Employee 0")
+        helen.add_meeting(Meeting(3, 14, 22, 23, [], None, "Late"))
+        before = fork.memory_report()
+
+        helen.view_calendar().content_hash()
+        after = fork.memory_report()
+        assert after.components["caches"] > before.components["caches"]
+        assert before.counts["employees"] == 20
+        assert before.counts["calendars"] == org.memory_report().counts["calendars"] + 1
+
+        shared = Room("JO1.101", max_bookings=2)
+        shared.add_meeting(Meeting(3, 14, 9, 10))
+        empty = MemoryReport.of(Room("JO1.101", max_bookings=2)).components["caches"]
+        shared.view_calendar().is_busy(3, 14, 9, 10)
+        assert MemoryReport.of(shared).components["caches"] > empty
+
+    def test_unsupported_target(self):
+        """Only model objects can be measured"""
+        with pytest.raises(TypeError):
+            MemoryReport.of([])
@@ -0,0 +1,210 @@
+"""
+White-Box Tests for coalesced change notifications
+
+Goal: Verify that watch() subscriptions coalesce several changes of a day into
+one event per flush window, filter by date range, drop the oldest events when
+the queue is full, and can be consumed with "async for".
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+
+from logic.Calendar import Calendar
+from logic.Meeting import Meeting
+from logic.Organization import Organization
+from logic.Person import Person
+
+
+class TestCoalescing:
+    """Test Subscription.on_change() and flush()"""
+
+    def test_changes_of_a_day_coalesce(self):
+        """Several bookings on one day should become a single event"""
+        cal = Calendar()
+        received = []
+        subscription = cal.watch(callback=received.append, flush_window=60)
+
+        cal.add_meeting(Meeting(3, 14, 9, 9))
+        cal.add_meeting(Meeting(3, 14, 11, 11))
+        cal.add_meeting(Meeting(3, 15, 9, 9))
+        assert received == []
+
+        events = subscription.flush()
+
+        assert received == [events]
+        assert {(e.get_month(), e.get_day()): e.get_count() for e in events} == {(3, 14): 2, (3, 15): 1}
+        assert all(e.get_owner() is cal for e in events)
+
+    def test_window_expiry_flushes_on_next_change(self):
+        """Without an event loop, a change after an expired window starts a new window"""
+        cal = Calendar()
+        subscription = cal.watch(flush_window=0)
+
+        cal.add_meeting(Meeting(3, 14, 9, 9))
+        cal.add_meeting(Meeting(3, 14, 11, 11))
+        time.sleep(0.05)
+
+        assert [e.get_count() for e in subscription.poll()] == [1, 1]
+
+    def test_flush_during_poll_is_not_lost(self):
+        """Events flushed by another thread while poll() empties the queue are kept for the next poll"""
+        cal = Calendar()
+        subscription = cal.watch(flush_window=60)
+        cal.add_meeting(Meeting(3, 14, 9, 9))
+        subscription.flush()
+        cal.add_meeting(Meeting(3, 15, 9, 9))
+        flusher = threading.Thread(target=subscription.flush)
+
+        class FlushBeforeClear(deque):
+            def clear(self):
+                if flusher.ident is None:
+                    flusher.start()
+                    flusher.join(0.1)
+                super().clear()
+
+        subscription.queue = FlushBeforeClear(subscription.queue, maxlen=subscription.queue.maxlen)
+        first = subscription.poll()
+        flusher.join()
+
+        assert [e.get_day() for e in first + subscription.poll()] == [14, 15]
+
+    def test_timer_flushes_without_event_loop(self):
+        """A single change is delivered once its window ends, without another change"""
+        cal = Calendar()
+        received = []
+        subscription = cal.watch(callback=received.append, flush_window=0.01)
+
+        cal.add_meeting(Meeting(3, 14, 9, 9))
+        deadline = time.monotonic() + 1
+        while not received and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert [e.get_day() for e in subscription.poll()] == [14]
+        assert len(received) == 1
+        subscription.close()
+
+    def test_callback_errors_do_not_reach_booking(self):
+        """A failing callback is counted and the booking still succeeds"""
+        cal = Calendar()
+
+        def fail(events):
+            raise ValueError("consumer bug")
+
+        subscription = cal.watch(callback=fail, flush_window=60)
+        cal.add_meeting(Meeting(3, 14, 9, 9))
+        subscription.flush()
+        cal.add_meeting(Meeting(3, 15, 9, 9))
+
+        assert subscription.errors == 1 and isinstance(subscription.last_error, ValueError)
+        assert len(subscription.poll()) == 1
+        subscription.close()
+
+    def test_date_range_filter(self):
+        """Changes outside the watched range should be ignored"""
+        person = Person("Helen West")
+        subscription = person.watch(first_day=(3, 1), last_day=(3, 31), flush_window=60)
+
+        person.add_meeting(Meeting(2, 28, 9, 9))
+        person.add_meeting(Meeting(3, 14, 9, 9))
+        person.add_meeting(Meeting(4, 1, 9, 9))
+        subscription.flush()
+
+        events = subscription.poll()
+        assert [(e.get_month(), e.get_day()) for e in events] == [(3, 14)]
+        assert events[0].get_owner() is person
+
+    def test_full_queue_drops_oldest(self):
+        """A slow consumer should lose the oldest events, counted in dropped"""
+        cal = Calendar()
+        subscription = cal.watch(max_queue=2, flush_window=60)
+
+        for day in (1, 2, 3):
+            cal.add_meeting(Meeting(3, day, 9, 9))
+            subscription.flush()
+
+        assert [e.get_day() for e in subscription.poll()] == [2, 3]
+        assert subscription.dropped == 1
+
+    def test_close_unsubscribes(self):
+        """No events should be recorded after close()"""
+        cal = Calendar()
+        subscription = cal.watch(flush_window=60)
+        subscription.close()
+
+        cal.add_meeting(Meeting(3, 14, 9, 9))
+        subscription.flush()
+
+        assert subscription.poll() == []
+
+
+class TestAsyncStream:
+    """Test consuming a Subscription with async for"""
+
+    def test_async_for(self):
+        """Events should be yielded until the subscription is closed and drained"""
+        cal = Calendar()
+        subscription = cal.watch(flush_window=0.01)
+
+        async def consume():
+            seen = []
+            async for event in subscription:
+                seen.append((event.get_month(), event.get_day(), event.get_count()))
+                if len(seen) == 2:
+                    subscription.close()
+            return seen
+
+        async def produce():
+            cal.add_meeting(Meeting(3, 14, 9, 9))
+            cal.add_meeting(Meeting(3, 14, 11, 11))
+            await asyncio.sleep(0.05)
+            cal.add_meeting(Meeting(3, 15, 9, 9))
+
+        async def main():
+            consumer = asyncio.ensure_future(consume())
+            await produce()
+            return await asyncio.wait_for(consumer, 1)
+
+        assert asyncio.run(main()) == [(3, 14, 2), (3, 15, 1)]
+
+    def test_closed_loop_does_not_break_booking(self):
+        """After the consuming loop is closed, changes are still booked and queued"""
+        cal = Calendar()
+        subscription = cal.watch(flush_window=60)
+
+        async def produce():
+            await asyncio.sleep(0.01)
+            cal.add_meeting(Meeting(3, 14, 9, 9))
+            subscription.flush()
+
+        async def consume_one():
+            producer = asyncio.ensure_future(produce())
+            async for event in subscription:
+                await producer
+                return event.get_day()
+
+        assert asyncio.run(consume_one()) == 14
+        cal.add_meeting(Meeting(3, 15, 9, 9))
+        subscription.flush()
+
+        assert len(cal.get_meetings(3, 15)) == 1
+        assert [e.get_day() for e in subscription.poll()] == [15]
+        subscription.close()
+
+
+class TestOrganizationWatch:
+    """Test Organization.watch()"""
+
+    def test_watches_employees_and_rooms(self):
+        """Bookings on any employee or room should be reported per calendar"""
+        org = Organization()
+        helen = org.get_employee("Helen West")
+        room = org.get_room("ML21.520")
+        subscription = org.watch(flush_window=60)
+
+        org.book_meeting(Meeting(3, 14, 9, 10, [helen], room, "Review"))
+        subscription.flush()
+
+        owners = {e.get_owner() for e in subscription.poll()}
+        assert owners == {helen, room}
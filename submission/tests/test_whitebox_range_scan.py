@@ -0,0 +1,89 @@
+"""
+White-Box Tests for chronological range scans
+
+Goal: Verify that Calendar.iter_range returns meetings ordered by date and
+start time between two points, honours the limit, skips placeholders, and
+keeps its day index and per-day order up to date as meetings change.
+"""
+
+import pytest
+
+from logic.Calendar import Calendar
+from logic.Meeting import Meeting
+from logic.SharedCalendar import SharedCalendar
+
+
+def times(meetings):
+    return [(m.get_month(), m.get_day(), m.get_start_time()) for m in meetings]
+
+
+class TestIterRange:
+    """Test Calendar.iter_range()"""
+
+    def setup_method(self):
+        self.cal = Calendar()
+        # Booked out of order on purpose
+        for month, day, start in [(3, 14, 15), (3, 14, 9), (1, 5, 10), (3, 14, 12), (6, 1, 8)]:
+            self.cal.add_meeting(Meeting(month, day, start, start + 1))
+
+    def test_whole_year_in_order(self):
+        """Meetings should come back sorted by date and start time, without placeholders"""
+        assert times(self.cal.iter_range()) == [(1, 5, 10), (3, 14, 9), (3, 14, 12), (3, 14, 15), (6, 1, 8)]
+
+    def test_hour_bounds(self):
+        """The first and last points should cut within a day"""
+        result = self.cal.iter_range((3, 14, 10), (3, 14, 12))
+        assert times(result) == [(3, 14, 12)]
+
+    def test_paging_with_limit(self):
+        """A limit and a resumed start point should page through the schedule"""
+        page = list(self.cal.iter_range(limit=2))
+        assert times(page) == [(1, 5, 10), (3, 14, 9)]
+
+        last = page[-1]
+        resume = (last.get_month(), last.get_day(), last.get_start_time() + 1)
+        assert times(self.cal.iter_range(resume, limit=2)) == [(3, 14, 12), (3, 14, 15)]
+
+    def test_paging_with_cursor_keeps_shared_start_hours(self):
+        """Meetings starting at the same hour should each be returned once across pages"""
+        room = SharedCalendar(2)
+        for start, end, description in [(9, 10, "a"), (9, 11, "b"), (12, 13, "c")]:
+            room.add_meeting(Meeting(3, 14, start, end, description=description))
+
+        seen, first = [], (1, 1, 0)
+        while True:
+            page = list(room.iter_range(first, limit=1))
+            if not page:
+                break
+            seen += [meeting.get_description() for meeting in page]
+            first = room.range_cursor(page[-1])
+
+        assert seen == ["a", "b", "c"]
+        assert room.range_cursor(room.get_meeting(3, 14, 1)) == (3, 14, 9, 2)
+        with pytest.raises(ValueError):
+            room.range_cursor(Meeting(3, 14, 9, 10))
+
+    def test_follows_changes(self):
+        """Added, removed and cleared days should be reflected after the index is built"""
+        list(self.cal.iter_range())
+
+        self.cal.add_meeting(Meeting(2, 2, 7, 8))
+        self.cal.add_meeting(Meeting(3, 14, 5, 6))
+        self.cal.clear_schedule(6, 1)
+        self.cal.remove_meeting(1, 5, 0)
+
+        assert times(self.cal.iter_range()) == [(2, 2, 7), (3, 14, 5), (3, 14, 9), (3, 14, 12), (3, 14, 15)]
+        assert self.cal._day_index == [(2, 2), (3, 14)]
+
+    def test_fork_builds_its_own_index(self):
+        """A fork's edits should not show up in the base calendar's scan"""
+        list(self.cal.iter_range())
+        fork = self.cal.fork()
+        fork.add_meeting(Meeting(2, 2, 7, 8))
+
+        assert (2, 2, 7) in times(fork.iter_range())
+        assert (2, 2, 7) not in times(self.cal.iter_range())
+
+    def test_empty_calendar(self):
+        """Only placeholders should yield nothing"""
+        assert list(Calendar().iter_range()) == []
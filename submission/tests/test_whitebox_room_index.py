@@ -0,0 +1,82 @@
+"""
+White-Box Tests for the Organization room index
+
+Goal: Verify that rooms carry capacity and features, and that the organization
+selects the best fitting free room using its building/capacity/feature index.
+"""
+
+import pytest
+from logic.Organization import Organization
+from logic.Room import Room
+from logic.Meeting import Meeting
+from logic.ConflictException import ConflictsException
+
+
+def build_org():
+    """Organization with a few extra rooms that carry capacity and features"""
+    org = Organization()
+    org.add_room(Room("ML1.100", 6, {"projector"}))
+    org.add_room(Room("ML2.200", 14, {"projector", "whiteboard"}))
+    org.add_room(Room("ML3.300", 40, {"projector"}))
+    org.add_room(Room("JO4.400", 12, {"projector"}))
+    return org
+
+
+class TestRoomAttributes:
+    """Test the new Room attributes"""
+
+    def test_room_defaults(self):
+        """Rooms without attributes should have no capacity and no features"""
+        room = Room("JO18.330")
+
+        assert room.get_capacity() == 0
+        assert room.get_features() == frozenset()
+        assert room.get_building() == "JO"
+
+    def test_building_of_unparseable_id(self):
+        """IDs that do not follow the pattern have no building"""
+        assert Room("Lobby").get_building() == ""
+
+
+class TestRoomSelection:
+    """Test find_free_rooms() and book_room()"""
+
+    def test_find_free_rooms_best_fit_first(self):
+        """Qualifying rooms should be ordered by smallest fitting capacity"""
+        org = build_org()
+
+        rooms = org.find_free_rooms(3, 14, 9, 11, capacity=12, features={"projector"}, building="ML")
+
+        assert [room.get_id() for room in rooms] == ["ML2.200", "ML3.300"]
+
+    def test_book_room_skips_busy_rooms(self):
+        """Booking should pick the next best room if the best one is busy"""
+        org = build_org()
+        org.get_room("ML2.200").add_meeting(Meeting(3, 14, 9, 10, description="Taken"))
+        meeting = Meeting(3, 14, 9, 11, description="Planning")
+
+        room = org.book_room(meeting, capacity=12, features={"projector"}, building="ML")
+
+        assert room.get_id() == "ML3.300"
+        assert meeting.get_room() is room
+        assert room.is_busy(3, 14, 9, 11)
+
+    def test_book_room_falls_through_refused_rooms(self, monkeypatch):
+        """A room that refuses the meeting after the search should not end the booking"""
+        org = build_org()
+        busy, free = org.get_room("ML2.200"), org.get_room("ML3.300")
+        busy.add_meeting(Meeting(3, 14, 9, 10, description="Taken"))
+        monkeypatch.setattr(org, "find_free_rooms", lambda *args: [busy, free])
+        meeting = Meeting(3, 14, 9, 11, description="Planning")
+
+        assert org.book_room(meeting) is free
+        assert meeting.get_room() is free and len(busy.calendar.get_meetings(3, 14)) == 1
+
+    def test_book_room_without_match_raises(self):
+        """No qualifying room should raise a NO_ROOM conflict"""
+        org = build_org()
+
+        with pytest.raises(ConflictsException) as exc_info:
+            org.book_room(Meeting(3, 14, 9, 11), capacity=100)
+
+        assert exc_info.value.get_kind() == ConflictsException.NO_ROOM
@@ -0,0 +1,107 @@
+"""
+White-Box Tests for the batch Scheduler
+
+Goal: Verify that batches of meeting requests are placed into free slots, that
+unplaceable requests are reported, and that backtracking can make room.
+"""
+
+from logic.Meeting import Meeting
+from logic.Organization import Organization
+from logic.Scheduler import MeetingRequest, valid_days
+
+
+class TestValidDays:
+    """Test the valid_days() helper"""
+
+    def test_valid_days_skips_rejected_dates(self):
+        """Dates rejected by check_times should not be offered"""
+        days = valid_days((3, 29), (4, 2))
+
+        assert days == [(3, 29), (3, 30), (4, 1), (4, 2)]
+
+
+class TestScheduleBatch:
+    """Test Organization.schedule_batch()"""
+
+    def test_places_requests_without_overlap(self):
+        """Requests sharing an attendee should land in different slots"""
+        org = Organization()
+        helen = org.get_employee("Helen West")
+        mike = org.get_employee("Mike Smith")
+        first = MeetingRequest([helen, mike], 2, (3, 14), earliest=9, latest=17, description="First")
+        second = MeetingRequest([helen], 1, (3, 14), earliest=9, latest=17, description="Second")
+
+        result = org.schedule_batch([first, second])
+
+        assert result.get_unplaced() == {}
+        meetings = [result.get_placements()[first], result.get_placements()[second]]
+        assert meetings[0].get_room() is not None
+        assert len(helen.calendar.get_meetings(3, 14)) == 2
+        assert not (meetings[1].get_start_time() <= meetings[0].get_end_time()
+                    and meetings[0].get_start_time() <= meetings[1].get_end_time())
+
+    def test_reports_unplaceable_request(self):
+        """A request that cannot fit in its window should be reported with a reason"""
+        org = Organization()
+        helen = org.get_employee("Helen West")
+        request = MeetingRequest([helen], 2, (3, 14), earliest=9, latest=10)
+
+        result = org.schedule_batch([request])
+
+        assert request in result.get_unplaced()
+        assert result.get_placements() == {}
+
+    def test_invalid_window_is_unplaced(self):
+        """A window with no valid day should be reported, not raised"""
+        org = Organization()
+        request = MeetingRequest([org.get_employee("Helen West")], 1, (12, 1), needs_room=False)
+
+        result = org.schedule_batch([request])
+
+        assert "Day does not exist" in result.get_unplaced()[request]
+
+    def test_backtracking_moves_earlier_placement(self):
+        """A flexible placement should move to make room for a fixed request"""
+        org = Organization()
+        helen = org.get_employee("Helen West")
+        mike = org.get_employee("Mike Smith")
+        # Ordered first (more attendees), takes 9-10 although it could use 12-13
+        flexible = MeetingRequest([helen, mike], 1, (3, 14), earliest=9, latest=13, needs_room=False)
+        # Only fits at 9-10
+        fixed = MeetingRequest([helen], 1, (3, 14), earliest=9, latest=10, needs_room=False)
+
+        result = org.schedule_batch([flexible, fixed])
+
+        assert result.get_unplaced() == {}
+        assert result.get_placements()[fixed].get_start_time() == 9
+        assert result.get_placements()[flexible].get_start_time() > 10
+        assert len(helen.calendar.get_meetings(3, 14)) == 2
+
+    def test_slot_containing_a_meeting_is_busy(self):
+        """A slot that fully contains an existing meeting should not be used"""
+        org = Organization()
+        helen = org.get_employee("Helen West")
+        helen.add_meeting(Meeting(3, 14, 11, 11, [helen], None, "Stand-up"))
+        request = MeetingRequest([helen], 4, (3, 14), earliest=9, latest=17, needs_room=False)
+
+        result = org.schedule_batch([request])
+
+        assert result.get_placements()[request].get_start_time() == 12
+
+    def test_backtracking_only_moves_conflicting_meetings(self):
+        """A placement that does not block the request should not use up a backtrack"""
+        org = Organization()
+        helen = org.get_employee("Helen West")
+        mike = org.get_employee("Mike Smith")
+        others = [person for person in org.get_employees() if person not in (helen, mike)][:3]
+        # Placed first (most attendees), in a room, but outside the fixed request's hours
+        unrelated = MeetingRequest(others, 1, (3, 14), earliest=15, latest=17)
+        flexible = MeetingRequest([helen, mike], 1, (3, 14), earliest=9, latest=13, needs_room=False)
+        fixed = MeetingRequest([helen], 1, (3, 14), earliest=9, latest=10)
+
+        result = org.schedule_batch([unrelated, flexible, fixed], max_backtracks=1)
+
+        assert result.get_unplaced() == {}
+        assert result.get_placements()[fixed].get_start_time() == 9
+        assert result.get_placements()[unrelated].get_start_time() == 15
+        assert result.backtracks == 1
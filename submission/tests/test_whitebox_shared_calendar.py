@@ -0,0 +1,162 @@
+"""
+White-Box Tests for multi-occupancy (shared space) calendars
+
+Goal: Verify that a SharedCalendar accepts up to max_concurrent overlapping
+bookings per hour, that its occupancy levels match a brute-force count through
+adds, removals and forks, and that ordinary rooms keep strict single booking.
+"""
+
+import random
+
+import pytest
+
+from logic.Calendar import Calendar
+from logic.ConflictException import ConflictsException
+from logic.Directory import room_from_record
+from logic.Meeting import Meeting
+from logic.Organization import Organization
+from logic.Room import Room
+from logic.SharedCalendar import SharedCalendar
+from logic.SqliteCalendar import SqliteStore
+
+
+def brute_counts(calendar, month, day):
+    counts = [0] * 24
+    for meeting in calendar.get_meetings(month, day):
+        for hour in range(meeting.get_start_time(), meeting.get_end_time() + 1):
+            counts[hour] += 1
+    return counts
+
+
+class TestSharedCalendar:
+    """Test SharedCalendar"""
+
+    def test_allows_n_concurrent_bookings(self):
+        """The third overlapping booking of a two-seat lab is rejected with the blockers"""
+        calendar = SharedCalendar(2)
+        first, second, morning = Meeting(3, 14, 13, 15), Meeting(3, 14, 14, 16), Meeting(3, 14, 9, 12)
+        for meeting in (first, second, morning):
+            calendar.add_meeting(meeting)
+
+        with pytest.raises(ConflictsException) as error:
+            calendar.add_meeting(Meeting(3, 14, 12, 17))
+        assert error.value.get_conflicts() == [first, second]
+        calendar.add_meeting(Meeting(3, 14, 10, 13))
+        assert calendar.max_occupancy(3, 14, 13, 15) == 2 and calendar.max_occupancy(3, 14, 17, 20) == 0
+        assert calendar.is_busy(3, 14, 14, 15) and not calendar.is_busy(3, 14, 16, 18)
+        assert calendar.is_busy_many([(3, 14, 10, 18), (3, 14, 16, 18)]) == [True, False]
+
+    def test_containment_is_detected(self):
+        """Unlike strict mode, a meeting spanning a full hour is rejected"""
+        calendar = SharedCalendar(1)
+        calendar.add_meeting(Meeting(3, 14, 12, 12))
+        with pytest.raises(ConflictsException):
+            calendar.add_meeting(Meeting(3, 14, 10, 14))
+
+    def test_days_that_do_not_exist(self):
+        """Placeholder days stay unbookable"""
+        calendar = SharedCalendar(5)
+        with pytest.raises(ConflictsException) as error:
+            calendar.add_meeting(Meeting(2, 30, 9, 10))
+        assert error.value.get_kind() == ConflictsException.INVALID_DAY
+        assert calendar.busy_mask(2, 30) == (1 << 24) - 1
+
+    def test_levels_match_brute_force(self):
+        """Random adds and removals keep the occupancy equal to a direct count"""
+        rng = random.Random(7)
+        calendar = SharedCalendar(3)
+        for _ in range(300):
+            if rng.random() < 0.3 and calendar.get_meetings(5, 6):
+                calendar.remove_meeting(5, 6, rng.randrange(len(calendar.get_meetings(5, 6))))
+            else:
+                start = rng.randint(0, 22)
+                try:
+                    calendar.add_meeting(Meeting(5, 6, start, rng.randint(start, 23)))
+                except ConflictsException:
+                    pass
+            counts = brute_counts(calendar, 5, 6)
+            assert calendar.occupancy(5, 6) == counts and max(counts) <= 3
+            start = rng.randint(0, 23)
+            end = rng.randint(start, 23)
+            assert calendar.max_occupancy(5, 6, start, end) == max(counts[start:end + 1])
+
+    def test_fork_keeps_mode(self):
+        """A fork accepts the same number of bookings and has its own levels"""
+        calendar = SharedCalendar(2)
+        calendar.add_meeting(Meeting(3, 14, 9, 10))
+        fork = calendar.fork()
+        fork.add_meeting(Meeting(3, 14, 9, 10))
+        assert isinstance(fork, SharedCalendar) and fork.max_occupancy(3, 14, 9, 10) == 2
+        assert calendar.max_occupancy(3, 14, 9, 10) == 1
+
+    def test_rejects_zero(self):
+        """At least one booking must fit"""
+        with pytest.raises(ValueError):
+            SharedCalendar(0)
+
+
+class TestSharedRooms:
+    """Test rooms with max_bookings"""
+
+    def test_strict_by_default(self):
+        """Ordinary rooms still use the strict Calendar"""
+        room = Room("JO1.101")
+        room.add_meeting(Meeting(3, 14, 9, 10))
+        assert type(room.calendar) is Calendar
+        with pytest.raises(ConflictsException):
+            room.add_meeting(Meeting(3, 14, 9, 10))
+
+    def test_shared_room_in_organization(self):
+        """A shared room stays free in searches and bookings until it is full"""
+        lab = room_from_record({"id": "ML2.010", "max_bookings": 2})
+        org = Organization(rooms=[lab])
+        assert lab.get_max_bookings() == 2
+
+        for name in ("Helen West", "Mike Smith"):
+            assert org.find_free_rooms(3, 14, 9, 10) == [lab]
+            assert org.book_meeting(Meeting(3, 14, 9, 10, [org.get_employee(name)], lab)) == {}
+        assert org.find_free_rooms(3, 14, 9, 10) == []
+        assert lab.is_busy(3, 14, 10, 11) and not lab.is_busy(3, 14, 11, 12)
+
+    def test_search_rejects_any_full_hour(self):
+        """A lab full at 10-11 is not offered for 9-12, so booking takes the next room"""
+        lab = room_from_record({"id": "ML2.010", "max_bookings": 2})
+        office = Room("ML2.100")
+        org = Organization(rooms=[lab, office])
+        for _ in range(2):
+            lab.add_meeting(Meeting(3, 4, 10, 11))
+
+        assert lab.is_busy(3, 4, 9, 12)
+        assert org.find_free_rooms(3, 4, 9, 12) == [office]
+        assert org.book_room(Meeting(3, 4, 9, 12)) is office
+
+    def test_changed_max_bookings_refreshes_searches(self):
+        """Raising or lowering max_bookings switches the calendar's mode and cached room searches"""
+        room = Room("JO1.101")
+        org = Organization(rooms=[room])
+        room.add_meeting(Meeting(3, 14, 9, 10))
+        calendar = room.calendar
+        assert org.find_free_rooms(3, 14, 9, 10) == []
+
+        room.set_max_bookings(3)
+        assert room.calendar is calendar and type(calendar) is Calendar and calendar.max_concurrent == 3
+        assert not room.is_busy(3, 14, 9, 10)
+        assert org.find_free_rooms(3, 14, 9, 10) == [room]
+
+        room.set_max_bookings(1)
+        assert calendar.max_concurrent is None and room.is_busy(3, 14, 10, 11)
+        assert org.find_free_rooms(3, 14, 9, 10) == []
+
+    def test_shared_room_with_calendar_factory_is_refused(self):
+        """Stored calendars cannot hold shared rooms, so the setting is not silently dropped"""
+        store = SqliteStore()
+        org = Organization(employees=[], rooms=[Room("JO1.100")], calendar_factory=store.calendar_for)
+
+        with pytest.raises(ValueError):
+            org.add_room(Room("LAB1.100", max_bookings=3))
+        with pytest.raises(ValueError):
+            org.get_room("JO1.100").set_max_bookings(2)
+        with pytest.raises(ValueError):
+            Organization(employees=[], rooms=[Room("LAB1.100", max_bookings=3)],
+                         calendar_factory=store.calendar_for)
+        assert [room.get_id() for room in org.get_rooms()] == ["JO1.100"]
@@ -0,0 +1,184 @@
+"""
+White-Box Tests for the SQLite calendar storage backend
+
+Goal: Verify that a SqliteCalendar behaves like an in-memory Calendar (quirks
+included), that its meetings survive reopening the database, and that an
+Organization can keep all its calendars in a SqliteStore.
+"""
+
+import pytest
+
+from logic.Calendar import Calendar
+from logic.ConflictException import ConflictsException
+from logic.Meeting import Meeting
+from logic.Organization import Organization
+from logic.Room import Room
+from logic.SqliteCalendar import SqliteCalendar, SqliteStore
+
+
+class TestSqliteCalendar:
+    """Test SqliteCalendar against the in-memory Calendar"""
+
+    def setup_method(self):
+        self.store = SqliteStore(hot_days=2)
+        self.calendar = SqliteCalendar(self.store, "person:Helen West")
+
+    def test_same_behaviour_as_calendar(self):
+        """Adds, conflicts, removals and placeholders match an in-memory calendar"""
+        memory = Calendar()
+        for calendar in (memory, self.calendar):
+            calendar.add_meeting(Meeting(3, 14, 9, 10, description="Standup"))
+            calendar.add_meeting(Meeting(3, 14, 13, 14))
+            calendar.add_meeting(Meeting(4, 2, 9, 10))
+            with pytest.raises(ConflictsException):
+                calendar.add_meeting(Meeting(3, 14, 10, 11))
+            calendar.remove_meeting(3, 14, 0)
+
+        for month, day in ((3, 14), (4, 2), (2, 29), (11, 30)):
+            assert [str(m) for m in self.calendar.get_meetings(month, day)] == \
+                   [str(m) for m in memory.get_meetings(month, day)]
+        assert self.calendar.is_busy(11, 30, 9, 10) and self.calendar.is_busy(3, 14, 13, 13)
+        assert self.calendar.print_agenda(3) == memory.print_agenda(3)
+        assert self.calendar.free_busy().masks == memory.free_busy().masks
+        assert [m.get_day() for m in self.calendar.iter_range((3, 1, 0), (4, 30, 23))] == [14, 2]
+
+    def test_missing_month_raises_key_error(self):
+        """Removing from or clearing a month that does not exist raises KeyError like Calendar"""
+        for calendar in (Calendar(), self.calendar):
+            with pytest.raises(KeyError):
+                calendar.remove_meeting(13, 27, 2)
+            with pytest.raises(KeyError):
+                calendar.clear_schedule(13, 5)
+            assert 13 not in calendar.occupied
+
+    def test_cleared_placeholder_stays_cleared(self):
+        """Clearing a placeholder day is stored, as is removing the placeholder itself"""
+        self.calendar.clear_schedule(2, 30)
+        self.calendar.remove_meeting(2, 29, 0)
+        reopened = SqliteCalendar(self.store, "person:Helen West")
+        self.store._days.clear()
+        assert reopened.get_meetings(2, 30) == [] and reopened.get_meetings(2, 29) == []
+        assert reopened.get_meetings(2, 31) != []
+
+    def test_versions_and_observers(self):
+        """Writes bump versions and notify observers like an in-memory calendar"""
+        changes = []
+        self.calendar.subscribe(lambda calendar, op, month, day, detail: changes.append((op, month, day)))
+        self.calendar.add_meeting(Meeting(5, 6, 9, 10))
+        self.calendar.replace_day(5, 6, [])
+        assert changes == [("add", 5, 6), ("replace", 5, 6)]
+        assert self.calendar.get_version(5, 6) == 2
+
+    def test_fork_commits_back_to_store(self):
+        """A fork is in memory and writes its changes back to the store on commit"""
+        self.calendar.add_meeting(Meeting(5, 6, 9, 10))
+        fork = self.calendar.fork()
+        fork.add_meeting(Meeting(5, 6, 13, 14))
+        assert len(self.calendar.get_meetings(5, 6)) == 1
+        fork.commit()
+        self.store._days.clear()
+        assert [m.get_start_time() for m in self.calendar.get_meetings(5, 6)] == [9, 13]
+
+    def test_fork_is_constant_time_snapshot(self):
+        """Forking loads no day, and later changes in the store do not leak into the fork"""
+        self.calendar.add_meeting(Meeting(5, 6, 9, 10, description="Before"))
+        self.store._days.clear()
+        fork = self.calendar.fork()
+        assert len(self.store._days) == 0
+
+        self.calendar.add_meeting(Meeting(5, 6, 13, 14, description="After"))
+        self.calendar.remove_meeting(5, 6, 0)
+
+        assert [m.get_description() for m in fork.get_meetings(5, 6)] == ["Before"]
+        assert fork.diff() == []
+
+
+class TestSqliteStore:
+    """Test SqliteStore persistence and organization integration"""
+
+    def test_survives_reopening(self, tmp_path):
+        """Meetings, attendees and rooms are read back from the database file"""
+        path = str(tmp_path / "calendars.db")
+        store = SqliteStore(path)
+        org = Organization()
+        store.attach(org)
+        with store.batch():
+            helen, mike = org.get_employee("Helen West"), org.get_employee("Mike Smith")
+            meeting = Meeting(3, 14, 9, 10, [helen, mike], org.get_room("JO7.221"), "Planning")
+            helen.add_meeting(meeting)
+            mike.add_meeting(meeting)
+        store.close()
+
+        store = SqliteStore(path)
+        org = Organization()
+        store.attach(org)
+        helen, mike = org.get_employee("Helen West"), org.get_employee("Mike Smith")
+        [meeting] = helen.calendar.get_meetings(3, 14)
+        assert meeting.get_description() == "Planning" and meeting.get_room() is org.get_room("JO7.221")
+        assert meeting.get_attendees() == [helen, mike]
+        assert mike.calendar.get_meetings(3, 14)[0] is meeting
+        assert helen.is_busy(3, 14, 9, 9) and not org.get_employee("Rose Austin").is_busy(3, 14, 9, 9)
+        store.close()
+
+    def test_batch_rolls_back(self):
+        """A failing batch leaves the database unchanged"""
+        store = SqliteStore()
+        calendar = SqliteCalendar(store, "room:JO7.221")
+        with pytest.raises(RuntimeError):
+            with store.batch():
+                calendar.add_meeting(Meeting(3, 14, 9, 10))
+                raise RuntimeError()
+        assert calendar.get_meetings(3, 14) == []
+
+    def test_rollback_forgets_meeting_ids(self):
+        """Meetings stored by a rolled back batch do not share IDs with later meetings"""
+        store = SqliteStore()
+        org = Organization()
+        store.attach(org)
+        mike = org.get_employee("Mike Smith")
+        first = Meeting(3, 4, 9, 10, [mike], None, "first")
+        with pytest.raises(RuntimeError):
+            with store.batch():
+                mike.add_meeting(first)
+                raise RuntimeError()
+        mike.add_meeting(first)
+        mike.add_meeting(Meeting(3, 5, 9, 10, [mike], None, "second"))
+        store._days.clear()
+
+        assert [m.get_description() for m in mike.calendar.get_meetings(3, 4)] == ["first"]
+        assert [m.get_description() for m in mike.calendar.get_meetings(3, 5)] == ["second"]
+
+    def test_renamed_owner_keeps_calendar(self, tmp_path):
+        """Calendars and attendees are keyed by the stable employee key, not the name"""
+        employees = tmp_path / "employees.jsonl"
+        employees.write_text('{"key": "E1", "name": "Helen West"}\n')
+        path = str(tmp_path / "calendars.db")
+        store = SqliteStore(path)
+        org = Organization.load(str(employees), calendar_factory=store.calendar_for)
+        store.organization = org
+        helen = org.get_employee("Helen West")
+        helen.add_meeting(Meeting(3, 14, 9, 10, [helen], None, "Planning"))
+        store.close()
+
+        employees.write_text('{"key": "E1", "name": "Helen Stone"}\n')
+        store = SqliteStore(path)
+        org = Organization.load(str(employees), calendar_factory=store.calendar_for)
+        store.organization = org
+        helen = org.get_employee("Helen Stone")
+        [meeting] = helen.calendar.get_meetings(3, 14)
+        assert meeting.get_attendees() == [helen]
+        store.close()
+
+    def test_backend_is_per_organization(self):
+        """Only the organization given the factory uses the store; added rooms follow it"""
+        store = SqliteStore()
+        stored = Organization(calendar_factory=store.calendar_for)
+        memory = Organization()
+        stored.add_room(Room("JO2.101"))
+
+        assert isinstance(stored.get_employee("Helen West").calendar, SqliteCalendar)
+        assert isinstance(stored.get_room("JO2.101").calendar, SqliteCalendar)
+        assert type(memory.get_employee("Helen West").calendar) is Calendar
+        stored.get_room("JO7.221").add_meeting(Meeting(3, 14, 9, 10))
+        assert stored.get_room("JO7.221") not in stored.find_free_rooms(3, 14, 9, 10)
+        assert len(stored.find_free_rooms(3, 14, 9, 10)) == len(memory.find_free_rooms(3, 14, 9, 10))